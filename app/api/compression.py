@@ -0,0 +1,241 @@
+"""
+Response compression: Brotli or gzip on the fly for HTML and JSON, precompressed
+variants for /static.
+
+CompressionMiddleware compresses responses of a compressible type once they reach
+COMPRESSION_MIN_SIZE bytes (smaller ones cost more to compress than they save),
+choosing Brotli when the client accepts it and the brotli package is installed,
+gzip otherwise. Responses that already have a Content-Encoding pass through
+untouched, which is how the precompressed static files get by.
+
+Static files are compressed once, at build time, by `python manage.py
+precompress-static` (precompress_directory()): it writes style.css.br and
+style.css.gz next to style.css, and PrecompressedStaticFiles serves the best
+variant the client accepts.
+"""
+
+import gzip
+import logging
+import mimetypes
+import os
+import zlib
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # Optional: without it everything is served gzipped
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml",
+                      "application/rss+xml", "application/atom+xml", "application/feed+json", "image/svg+xml")
+# Suffix of each precompressed variant, in order of preference
+STATIC_ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+def accepted_encodings(headers: Headers) -> List[str]:
+    """Encodings from Accept-Encoding that we can produce, best first (q=0 means refused)."""
+    accepted = set()
+    for item in headers.get("accept-encoding", "").split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return [encoding for encoding in available if encoding in accepted]
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    """compress()/finish() over zlib's gzip mode or Brotli."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 16 + 15: gzip container
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encodings = accepted_encodings(Headers(scope=scope))
+            if encodings:
+                await _CompressionResponder(self.app, self.minimum_size, encodings[0])(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Modeled on Starlette's GZipResponder, for either encoding and only compressible types."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: str) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.send: Optional[Send] = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            # Ranges (206, Content-Range) address bytes of the uncompressed representation: leave them alone
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] == 206
+                or "content-range" in headers
+                or not is_compressible(headers.get("content-type"))
+            )
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.minimum_size and not more_body):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            # The bytes differ from the uncompressed representation: the validator can only be weak
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            self.compressor = _Compressor(self.encoding)
+            if more_body:
+                del headers["Content-Length"]
+                message["body"] = self.compressor.compress(body)
+            else:
+                message["body"] = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+        elif self.passthrough:
+            await self.send(message)
+        else:
+            message["body"] = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+            await self.send(message)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves a file's .br / .gz sibling when the client accepts that encoding."""
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        for encoding in accepted_encodings(request_headers):
+            variant_path = f"{full_path}{STATIC_ENCODINGS[encoding]}"
+            try:
+                variant_stat = os.stat(variant_path)
+            except OSError:
+                continue
+            if variant_stat.st_mtime < stat_result.st_mtime:
+                # Left over from an older build of the file
+                continue
+            # The type is guessed from the variant's name, which mimetypes reads as style.css + encoding
+            response = super().file_response(variant_path, variant_stat, scope, status_code)
+            if response.status_code != 304:
+                response.headers["Content-Encoding"] = encoding
+            response.headers.setdefault("Vary", "Accept-Encoding")
+            return response
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if is_compressible(response.headers.get("content-type")):
+            response.headers.setdefault("Vary", "Accept-Encoding")
+        return response
+
+    def is_not_modified(self, response_headers: Headers, request_headers: Headers) -> bool:
+        # The middleware weakens the ETag of files it compresses; compare the opaque tag
+        if_none_match = request_headers.get("if-none-match")
+        etag = response_headers.get("etag")
+        if if_none_match and etag:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag.removeprefix("W/") in tags
+        return super().is_not_modified(response_headers, request_headers)
+
+
+def precompress_directory(directory: str, min_size: int = 1024) -> Dict[str, int]:
+    """
+    Write .gz (and with the brotli package, .br) variants of the compressible files
+    under directory, skipping small files and those that would not get smaller.
+    Returns counts of files compressed, skipped and up to date.
+    """
+    counts = {"compressed": 0, "skipped": 0, "up_to_date": 0}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(tuple(STATIC_ENCODINGS.values())):
+                continue
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            if stat.st_size < min_size or not is_compressible(mimetypes.guess_type(path)[0]):
+                counts["skipped"] += 1
+                continue
+            encoders = {".gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                encoders[".br"] = lambda data: brotli.compress(data, quality=11)
+            if all(_is_current(path + suffix, stat) for suffix in encoders):
+                counts["up_to_date"] += 1
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            written = False
+            for suffix, encode in encoders.items():
+                compressed = encode(data)
+                if len(compressed) >= len(data):
+                    # Not worth serving; drop a variant from an earlier build
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+                    continue
+                with open(path + suffix, "wb") as f:
+                    f.write(compressed)
+                written = True
+            counts["compressed" if written else "skipped"] += 1
+    logger.info(f"Precompressed static files in {directory}: {counts}")
+    return counts
+
+
+def _is_current(variant_path: str, stat: os.stat_result) -> bool:
+    try:
+        return os.stat(variant_path).st_mtime >= stat.st_mtime
+    except OSError:
+        return False
@@ -0,0 +1,76 @@
+"""
+HTTP validators (ETag / Last-Modified), conditional requests and Cache-Control.
+
+Handlers compute a validator from cheap data (an article's updated_at, the feed
+snapshots' updated_at, a list page's ids and timestamps) and call not_modified()
+before doing the expensive part, so a revalidating client or CDN gets a bodiless
+304. ETags are weak: the same page may go out compressed or not, and the language
+is part of every page validator since the HTML differs per language.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from config.settings import settings
+
+# Pages are rendered in the language from the lang cookie or Accept-Language
+PAGE_VARY = "Cookie, Accept-Language"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the parts (and the app version, so a deploy changes every page)."""
+    digest = hashlib.sha1("|".join(str(part) for part in (settings.APP_VERSION,) + parts).encode("utf-8"))
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def http_date(value: datetime) -> str:
+    """RFC 7231 date for a naive-UTC (or aware) datetime."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified(request: Request, etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Whether the client's cached copy is current. If-None-Match wins over If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: W/"x" matches "x"
+        opaque = etag.removeprefix("W/")
+        return "*" in tags or any(tag.removeprefix("W/") == opaque for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def set_cache_headers(response: Response, etag: Optional[str] = None, last_modified: Optional[datetime] = None,
+                      cache_control: Optional[str] = None, vary: Optional[str] = None) -> Response:
+    if etag:
+        response.headers["ETag"] = etag
+    if last_modified:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+    if vary:
+        response.headers["Vary"] = vary
+    return response
+
+
+def not_modified_response(etag: Optional[str], last_modified: Optional[datetime],
+                          cache_control: Optional[str] = None, vary: Optional[str] = None) -> Response:
+    return set_cache_headers(Response(status_code=304), etag, last_modified, cache_control, vary)
@@ -1,19 +1,35 @@
+import json
 import os
-from fastapi import FastAPI, Depends, HTTPException, Request, Cookie
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, Cookie
+from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi.routing import APIRoute
+from starlette.background import BackgroundTask
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.models.database import Article, RawArticle, ScrapingLog, ArticleSection, get_db, create_tables
+from app.models.database import Article, RawArticle, ScrapingLog, ArticleSection, FeedSnapshot, get_db, get_async_db, get_async_read_db, async_engine, read_async_engines, replicas_configured, READ_YOUR_WRITES_COOKIE, create_tables
 from app.scraping.scraper_manager import ScraperManager
-from app.i18n import i18n_manager, get_text
+from app.i18n import i18n_manager
+from app.templating import templates, get_template_context, get_user_language, precompile_templates
 from config.settings import settings
 from pydantic import BaseModel
 from datetime import datetime
 from contextlib import asynccontextmanager
 from app.scheduler import ArticleScheduler
-import markdown
+from app.services.triage import TriageScorer
+from app.services.search import ArticleSearchIndex
+from app.services.retention import RetentionService
+from app.services.feeds import FeedSnapshots, HOME_SECTIONS, category_section
+from app.services.syndication import FEED_MEDIA_TYPES, render_feed
+from app.services.page_cache import page_cache
+from app.services.pages import ARTICLE_TEMPLATE, CATEGORY_TEMPLATE, HOME_TEMPLATE, article_context, category_context, home_context
+from app.api.pagination import apply_keyset, split_page
+from app.api.compression import CompressionMiddleware, PrecompressedStaticFiles
+from app.api.responses import ORJSONResponse, rows_json
+from app.instrumentation import MetricsMiddleware, metrics
+from app.profiling import PROFILE_FORMATS, PROFILE_JOBS, ProfilingMiddleware, profiler
+from app.api.http_cache import PAGE_VARY, make_etag, not_modified, not_modified_response, set_cache_headers
 
 # --- Scheduler and Lifespan Management ---
 scheduler = ArticleScheduler()
@@ -22,6 +38,7 @@ scheduler = ArticleScheduler()
 async def lifespan(app: FastAPI):
     """Manage scheduler startup and shutdown."""
     print("INFO:     Starting up application...")
+    print(f"INFO:     Compiled {precompile_templates()} templates.")
     
     # Run a quick initial scrape on startup for faster development
     print("INFO:     Running initial scrape for 'Tech News' category...")
@@ -40,57 +57,38 @@ async def lifespan(app: FastAPI):
     # Shutdown
     print("INFO:     Shutting down application and scheduler...")
     scheduler.stop()
+    await async_engine.dispose()
+    for read_engine in read_async_engines:
+        await read_engine.dispose()
 
 app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan)
 
-# Static files and templates
+# Read-your-writes with replicas: after a successful write, pin this browser's reads
+# to the primary until the replicas have caught up
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    if replicas_configured() and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(key=READ_YOUR_WRITES_COOKIE, value="1", max_age=settings.READ_YOUR_WRITES_SECONDS, httponly=True)
+    return response
+
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# Static files, with the .br/.gz variants written by `python manage.py precompress-static`
 static_files_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "static")
-app.mount("/static", StaticFiles(directory=static_files_path), name="static")
-templates = Jinja2Templates(directory="app/templates")
+app.mount("/static", PrecompressedStaticFiles(directory=static_files_path), name="static")
 
-# Register Markdown filter
-def markdown_filter(text):
-    if text:
-        return markdown.markdown(text)
-    return ""
+# Idle (one dict check per request) until a profile is armed from the admin panel
+app.add_middleware(ProfilingMiddleware)
 
-templates.env.filters['markdown'] = markdown_filter
+# Outermost, so the timings cover the other middleware too
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, slow_request_ms=settings.SLOW_REQUEST_MS)
 
 # Initialize database
 create_tables()
 
-# Language detection helper
-def get_user_language(request: Request, lang_cookie: str = Cookie(None)) -> str:
-    """Detect user's preferred language from cookie or headers"""
-    # First check cookie
-    if lang_cookie and i18n_manager.is_supported_language(lang_cookie):
-        return lang_cookie
-    
-    # Then check Accept-Language header
-    accept_language = request.headers.get('accept-language', '')
-    detected = i18n_manager.detect_language_from_request(accept_language)
-    return detected
-
-# Template context helper
-def get_template_context(request: Request, language: str = None, **kwargs):
-    """Get common template context with translations"""
-    if not language:
-        language = get_user_language(request)
-    
-    # Create translation function for templates
-    def _(key: str) -> str:
-        return get_text(key, language)
-    
-    context = {
-        "request": request,
-        "categories": settings.TECH_CATEGORIES,
-        "current_language": language,
-        "supported_languages": i18n_manager.supported_languages,
-        "_": _,
-        **kwargs
-    }
-    return context
-
 # Language switching route
 @app.get("/set-language/{language}")
 async def set_language(language: str, request: Request):
@@ -104,50 +102,100 @@ async def set_language(language: str, request: Request):
     response.set_cookie(key="lang", value=language, max_age=30*24*60*60)  # 30 days
     return response
 
+# /api/articles fields per view; "full" adds the article body
+API_ARTICLE_FIELDS = {
+    "card": ("id", "title_en", "summary_en", "source_url", "source_name", "category", "published_date", "scraped_date"),
+    "full": ("id", "title_en", "summary_en", "content_en", "source_url", "source_name", "category", "published_date", "scraped_date"),
+}
+
+SCRAPING_LOG_FIELDS = (
+    "id", "source_name", "category", "articles_found", "articles_new",
+    "status", "error_message", "started_at", "completed_at",
+)
+
+async def cached_page(request: Request, db: AsyncSession, language: str, tags: List[str], validators,
+                      media_type: str = "text/html", cache_control: Optional[str] = None, vary: Optional[str] = PAGE_VARY):
+    """
+    Answer a page request from its validators or the rendered-page cache. Returns
+    (response or None, store): the response is a 304 or a cached page; otherwise the
+    handler renders (from db) and returns store(response), which caches it and adds the
+    headers. validators() gives the page's (etag, last_modified) from a cheap query, or
+    (None, None) when there is nothing to validate against yet.
+    """
+    if request.cookies.get(READ_YOUR_WRITES_COOKIE):
+        # Just wrote something: render from the primary, leave the cache alone and keep browsers from reusing it
+        return None, lambda response: set_cache_headers(response, cache_control="no-cache", vary=vary)
+    key = f"{request.url}|{language}"
+    # Versions are read before the handler queries, so a concurrent write invalidates this render
+    versions = await page_cache.run(page_cache.versions, tags)
+    hit = await page_cache.run(page_cache.get, key, versions)
+    etag, last_modified = None, None
+    if hit is not None:
+        body, meta = hit
+        etag = meta.get("etag")
+        last_modified = datetime.fromisoformat(meta["last_modified"]) if meta.get("last_modified") else None
+    if etag is None:
+        # A miss, or a page cached before it had validators (its snapshot was built by that render)
+        etag, last_modified = await validators()
+    headers = dict(etag=etag, last_modified=last_modified, cache_control=cache_control or settings.CACHE_CONTROL_PAGES, vary=vary)
+    if not_modified(request, etag, last_modified):
+        return not_modified_response(**headers), None
+    if hit is not None:
+        return set_cache_headers(Response(body, media_type=media_type), **headers), None
+    # Checked after reading the versions: an invalidation after this point changes them anyway.
+    # The write behind a recent one may not have reached this replica yet: the render could be
+    # the old page, which must not be cached under the new versions.
+    if db.info.get("read_only") and await page_cache.run(page_cache.invalidated_within, tags, settings.READ_YOUR_WRITES_SECONDS):
+        return None, lambda response: set_cache_headers(response, cache_control="no-cache", vary=vary)
+
+    def store(response):
+        meta = {"etag": etag, "last_modified": last_modified.isoformat() if last_modified else None}
+        if page_cache.shared is None:
+            page_cache.set(key, versions, response.body, meta)
+        else:
+            # Written to Redis in the threadpool once the response is sent
+            response.background = BackgroundTask(page_cache.set, key, versions, response.body, meta)
+        return set_cache_headers(response, **headers)
+    return None, store
+
+def feed_validators(db: AsyncSession, language: str, sections: List[str]):
+    """Home and category pages change exactly when their feed snapshots do."""
+    async def validators():
+        stamps = dict((await db.execute(
+            select(FeedSnapshot.section, FeedSnapshot.updated_at).where(FeedSnapshot.section.in_(sections))
+        )).all())
+        if len(stamps) < len(sections) or None in stamps.values():
+            # Built on this render; validators from the next request on
+            return None, None
+        etag = make_etag(language, *(f"{section}@{stamps[section].isoformat()}" for section in sections))
+        return etag, max(stamps.values())
+    return validators
+
 @app.get("/", response_class=HTMLResponse)
-async def home(request: Request, db: Session = Depends(get_db), lang: str = Cookie(None)):
+async def home(request: Request, db: AsyncSession = Depends(get_async_read_db), lang: str = Cookie(None)):
     language = get_user_language(request, lang)
+    cached, store = await cached_page(request, db, language, ["home"], feed_validators(db, language, list(HOME_SECTIONS)))
+    if cached:
+        return cached
     
-    # Define categories for each section
-    # latest_articles_categories = ["Start-ups", "Tech News"] # Removed restriction
-    top_stories_categories = [
-        "AI", "Quantum Computing", "Defence Tech", "Space Tech", 
-        "Renewable Energy", "Cloud Computing", "Cybersecurity"
-    ]
-    
-    # Fetch articles for each section
-    latest_articles = db.query(Article).filter(
-        Article.is_active == True
-        # Article.category.in_(latest_articles_categories) # Show all categories
-    ).order_by(Article.scraped_date.desc()).limit(9).all()
-    
-    top_stories = db.query(Article).filter(
-        Article.is_active == True,
-        Article.category.in_(top_stories_categories)
-    ).order_by(Article.scraped_date.desc()).limit(4).all()
-    
-    ai_articles = db.query(Article).filter(
-        Article.is_active == True,
-        Article.category == "AI"
-    ).order_by(Article.scraped_date.desc()).limit(4).all()
-    
-    print(f"Latest articles: {latest_articles}")
-    context = get_template_context(request, language, latest_articles=latest_articles, top_stories=top_stories, ai_articles=ai_articles)
-    return templates.TemplateResponse("index.html", context)
+    page = await db.run_sync(home_context)
+    context = get_template_context(request, language, **page)
+    return store(templates.TemplateResponse(HOME_TEMPLATE, context))
 
 @app.get("/category/{category}", response_class=HTMLResponse)
-async def category_page(category: str, request: Request, db: Session = Depends(get_db), lang: str = Cookie(None)):
+async def category_page(category: str, request: Request, db: AsyncSession = Depends(get_async_read_db), lang: str = Cookie(None)):
     if category not in settings.TECH_CATEGORIES:
         raise HTTPException(status_code=404, detail="Category not found")
     
     language = get_user_language(request, lang)
-    articles = db.query(Article).filter(
-        Article.category == category,
-        Article.is_active == True
-    ).order_by(Article.scraped_date.desc()).limit(50).all()
+    section = category_section(category)
+    cached, store = await cached_page(request, db, language, [f"category:{category}"], feed_validators(db, language, [section]))
+    if cached:
+        return cached
+    page = await db.run_sync(lambda session: category_context(session, category))
     
-    context = get_template_context(request, language, articles=articles, category=category)
-    return templates.TemplateResponse("category.html", context)
+    context = get_template_context(request, language, **page)
+    return store(templates.TemplateResponse(CATEGORY_TEMPLATE, context))
 
 @app.get("/about", response_class=HTMLResponse)
 async def about_page(request: Request, lang: str = Cookie(None)):
@@ -168,79 +216,130 @@ async def contact_page(request: Request, lang: str = Cookie(None)):
     return templates.TemplateResponse("contact.html", context)
 
 @app.get("/article/{article_id}", response_class=HTMLResponse)
-async def article_page(article_id: int, request: Request, db: Session = Depends(get_db), lang: str = Cookie(None)):
+async def article_page(article_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db), lang: str = Cookie(None)):
     language = get_user_language(request, lang)
-    article = db.query(Article).filter(Article.id == article_id, Article.is_active == True).first()
+    async def validators():
+        updated_at = await db.scalar(select(Article.updated_at).filter(Article.id == article_id, Article.is_active == True))
+        if updated_at is None:
+            return None, None
+        return make_etag(language, "article", article_id, updated_at.isoformat()), updated_at
+
+    cached, store = await cached_page(request, db, language, [f"article:{article_id}"], validators)
+    if cached:
+        return cached
+    page = await db.run_sync(lambda session: article_context(session, article_id))
     
-    if not article:
+    if not page:
         raise HTTPException(status_code=404, detail="Article not found")
     
-    context = get_template_context(request, language, article=article)
-    return templates.TemplateResponse("article.html", context)
+    context = get_template_context(request, language, **page)
+    return store(templates.TemplateResponse(ARTICLE_TEMPLATE, context))
+
+@app.get("/feeds/{category}.{feed_format}")
+async def category_feed(category: str, feed_format: str, request: Request, lang: str = "en", db: AsyncSession = Depends(get_async_read_db)):
+    """RSS, Atom or JSON Feed of a category's newest articles; ?lang=te for Telugu titles and summaries."""
+    if category not in settings.TECH_CATEGORIES or feed_format not in FEED_MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    if not i18n_manager.is_supported_language(lang):
+        raise HTTPException(status_code=400, detail="Unsupported language")
+
+    section = category_section(category)
+    media_type = FEED_MEDIA_TYPES[feed_format]
+    # The language is in the URL, so unlike the pages a feed does not vary by cookie or Accept-Language
+    cached, store = await cached_page(
+        request, db, lang, [f"category:{category}"], feed_validators(db, f"{lang}.{feed_format}", [section]),
+        media_type=media_type, cache_control=settings.CACHE_CONTROL_FEEDS, vary=None,
+    )
+    if cached:
+        return cached
+    cards = (await db.run_sync(lambda session: FeedSnapshots(session).get([section])))[section]
+    body, media_type = render_feed(feed_format, category, lang, cards)
+    return store(Response(body, media_type=media_type))
 
 from app.curation.router import router as curation_router
 
 app.include_router(curation_router)
 
 
-@app.get("/api/articles")
+@app.get("/api/articles", response_class=ORJSONResponse)
 async def get_articles(
+    request: Request,
     category: Optional[str] = None,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
     offset: int = 0,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    view: str = "card",
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    query = db.query(Article).filter(Article.is_active == True)
+    if view not in API_ARTICLE_FIELDS:
+        raise HTTPException(status_code=400, detail="view must be 'card' or 'full'")
+    fields = API_ARTICLE_FIELDS[view]
+    # updated_at (last, so rows_json() leaves it out) only feeds the page's ETag
+    query = select(*(getattr(Article, name) for name in fields), Article.updated_at).filter(Article.is_active == True)
     
     if category:
         query = query.filter(Article.category == category)
     
-    articles = query.order_by(Article.scraped_date.desc()).offset(offset).limit(limit).all()
+    # Pass next_cursor back as ?cursor= for constant-cost deep pages; offset still works without it.
+    query = apply_keyset(query, Article, cursor, limit)
+    if not cursor:
+        query = query.offset(offset)
+    articles, next_cursor = split_page((await db.execute(query)).all(), limit)
     
-    return {
-        "articles": [
-            {
-                "id": article.id,
-                "title_en": article.title_en,
-                "summary_en": article.summary_en,
-                "content_en": article.content_en,
-                "source_url": article.source_url,
-                "source_name": article.source_name,
-                "category": article.category,
-                "published_date": article.published_date,
-                "scraped_date": article.scraped_date
-            }
-            for article in articles
-        ]
+    # Fingerprint of the page: which articles, in which version. No Last-Modified: an article
+    # leaving the list changes the page without making anything on it newer.
+    etag = make_etag("articles", view, next_cursor, *(f"{row.id}@{row.updated_at}" for row in articles))
+    if not_modified(request, etag, None):
+        return not_modified_response(etag, None, settings.CACHE_CONTROL_API)
+    return set_cache_headers(ORJSONResponse({
+        "next_cursor": next_cursor,
+        "articles": rows_json(articles, fields)
+    }), etag, cache_control=settings.CACHE_CONTROL_API)
+
+@app.get("/api/search")
+async def search_articles(
+    request: Request,
+    response: Response,
+    q: str,
+    category: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    if not 1 <= limit <= 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+    # Fetch one extra row to know whether there is another page
+    results = await db.run_sync(
+        lambda session: ArticleSearchIndex(session).search(q, category=category, limit=limit + 1, offset=offset)
+    )
+    payload = {
+        "query": q,
+        "next_offset": offset + limit if len(results) > limit else None,
+        "results": results[:limit],
     }
+    etag = make_etag("search", json.dumps(payload, sort_keys=True, default=str))
+    if not_modified(request, etag, None):
+        return not_modified_response(etag, None, settings.CACHE_CONTROL_API)
+    set_cache_headers(response, etag, cache_control=settings.CACHE_CONTROL_API)
+    return payload
 
 @app.post("/api/scrape")
-async def trigger_scraping(category: Optional[str] = None):
+def trigger_scraping(category: Optional[str] = None):
     if category and category not in settings.TECH_CATEGORIES:
         raise HTTPException(status_code=400, detail="Invalid category")
     
     results = scheduler.scrape_job(category=category)
     return {"success": True, "results": results}
 
-@app.get("/api/logs")
-async def get_scraping_logs(db: Session = Depends(get_db)):
-    logs = db.query(ScrapingLog).order_by(ScrapingLog.started_at.desc()).limit(50).all()
-    return {
-        "logs": [
-            {
-                "id": log.id,
-                "source_name": log.source_name,
-                "category": log.category,
-                "articles_found": log.articles_found,
-                "articles_new": log.articles_new,
-                "status": log.status,
-                "error_message": log.error_message,
-                "started_at": log.started_at,
-                "completed_at": log.completed_at
-            }
-            for log in logs
-        ]
-    }
+@app.get("/api/logs", response_class=ORJSONResponse)
+async def get_scraping_logs(db: AsyncSession = Depends(get_async_db)):
+    query = select(*(getattr(ScrapingLog, name) for name in SCRAPING_LOG_FIELDS)).order_by(ScrapingLog.started_at.desc()).limit(50)
+    return ORJSONResponse({"logs": rows_json((await db.execute(query)).all(), SCRAPING_LOG_FIELDS)})
+
+@app.get("/api/metrics", response_class=ORJSONResponse)
+def get_metrics():
+    """Per-route request counts, latency histograms (ms buckets), SQL statements and time, template time."""
+    return ORJSONResponse(metrics.snapshot())
 
 
 # --- Admin Panel ---
@@ -248,12 +347,12 @@ async def get_scraping_logs(db: Session = Depends(get_db)):
 @app.get("/admin", response_class=HTMLResponse)
 async def admin_page(request: Request, lang: str = Cookie(None)):
     language = get_user_language(request, lang)
-    context = get_template_context(request, language, tech_categories=settings.TECH_CATEGORIES)
+    context = get_template_context(request, language, tech_categories=settings.TECH_CATEGORIES, profile_targets=profile_targets())
     return templates.TemplateResponse("admin.html", context)
 
 
 @app.post("/admin/scrape/{category}")
-async def admin_scrape_category(category: str):
+def admin_scrape_category(category: str):
     if category not in settings.TECH_CATEGORIES:
         raise HTTPException(status_code=400, detail="Invalid category")
     
@@ -266,16 +365,92 @@ async def admin_scrape_category(category: str):
 
 
 @app.post("/admin/clear_raw_articles")
-async def admin_clear_raw_articles(db: Session = Depends(get_db)):
+async def admin_clear_raw_articles(db: AsyncSession = Depends(get_async_db)):
     try:
-        num_deleted = db.query(RawArticle).delete()
-        db.commit()
+        num_deleted = (await db.execute(delete(RawArticle))).rowcount
+        await db.commit()
         return {"success": True, "message": f"{num_deleted} raw articles deleted."}
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/admin/rescore_raw_articles")
+def admin_rescore_raw_articles(db: Session = Depends(get_db)):
+    """Recompute triage scores for queued raw articles (recency decays over time)."""
+    try:
+        num_scored = TriageScorer().rescore(db)
+        return {"success": True, "message": f"{num_scored} raw articles rescored."}
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/admin/run_retention")
+def admin_run_retention(db: Session = Depends(get_db)):
+    """Purge stale pending raw articles, archive published ones and roll up old scraping logs."""
+    try:
+        results = RetentionService(db).run()
+        return {
+            "success": True,
+            "message": (
+                f"{results['pending_deleted']} stale raw articles deleted, "
+                f"{results['published_archived']} archived, {results['logs_rolled_up']} logs rolled up."
+            ),
+            "results": results,
+        }
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+
+# --- Profiling ---
+
+class ProfileRequest(BaseModel):
+    target: str
+    count: int = 1
+
+
+def profile_targets() -> List[str]:
+    """What can be profiled: the background jobs, then every route as "METHOD /path"."""
+    routes = sorted(
+        f"{method} {route.path}" for route in app.routes if isinstance(route, APIRoute) for method in route.methods
+    )
+    return [*PROFILE_JOBS, *routes]
+
+
+@app.get("/admin/profiles")
+def admin_list_profiles():
+    return {"armed": profiler.armed, "profiles": profiler.list()}
+
+
+@app.post("/admin/profiles/arm")
+def admin_arm_profile(body: ProfileRequest):
+    """Profile the next `count` runs of a route or job."""
+    if body.target not in profile_targets():
+        raise HTTPException(status_code=400, detail="Unknown profile target")
+    if not 1 <= body.count <= 100:
+        raise HTTPException(status_code=400, detail="count must be between 1 and 100")
+    profiler.arm(body.target, body.count)
+    return {"success": True, "message": f"Profiling the next {body.count} run(s) of {body.target}.", "armed": profiler.armed}
+
+
+@app.post("/admin/profiles/disarm")
+def admin_disarm_profile(target: Optional[str] = None):
+    """Stop profiling target, or everything if no target is given."""
+    profiler.disarm(target)
+    return {"success": True, "armed": profiler.armed}
+
+
+@app.get("/admin/profiles/{profile_id}.{profile_format}")
+def admin_download_profile(profile_id: str, profile_format: str):
+    path = profiler.path(profile_id, profile_format)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type=PROFILE_FORMATS[profile_format], filename=f"{profile_id}.{profile_format}")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,49 @@
+"""
+Keyset (cursor) pagination on (scraped_date, id), newest first.
+
+The cursor is an opaque URL-safe token holding the last row's scraped_date and id.
+The next page is read with ``(scraped_date, id) < (cursor_date, cursor_id)``, which
+the composite (..., scraped_date) indexes can seek to directly, so a deep page costs
+the same as the first one. Offset paging stays available for old clients.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def encode_cursor(scraped_date: datetime, row_id: int) -> str:
+    payload = json.dumps([scraped_date.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_cursor(), raising a 400 for anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        scraped_date, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(scraped_date), int(row_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query, model, cursor: Optional[str], limit: int):
+    """Order newest first and, when a cursor is given, start after it. Fetches one extra row."""
+    if cursor:
+        scraped_date, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.scraped_date, model.id) < tuple_(scraped_date, row_id))
+    return query.order_by(model.scraped_date.desc(), model.id.desc()).limit(limit + 1)
+
+
+def split_page(rows: Sequence, limit: int):
+    """Trim the extra row fetched by apply_keyset() and return (rows, next_cursor)."""
+    if limit < 1:
+        return list(rows), None
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = list(rows[:limit])
+    return rows, encode_cursor(rows[-1].scraped_date, rows[-1].id)
@@ -0,0 +1,22 @@
+"""
+JSON for the list endpoints (/api/articles, /api/raw_articles, /api/logs), straight
+from query rows.
+
+Returning dicts or models lets FastAPI run every value through response_model
+validation and jsonable_encoder before json.dumps, which on a page of hundreds of rows
+with datetimes and article bodies costs more than the query. These endpoints select
+plain columns (no ORM objects), zip each row tuple with its field names and return an
+ORJSONResponse themselves, which skips both steps. orjson writes datetimes as ISO 8601
+exactly as jsonable_encoder did.
+"""
+
+from typing import Dict, Iterable, List, Sequence
+
+from fastapi.responses import ORJSONResponse
+
+__all__ = ["ORJSONResponse", "rows_json"]
+
+
+def rows_json(rows: Iterable[Sequence], fields: Sequence[str]) -> List[Dict]:
+    """Query rows (tuples in the order of fields) as JSON-ready dicts."""
+    return [dict(zip(fields, row)) for row in rows]
@@ -1,51 +1,44 @@
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from collections import Counter
 from typing import List, Optional
-from app.models.database import Article, RawArticle, ArticleSection, get_db
-from app.i18n import get_text
+from app.models.database import RawArticle, ArticleSection, RAW_ARTICLE_QUEUE_STATUSES, RAW_ARTICLE_CARD_FIELDS, get_db, get_async_db
+from app.templating import templates, get_template_context
 from config.settings import settings
 from pydantic import BaseModel
 from datetime import datetime
-from app.curation.services import CurationService
-
-# Helper function from main.py - consider moving to a shared utility module later
-def get_template_context(request: Request, **kwargs):
-    # A simplified context for now. In a real scenario, this would be shared.
-    def _(key: str) -> str:
-        return get_text(key, 'en') # Assuming 'en' for simplicity in this module
-    
-    context = {
-        "request": request,
-        "categories": settings.TECH_CATEGORIES,
-        "current_language": 'en',
-        "supported_languages": ['en', 'te'],
-        "_": _,
-        **kwargs
-    }
-    return context
+from app.curation.services import CurationService, StaleContentError
+from app.services.llm_usage import LLMUsageReport
+from app.api.pagination import apply_keyset, split_page
+from app.api.responses import ORJSONResponse, rows_json
 
 class RawArticleResponse(BaseModel):
     id: int
     title: str
-    content: str
+    # Only present with view=full; the queue cards don't need the scraped body
+    content: Optional[str] = None
     summary: Optional[str]
     source_url: str
     source_name: str
     category: str
     published_date: Optional[datetime]
     scraped_date: datetime
+    triage_score: Optional[float] = None
 
     class Config:
         from_attributes = True
 
 router = APIRouter()
 
-from app.curation.schemas import FinalArticleData
+from app.curation.schemas import BulkPublishRequest, BulkSelection, FinalArticleData
 
 @router.post("/api/raw_articles/{article_id}/publish_final")
-async def publish_final_article(article_id: int, final_article_data: FinalArticleData, db: Session = Depends(get_db)):
+def publish_final_article(article_id: int, final_article_data: FinalArticleData, db: Session = Depends(get_db)):
     service = CurationService(db)
     try:
         published_article = service.publish_final_article(article_id, final_article_data)
@@ -59,23 +52,18 @@ async def publish_final_article(article_id: int, final_article_data: FinalArticl
         raise HTTPException(status_code=500, detail=f"Failed to publish article: {e}")
 
 @router.get("/curation", response_class=HTMLResponse)
-async def curation_page(request: Request, db: Session = Depends(get_db)):
-    # This import is here to avoid circular dependency issues if templates are moved
-    from fastapi.templating import Jinja2Templates
-    templates = Jinja2Templates(directory="app/templates")
+async def curation_page(request: Request):
     context = get_template_context(request)
     return templates.TemplateResponse("curation.html", context)
 
 @router.get("/curation/process/{article_id}", response_class=HTMLResponse)
-async def process_article_page(article_id: int, request: Request, db: Session = Depends(get_db)):
-    from fastapi.templating import Jinja2Templates
-    templates = Jinja2Templates(directory="app/templates")
-    article = db.query(RawArticle).filter(RawArticle.id == article_id).first()
+async def process_article_page(article_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    article = await db.get(RawArticle, article_id)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     
     # Fetch existing structured sections
-    sections = db.query(ArticleSection).filter(ArticleSection.raw_article_id == article_id).all()
+    sections = (await db.scalars(select(ArticleSection).filter(ArticleSection.raw_article_id == article_id))).all()
     structured_sections = {}
     for section in sections:
         structured_sections[section.section_title_en] = {
@@ -89,60 +77,124 @@ async def process_article_page(article_id: int, request: Request, db: Session =
     context = get_template_context(request, article=article, structured_sections_json=structured_sections_json)
     return templates.TemplateResponse("process.html", context)
 
-@router.get("/api/raw_articles", response_model=List[RawArticleResponse])
+# RawArticleResponse documents the rows; they are serialized directly (app/api/responses.py)
+@router.get("/api/raw_articles", response_model=List[RawArticleResponse], response_class=ORJSONResponse)
 async def get_raw_articles(
     category: Optional[str] = None,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
     offset: int = 0,
-    db: Session = Depends(get_db)
+    sort: str = "recent",
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    cursor: Optional[str] = None,
+    view: str = "card",
+    db: AsyncSession = Depends(get_async_db)
 ):
-    query = db.query(RawArticle).filter(RawArticle.status != 'published')
+    if sort not in ("recent", "triage"):
+        raise HTTPException(status_code=400, detail="sort must be 'recent' or 'triage'")
+    if view not in ("card", "full"):
+        raise HTTPException(status_code=400, detail="view must be 'card' or 'full'")
+    if cursor and sort != "recent":
+        raise HTTPException(status_code=400, detail="cursor pagination is only supported with sort=recent")
+
+    fields = RAW_ARTICLE_CARD_FIELDS + (("content",) if view == "full" else ())
+    query = select(*(getattr(RawArticle, name) for name in fields))
+    query = query.filter(RawArticle.status.in_(RAW_ARTICLE_QUEUE_STATUSES))
     if category and category != "All":
         query = query.filter(RawArticle.category == category)
-    
-    raw_articles = query.order_by(RawArticle.scraped_date.desc()).offset(offset).limit(limit).all()
-    return raw_articles
+    if min_score is not None:
+        query = query.filter(RawArticle.triage_score >= min_score)
+    if max_score is not None:
+        query = query.filter(RawArticle.triage_score <= max_score)
+
+    if sort == "triage":
+        query = query.order_by(RawArticle.triage_score.desc().nulls_last(), RawArticle.scraped_date.desc())
+        return ORJSONResponse(rows_json((await db.execute(query.offset(offset).limit(limit))).all(), fields))
+
+    # The body stays a plain list for existing clients; the next page's cursor goes in a header.
+    query = apply_keyset(query, RawArticle, cursor, limit)
+    if not cursor:
+        query = query.offset(offset)
+    raw_articles, next_cursor = split_page((await db.execute(query)).all(), limit)
+    response = ORJSONResponse(rows_json(raw_articles, fields))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+@router.post("/api/articles/{article_id}/deactivate")
+async def deactivate_article(article_id: int, db: AsyncSession = Depends(get_async_db)):
+    article = await db.run_sync(lambda session: CurationService(session).deactivate_article(article_id))
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return {"success": True, "message": f"Article {article_id} deactivated."}
+
+def _bulk_response(results: List[dict]) -> dict:
+    return {"success": True, "counts": dict(Counter(result["status"] for result in results)), "results": results}
+
+def _selected_ids(service: CurationService, selection: BulkSelection) -> List[int]:
+    filters = selection.model_dump(exclude={"ids"}, exclude_none=True)
+    if (selection.ids is None) == (not filters):
+        raise HTTPException(status_code=400, detail="Give either ids or at least one filter, not both.")
+    if selection.ids is not None:
+        return selection.ids
+    return service.queue_ids(**filters, limit=settings.CURATION_BULK_MAX_ITEMS + 1)
+
+def _check_bulk_size(count: int):
+    if count > settings.CURATION_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.CURATION_BULK_MAX_ITEMS} raw articles per bulk request."
+        )
+
+# Registered before the /{article_id}/... routes so "bulk" is not taken for an id
+@router.post("/api/raw_articles/bulk/approve")
+async def bulk_approve_raw_articles(selection: BulkSelection, db: AsyncSession = Depends(get_async_db)):
+    def approve(session):
+        service = CurationService(session)
+        ids = _selected_ids(service, selection)
+        _check_bulk_size(len(ids))
+        return service.approve_raw_articles(ids)
+    return _bulk_response(await db.run_sync(approve))
+
+@router.post("/api/raw_articles/bulk/reject")
+async def bulk_reject_raw_articles(selection: BulkSelection, db: AsyncSession = Depends(get_async_db)):
+    def reject(session):
+        service = CurationService(session)
+        ids = _selected_ids(service, selection)
+        _check_bulk_size(len(ids))
+        return service.reject_raw_articles(ids)
+    return _bulk_response(await db.run_sync(reject))
+
+@router.post("/api/raw_articles/bulk/publish")
+async def bulk_publish_final_articles(request_data: BulkPublishRequest, db: AsyncSession = Depends(get_async_db)):
+    _check_bulk_size(len(request_data.articles))
+    results = await db.run_sync(lambda session: CurationService(session).publish_final_articles(request_data.articles))
+    return _bulk_response(results)
 
 @router.post("/api/raw_articles/{article_id}/approve")
-async def approve_raw_article(article_id: int, db: Session = Depends(get_db)):
-    raw_article = db.query(RawArticle).filter(RawArticle.id == article_id).first()
-    if not raw_article:
+async def approve_raw_article(article_id: int, db: AsyncSession = Depends(get_async_db)):
+    result = (await db.run_sync(lambda session: CurationService(session).approve_raw_articles([article_id])))[0]
+    if result["status"] == "not_found":
         raise HTTPException(status_code=404, detail="Raw article not found")
-
-    article = Article(
-        title=raw_article.title,
-        content=raw_article.content,
-        summary=raw_article.summary,
-        source_url=raw_article.source_url,
-        source_name=raw_article.source_name,
-        category=raw_article.category,
-        published_date=raw_article.published_date,
-        scraped_date=raw_article.scraped_date,
-        image_url=raw_article.image_url,
-        content_type=raw_article.content_type
-    )
-    db.add(article)
-    db.delete(raw_article)
-    db.commit()
-    return {"success": True, "message": "Raw article approved and moved to articles!"}
+    if result["status"] != "approved":
+        raise HTTPException(status_code=400, detail=f"Raw article not approved: {result['status']}")
+    return {"success": True, "message": "Raw article approved and moved to articles!", "article_id": result["article_id"]}
 
 @router.post("/api/raw_articles/{article_id}/reject")
-async def reject_raw_article(article_id: int, db: Session = Depends(get_db)):
-    raw_article = db.query(RawArticle).filter(RawArticle.id == article_id).first()
-    if not raw_article:
+async def reject_raw_article(article_id: int, db: AsyncSession = Depends(get_async_db)):
+    result = (await db.run_sync(lambda session: CurationService(session).reject_raw_articles([article_id])))[0]
+    if result["status"] == "not_found":
         raise HTTPException(status_code=404, detail="Raw article not found")
-
-    db.delete(raw_article)
-    db.commit()
+    if result["status"] != "rejected":
+        raise HTTPException(status_code=400, detail=f"Raw article not rejected: {result['status']}")
     return {"success": True, "message": "Raw article rejected!"}
 
 @router.post("/api/raw_articles/{article_id}/summarize")
-async def summarize_raw_article(article_id: int, db: Session = Depends(get_db)):
+def summarize_raw_article(article_id: int, db: Session = Depends(get_db)):
     service = CurationService(db)
     new_summary = service.summarize_article(article_id)
     if new_summary is None:
         raise HTTPException(status_code=404, detail="Raw article not found")
-    if new_summary.startswith("[Summarization failed"):
+    if new_summary.startswith(("[Summarization failed", "[Generation failed")):
         raise HTTPException(status_code=500, detail=new_summary)
     return {"success": True, "message": "Article summarized successfully!", "new_summary": new_summary}
 
@@ -155,7 +207,8 @@ async def structure_content_ai(article_id: int, request: Request, db: Session =
 
     service = CurationService(db)
     try:
-        structured_content = service.structure_content(article_id, article_type)
+        # The LLM calls block, so keep them off the event loop
+        structured_content = await run_in_threadpool(service.structure_content, article_id, article_type)
         if structured_content is None:
             raise HTTPException(status_code=404, detail="Raw article not found")
         return {"success": True, "structured_sections": structured_content}
@@ -166,19 +219,40 @@ async def structure_content_ai(article_id: int, request: Request, db: Session =
         raise HTTPException(status_code=500, detail=f"AI content structuring failed: {e}")
 
 @router.post("/api/raw_articles/{article_id}/save_structured_content")
-async def save_structured_content(article_id: int, request: Request, db: Session = Depends(get_db)):
+async def save_structured_content(article_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     data = await request.json()
     article_title = data.get("article_title")
     article_type = data.get("article_type")
     sections_data = data.get("sections")
+    expected_version = data.get("content_version")
 
     if not article_title or not article_type or not sections_data:
         raise HTTPException(status_code=400, detail="Missing article_title, article_type or sections data")
 
-    service = CurationService(db)
-    updated_article = service.save_structured_content(article_id, article_title, article_type, sections_data)
-    
+    try:
+        updated_article = await db.run_sync(lambda session: CurationService(session).save_structured_content(
+            article_id, article_title, article_type, sections_data, expected_version=expected_version
+        ))
+    except StaleContentError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
     if updated_article is None:
         raise HTTPException(status_code=404, detail="Raw article not found")
 
-    return {"success": True, "message": "Structured sections saved and article status updated!"}
+    return {
+        "success": True,
+        "message": "Structured sections saved and article status updated!",
+        "content_version": updated_article.content_version
+    }
+
+@router.get("/api/llm_usage/daily")
+async def llm_usage_daily(days: int = 30, db: AsyncSession = Depends(get_async_db)):
+    return {"days": days, "usage": await db.run_sync(lambda session: LLMUsageReport(session).daily(days))}
+
+@router.get("/api/llm_usage/categories")
+async def llm_usage_by_category(days: int = 30, db: AsyncSession = Depends(get_async_db)):
+    return {"days": days, "usage": await db.run_sync(lambda session: LLMUsageReport(session).by_category(days))}
+
+@router.get("/api/llm_usage/latency")
+async def llm_usage_latency(days: int = 7, db: AsyncSession = Depends(get_async_db)):
+    return {"days": days, "latency": await db.run_sync(lambda session: LLMUsageReport(session).latency(days))}
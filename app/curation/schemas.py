@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class FinalArticleData(BaseModel):
@@ -15,3 +15,18 @@ class FinalArticleData(BaseModel):
     category: str
     published_date: Optional[datetime]
     content_type: Optional[str]
+
+
+class BulkSelection(BaseModel):
+    """Raw articles for a bulk action: explicit ids, or filters over the curation queue."""
+    ids: Optional[List[int]] = None
+    category: Optional[str] = None
+    older_than_hours: Optional[float] = None
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+
+class BulkPublishItem(FinalArticleData):
+    raw_article_id: int
+
+class BulkPublishRequest(BaseModel):
+    articles: List[BulkPublishItem]
@@ -1,14 +1,44 @@
 
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import Boolean, DateTime, func, literal, select, insert, update, delete
 from sqlalchemy.orm import Session
-from app.models.database import RawArticle, ArticleSection, Article
-from app.curation.schemas import FinalArticleData
+from app.models.database import (
+    RawArticle, ArticleSection, Article, LLMCall, ARTICLE_CARD_FIELDS, ARTICLE_SEARCH_COLUMNS, RAW_ARTICLE_QUEUE_STATUSES
+)
+from app.curation.schemas import BulkPublishItem, FinalArticleData
 
 from config.settings import settings
 
 from app.scraping.content_extractor import extract_article_content
-from app.services.summarizer import summarize_with_gemini
+from app.services.summarizer import generate_with_stats
+from app.services.llm_backend import get_llm_backend
+from app.services.search import ArticleSearchIndex
+from app.services.feeds import FeedSnapshots
+from app.services.page_cache import article_tags, page_cache
+from app.services.rendering import render_markdown
+from app.services.translation_memory import (
+    TranslationMemory, align_segments, assemble_translation, normalize_segment, segment_text
+)
+
+# Article fields the search index and feed snapshots need for a newly published article
+NEW_ARTICLE_FIELDS = tuple(dict.fromkeys(ARTICLE_CARD_FIELDS + ARTICLE_SEARCH_COLUMNS))
+
+# Editor-only fields: generated in English and never translated.
+INTERNAL_FIELDS = ("Scoring & Evaluation", "Verification & Sources")
+
+class StaleContentError(Exception):
+    """Raised when a save is based on an outdated content_version of a raw article."""
+
+    def __init__(self, article_id: int, expected_version: int, current_version: int):
+        self.article_id = article_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+        super().__init__(
+            f"Raw article {article_id} was modified by another save "
+            f"(expected version {expected_version}, current version {current_version})."
+        )
 
 class CurationService:
     def __init__(self, db: Session):
@@ -34,9 +64,9 @@ class CurationService:
         
         Summary:
         """
-        new_summary = summarize_with_gemini(prompt)
-        
-        if not new_summary.startswith("[Summarization failed"):
+        new_summary = self._generate(prompt, "summary", raw_article)
+
+        if not new_summary.startswith(("[Summarization failed", "[Generation failed")):
             raw_article.summary = new_summary
             self.db.commit()
             self.db.refresh(raw_article)
@@ -44,7 +74,7 @@ class CurationService:
         return new_summary
 
     def structure_content(self, article_id: int, article_type: str) -> dict:
-        if not settings.GEMINI_API_KEY:
+        if get_llm_backend().name == "gemini" and not settings.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is not configured.")
 
         raw_article = self.db.query(RawArticle).filter(RawArticle.id == article_id).first()
@@ -116,27 +146,21 @@ class CurationService:
         # Construct a detailed instruction for the JSON output
         fields_desc = json.dumps(prompts[article_type], indent=2)
         full_prompt = f"""
-        You are an expert tech content analyst and translator. Analyze the following article and structure it according to the requested fields.
+        You are an expert tech content analyst. Analyze the following article and structure it according to the requested fields.
         
         REQUIRED FIELDS AND INSTRUCTIONS:
         {fields_desc}
         
         OUTPUT FORMAT:
         You must output a VALID JSON object where the keys are the field names exactly as listed above.
-        For each field, the value must be a nested object with two keys: "en" and "te".
-        - "en": The content in English.
-        - "te": The content translated into professional, high-quality Telugu (avoiding literal translation, aiming for natural flow).
+        For each field, the value must be the content in English as a string.
+        Put each highlight, keyword or list item on its own line.
         
         Example Structure:
         {{
-            "Field Name": {{
-                "en": "English content...",
-                "te": "Telugu content..."
-            }}
+            "Field Name": "English content..."
         }}
 
-        For 'Scoring & Evaluation' and 'Verification & Sources', provide the analysis in English for both 'en' and 'te' keys, as these are for internal editor use.
-
         Do not include any markdown formatting (like ```json) in your response, just the raw JSON object.
         
         ARTICLE CONTENT:
@@ -145,58 +169,156 @@ class CurationService:
         ---
         """
         
-        structured_json_str = summarize_with_gemini(full_prompt)
-        
-        # Clean the output if necessary (Gemini sometimes adds markdown even if told not to)
-        if "```json" in structured_json_str:
-            structured_json_str = structured_json_str.split("```json")[1].split("```")[0].strip()
-        elif "```" in structured_json_str:
-            structured_json_str = structured_json_str.split("```")[1].split("```")[0].strip()
-        
+        structured_json_str = self._generate(full_prompt, f"structure:{article_type}", raw_article)
         parsed_content = None
         try:
-            parsed_content = json.loads(structured_json_str)
+            parsed_content = json.loads(self._strip_code_fences(structured_json_str))
         except json.JSONDecodeError:
             print(f"Failed to parse AI JSON response: {structured_json_str[:200]}...")
-            parsed_content = {"Content Structuring": {"en": structured_json_str, "te": ""}}
+            return {"Content Structuring": {"en": structured_json_str, "te": ""}}
 
-        # Create bilingual structure (now native from AI)
-        bilingual_content = {}
+        english_content = {}
         for title, content in parsed_content.items():
-            if isinstance(content, dict) and "en" in content and "te" in content:
-                # Handle nested dictionary output (standard case)
-                 bilingual_content[title] = {
-                    "en": str(content["en"]),
-                    "te": str(content["te"])
-                }
+            if isinstance(content, dict) and "en" in content:
+                english_content[title] = str(content["en"])
             elif isinstance(content, dict):
-                 # Handle complex fields like Scoring (flatten them)
-                 content_str = "\n".join([f"{k}: {v}" for k, v in content.items()])
-                 bilingual_content[title] = {
-                    "en": content_str,
-                    "te": content_str # Keep internal fields in English
-                }
+                # Handle complex fields like Scoring (flatten them)
+                english_content[title] = "\n".join([f"{k}: {v}" for k, v in content.items()])
             else:
-                # Fallback
-                bilingual_content[title] = {
-                    "en": str(content),
-                    "te": ""
-                }
-        
+                english_content[title] = str(content)
+
+        # Telugu comes from the translation memory; only segments it has never seen go to the model.
+        translatable = {title: text for title, text in english_content.items() if title not in INTERNAL_FIELDS}
+        segments = list(translatable)
+        for text in translatable.values():
+            segments.extend(segment_text(text))
+        translations = self._translate_segments(segments, raw_article)
+
+        bilingual_content = {}
+        for title, english in english_content.items():
+            if title in INTERNAL_FIELDS:
+                telugu = english  # Keep internal fields in English
+            elif all(segment in translations for segment in segment_text(english)):
+                telugu = assemble_translation(english, translations)
+            else:
+                telugu = ""
+            bilingual_content[title] = {"en": english, "te": telugu}
+
         return bilingual_content
 
-    def save_structured_content(self, article_id: int, article_title: str, article_type: str, sections_data: dict):
-        raw_article = self.db.query(RawArticle).filter(RawArticle.id == article_id).first()
-        if not raw_article:
-            return None
+    def _generate(self, prompt: str, prompt_type: str, raw_article: Optional[RawArticle] = None) -> str:
+        """Call the LLM and record the call (tokens, latency, retries, outcome) against the raw article."""
+        stats = generate_with_stats(prompt)
+        self.db.add(LLMCall(
+            raw_article_id=raw_article.id if raw_article else None,
+            category=raw_article.category if raw_article else None,
+            model=stats.model,
+            prompt_type=prompt_type,
+            input_tokens=stats.input_tokens,
+            output_tokens=stats.output_tokens,
+            latency_ms=stats.latency_ms,
+            retries=stats.retries,
+            outcome=stats.outcome,
+            error_message=stats.error_message,
+            created_at=datetime.utcnow(),
+        ))
+        self.db.commit()
+        return stats.text
 
-        raw_article.title = article_title
-        raw_article.status = "structured"
-        raw_article.content_type = article_type
-        self.db.add(raw_article)
+    @staticmethod
+    def _strip_code_fences(text: str) -> str:
+        # Clean the output if necessary (Gemini sometimes adds markdown even if told not to)
+        if "```json" in text:
+            return text.split("```json")[1].split("```")[0].strip()
+        if "```" in text:
+            return text.split("```")[1].split("```")[0].strip()
+        return text
+
+    def _translate_segments(self, segments: list, raw_article: Optional[RawArticle] = None) -> dict:
+        """
+        Translate English segments to Telugu, reusing the translation memory.
+
+        Known segments are filled from the store; the rest are sent to the model in a single
+        batched prompt and remembered. Segments the model fails to translate are left out.
+        """
+        memory = TranslationMemory(self.db)
+        unique_segments = list(dict.fromkeys(segment for segment in segments if segment.strip()))
+        translations = memory.lookup(unique_segments)
+        known = list(translations)
+
+        novel = list(dict.fromkeys(
+            segment for segment in unique_segments
+            if segment not in translations and normalize_segment(segment)
+        ))
+        if novel:
+            prompt = f"""
+        Translate each English segment in the JSON array below into professional, high-quality Telugu
+        (avoiding literal translation, aiming for natural flow). Keep company, product and technology
+        names recognizable.
+
+        Output a VALID JSON array of strings with exactly one Telugu translation per input segment, in the same order.
+        Do not include any markdown formatting (like ```json) in your response, just the raw JSON array.
+
+        SEGMENTS TO TRANSLATE:
+        {json.dumps(novel, ensure_ascii=False)}
+        """
+            response = self._generate(prompt, "translate", raw_article)
+            try:
+                translated = json.loads(self._strip_code_fences(response))
+            except json.JSONDecodeError:
+                print(f"Failed to parse AI translation response: {response[:200]}...")
+                translated = None
+
+            if isinstance(translated, list) and len(translated) == len(novel):
+                learned = {
+                    source: str(target) for source, target in zip(novel, translated)
+                    if isinstance(target, str) and target.strip()
+                }
+                memory.remember(learned, origin="model")
+                translations.update(learned)
+
+        # After the model call: writing before it would hold the write lock through it
+        memory.record_hits(known)
+        self.db.commit()
+        return translations
+
+    def save_structured_content(self, article_id: int, article_title: str, article_type: str, sections_data: dict,
+                                expected_version: Optional[int] = None):
+        """
+        Persist edited sections, writing only the ones that changed.
 
-        self.db.query(ArticleSection).filter(ArticleSection.raw_article_id == article_id).delete()
+        Stored sections are diffed against `sections_data` by English title; new, changed and
+        removed sections are each written with a single bulk statement, and everything runs in
+        one transaction. When `expected_version` is given and no longer matches the article's
+        `content_version`, the save is rejected with StaleContentError.
+        """
+        version_filter = [RawArticle.id == article_id]
+        if expected_version is not None:
+            version_filter.append(RawArticle.content_version == expected_version)
+
+        # Bump the version first: the conditional UPDATE doubles as the stale-save check
+        # and takes the write lock before any section rows are touched.
+        result = self.db.execute(
+            update(RawArticle)
+            .where(*version_filter)
+            .values(
+                title=article_title,
+                status="structured",
+                content_type=article_type,
+                content_version=RawArticle.content_version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            current_version = self.db.execute(
+                select(RawArticle.content_version).where(RawArticle.id == article_id)
+            ).scalar_one_or_none()
+            self.db.rollback()
+            if current_version is None:
+                return None
+            raise StaleContentError(article_id, expected_version, current_version)
 
+        incoming = {}
         for section_title_en, content_versions in sections_data.items():
             content_en = None
             content_te = None
@@ -210,16 +332,79 @@ class CurationService:
                 content_en = content_versions
                 content_te = f"{content_versions}_te"  # Create placeholder
 
-            article_section = ArticleSection(
-                raw_article_id=article_id,
-                section_title_en=section_title_en,
-                section_content_en=content_en,
-                section_title_te=f"{section_title_en}_te", # Placeholder for title translation
-                section_content_te=content_te
+            incoming[section_title_en] = {
+                "section_title_en": section_title_en,
+                "section_content_en": content_en,
+                "section_title_te": None,
+                "section_content_te": content_te,
+            }
+
+        memory = TranslationMemory(self.db)
+        title_translations = memory.lookup(list(incoming))
+        for section_title_en, values in incoming.items():
+            # Untranslated titles fall back to English until the memory learns them
+            values["section_title_te"] = title_translations.get(section_title_en, section_title_en)
+
+        stored = self.db.execute(
+            select(
+                ArticleSection.id,
+                ArticleSection.section_title_en,
+                ArticleSection.section_content_en,
+                ArticleSection.section_title_te,
+                ArticleSection.section_content_te,
             )
-            self.db.add(article_section)
+            .where(ArticleSection.raw_article_id == article_id)
+            .order_by(ArticleSection.id)
+        ).all()
+
+        to_update = []
+        to_delete = []
+        seen_titles = set()
+        for row in stored:
+            new_values = incoming.get(row.section_title_en)
+            if new_values is None or row.section_title_en in seen_titles:
+                to_delete.append(row.id)
+                continue
+            seen_titles.add(row.section_title_en)
+            if (row.section_content_en, row.section_title_te, row.section_content_te) != (
+                new_values["section_content_en"], new_values["section_title_te"], new_values["section_content_te"]
+            ):
+                to_update.append({"id": row.id, **new_values})
+
+        to_insert = [
+            {"raw_article_id": article_id, **values}
+            for title, values in incoming.items()
+            if title not in seen_titles
+        ]
+
+        # Learn from the editor's translations of the sections that actually changed. A segment
+        # whose Telugu is still what the memory gave (the model's output, when the editor saves
+        # structure_content's sections as they came) is not an edit, and keeps its origin.
+        aligned = {}
+        for values in to_update + to_insert:
+            title = values["section_title_en"]
+            if title not in INTERNAL_FIELDS and isinstance(sections_data.get(title), dict):
+                aligned.update(align_segments(values["section_content_en"] or "", values["section_content_te"] or ""))
+        known = memory.lookup(list(aligned))
+        edited = {source: target for source, target in aligned.items() if known.get(source) != target.strip()}
+        memory.remember(edited, origin="editor")
+        memory.record_hits(title_translations)
+
+        if to_delete:
+            self.db.execute(
+                delete(ArticleSection)
+                .where(ArticleSection.id.in_(to_delete))
+                .execution_options(synchronize_session=False)
+            )
+        if to_update:
+            self.db.execute(update(ArticleSection), to_update)
+        if to_insert:
+            self.db.execute(insert(ArticleSection), to_insert)
 
         self.db.commit()
+
+        raw_article = self.db.get(RawArticle, article_id)
+        self.db.refresh(raw_article)
         return raw_article
 
     def publish_final_article(self, raw_article_id: int, final_article_data: FinalArticleData):
@@ -245,11 +430,199 @@ class CurationService:
             content_type=final_article_data.content_type
         )
         self.db.add(new_article)
+        self.db.flush()
+        ArticleSearchIndex(self.db).index_article(new_article)
+        FeedSnapshots(self.db).add_article(new_article)
 
         # Update the raw article status instead of deleting
         raw_article.status = 'published'
         self.db.add(raw_article)
 
         self.db.commit()
+        page_cache.invalidate(article_tags(new_article.category))
         self.db.refresh(new_article)
         return new_article
+
+    def deactivate_article(self, article_id: int) -> Optional[Article]:
+        """Take a published article off the site and out of the search index."""
+        article = self.db.get(Article, article_id)
+        if article is None:
+            return None
+        if article.is_active:
+            ArticleSearchIndex(self.db).remove_article(article)
+            article.is_active = False
+            FeedSnapshots(self.db).remove_article(article)
+            self.db.commit()
+            page_cache.invalidate(article_tags(article.category, article.id))
+        return article
+
+    # --- Bulk curation: set-based statements in one transaction, with a result per raw article ---
+
+    def queue_ids(self, category: Optional[str] = None, older_than_hours: Optional[float] = None,
+                  min_score: Optional[float] = None, max_score: Optional[float] = None,
+                  limit: Optional[int] = None) -> List[int]:
+        """Ids of queued raw articles matching the filters, oldest id first."""
+        query = select(RawArticle.id).where(RawArticle.status.in_(RAW_ARTICLE_QUEUE_STATUSES))
+        if category and category != "All":
+            query = query.where(RawArticle.category == category)
+        if older_than_hours is not None:
+            query = query.where(RawArticle.scraped_date < datetime.utcnow() - timedelta(hours=older_than_hours))
+        if min_score is not None:
+            query = query.where(RawArticle.triage_score >= min_score)
+        if max_score is not None:
+            query = query.where(RawArticle.triage_score <= max_score)
+        return list(self.db.scalars(query.order_by(RawArticle.id).limit(limit)))
+
+    def approve_raw_articles(self, raw_article_ids: Sequence[int]) -> List[Dict]:
+        """
+        Publish queued raw articles as they are (title, summary and content in English)
+        with one INSERT ... SELECT. Each result's status is approved, not_found,
+        not_in_queue or duplicate (an article with that source_url already exists).
+        """
+        raw_article_ids = list(dict.fromkeys(raw_article_ids))
+        rows = self._queue_rows(raw_article_ids)
+        taken = self._published_urls([row.source_url for row in rows.values()])
+        results, approved = self._classify(raw_article_ids, rows, {
+            article_id: row.source_url for article_id, row in rows.items()
+        }, taken)
+        categories = set()
+        now = datetime.utcnow()
+        try:
+            if approved:
+                self.db.execute(insert(Article).from_select(
+                    ["title_en", "summary_en", "content_en", "source_url", "source_name", "category",
+                     "published_date", "image_url", "content_type", "scraped_date", "updated_at", "is_active"],
+                    select(
+                        RawArticle.title, RawArticle.summary, RawArticle.content, RawArticle.source_url,
+                        RawArticle.source_name, RawArticle.category, RawArticle.published_date, RawArticle.image_url,
+                        func.coalesce(RawArticle.content_type, "news"),
+                        literal(now, DateTime), literal(now, DateTime), literal(True, Boolean),
+                    ).where(RawArticle.id.in_(approved)),
+                ))
+                categories = self._finish_publishing(
+                    results, approved, [rows[article_id].source_url for article_id in approved],
+                    status="approved", render_html=True,
+                )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self._invalidate_pages(categories)
+        return [results[article_id] for article_id in raw_article_ids]
+
+    def reject_raw_articles(self, raw_article_ids: Sequence[int]) -> List[Dict]:
+        """Delete queued raw articles and their sections. Statuses: rejected, not_found, not_in_queue."""
+        raw_article_ids = list(dict.fromkeys(raw_article_ids))
+        rows = self._queue_rows(raw_article_ids)
+        results, rejected = self._classify(raw_article_ids, rows, {}, set())
+        try:
+            if rejected:
+                self.db.execute(delete(ArticleSection).where(ArticleSection.raw_article_id.in_(rejected)))
+                self.db.execute(delete(RawArticle).where(RawArticle.id.in_(rejected)))
+                for article_id in rejected:
+                    results[article_id]["status"] = "rejected"
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return [results[article_id] for article_id in raw_article_ids]
+
+    def publish_final_articles(self, items: Sequence[BulkPublishItem]) -> List[Dict]:
+        """
+        publish_final_article() for many curated articles, in one transaction. Statuses:
+        published, not_found, not_in_queue, or duplicate (source_url already published,
+        or repeated in the request).
+        """
+        by_id: Dict[int, BulkPublishItem] = {}
+        for item in items:
+            by_id.setdefault(item.raw_article_id, item)
+        raw_article_ids = list(by_id)
+        rows = self._queue_rows(raw_article_ids)
+        taken = self._published_urls([item.source_url for item in by_id.values()])
+        results, publishable = self._classify(raw_article_ids, rows, {
+            article_id: item.source_url for article_id, item in by_id.items()
+        }, taken)
+        categories = set()
+        try:
+            if publishable:
+                now = datetime.utcnow()
+                self.db.execute(insert(Article), [
+                    dict(
+                        by_id[article_id].model_dump(exclude={"raw_article_id"}),
+                        scraped_date=now, is_active=True,
+                        content_html_en=render_markdown(by_id[article_id].content_en),
+                        content_html_te=render_markdown(by_id[article_id].content_te),
+                    )
+                    for article_id in publishable
+                ])
+                categories = self._finish_publishing(
+                    results, publishable, [by_id[article_id].source_url for article_id in publishable]
+                )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self._invalidate_pages(categories)
+        return [results[article_id] for article_id in raw_article_ids]
+
+    def _queue_rows(self, raw_article_ids: Sequence[int]) -> Dict:
+        if not raw_article_ids:
+            return {}
+        return {
+            row.id: row
+            for row in self.db.execute(
+                select(RawArticle.id, RawArticle.status, RawArticle.source_url).where(RawArticle.id.in_(raw_article_ids))
+            )
+        }
+
+    def _published_urls(self, source_urls: Sequence[str]) -> set:
+        if not source_urls:
+            return set()
+        return set(self.db.scalars(select(Article.source_url).where(Article.source_url.in_(set(source_urls)))))
+
+    @staticmethod
+    def _classify(raw_article_ids, rows, target_urls: Dict[int, str], taken: set):
+        """Per-id results for the ids that cannot be acted on, plus the ids that can (in order)."""
+        results, actionable = {}, []
+        for article_id in raw_article_ids:
+            row = rows.get(article_id)
+            if row is None:
+                results[article_id] = {"id": article_id, "status": "not_found"}
+            elif row.status not in RAW_ARTICLE_QUEUE_STATUSES:
+                results[article_id] = {"id": article_id, "status": "not_in_queue"}
+            elif target_urls.get(article_id) in taken:
+                results[article_id] = {"id": article_id, "status": "duplicate"}
+            else:
+                results[article_id] = {"id": article_id, "status": "pending"}
+                actionable.append(article_id)
+                if article_id in target_urls:
+                    taken.add(target_urls[article_id])
+        return results, actionable
+
+    def _finish_publishing(self, results: Dict[int, Dict], raw_article_ids: List[int], source_urls: List[str],
+                           status: str = "published", render_html: bool = False) -> set:
+        """
+        Mark raw articles published and index the articles just inserted for them
+        (rendering their HTML bodies if the insert did not). Returns their categories.
+        """
+        self.db.execute(update(RawArticle).where(RawArticle.id.in_(raw_article_ids)).values(status="published"))
+        articles = self.db.execute(
+            select(*(getattr(Article, name) for name in NEW_ARTICLE_FIELDS)).where(Article.source_url.in_(source_urls))
+        ).all()
+        if render_html:
+            self.db.execute(update(Article), [
+                {"id": article.id, "content_html_en": render_markdown(article.content_en),
+                 "content_html_te": render_markdown(article.content_te)}
+                for article in articles
+            ])
+        ArticleSearchIndex(self.db).index_articles(articles)
+        FeedSnapshots(self.db).add_articles(articles)
+        article_ids = {article.source_url: article.id for article in articles}
+        for raw_article_id, source_url in zip(raw_article_ids, source_urls):
+            results[raw_article_id].update(status=status, article_id=article_ids[source_url])
+        return {article.category for article in articles}
+
+    @staticmethod
+    def _invalidate_pages(categories: set) -> None:
+        """Drop cached pages showing newly published articles in categories (after commit)."""
+        page_cache.invalidate(tag for category in categories for tag in article_tags(category))
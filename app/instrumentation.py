@@ -0,0 +1,204 @@
+"""
+Request instrumentation: per-route latency histograms, SQL statement counts and time,
+template render time, and a log line for slow requests.
+
+MetricsMiddleware opens a RequestStats for each HTTP request in a context variable.
+SQLAlchemy cursor events (on every engine, sync or async) and the timed Jinja template
+class (app/templating.py) add to whatever RequestStats is current, so work done outside
+a request (the scheduler, manage.py) is not counted. When the response is finished the
+request goes into the route's histogram (keyed by the route's path template, e.g.
+/article/{article_id}), and if it took longer than SLOW_REQUEST_MS it is logged with
+its queries. The totals are served by /api/metrics.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in milliseconds; the last bucket is everything slower
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# Queries kept per request for the slow-request log (all are counted)
+MAX_LOGGED_QUERIES = 100
+MAX_STATEMENT_LENGTH = 300
+
+
+class RequestStats:
+    __slots__ = ("sql_count", "sql_seconds", "template_seconds", "queries")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.queries: List[Tuple[str, float]] = []
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def record_template(seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.template_seconds += seconds
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats.sql_count += 1
+    stats.sql_seconds += elapsed
+    if len(stats.queries) < MAX_LOGGED_QUERIES:
+        stats.queries.append((statement[:MAX_STATEMENT_LENGTH], elapsed))
+
+
+class RouteMetrics:
+    __slots__ = ("count", "total_ms", "max_ms", "buckets", "sql_count", "sql_ms", "template_ms", "errors")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.sql_count = 0
+        self.sql_ms = self.template_ms = 0.0
+        self.errors = 0
+
+    def add(self, duration_ms: float, status: int, stats: RequestStats) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+        self.sql_count += stats.sql_count
+        self.sql_ms += stats.sql_seconds * 1000
+        self.template_ms += stats.template_seconds * 1000
+        if status >= 500:
+            self.errors += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of requests (None: above the last bound)."""
+        threshold, seen = fraction * self.count, 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= threshold:
+                return bound
+        return None
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": self.count,
+            "errors": self.errors,
+            "latency_ms": {
+                "avg": round(self.total_ms / self.count, 2),
+                "max": round(self.max_ms, 2),
+                "p50_le": self.percentile(0.5),
+                "p95_le": self.percentile(0.95),
+                "p99_le": self.percentile(0.99),
+                "buckets": {
+                    **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                    "inf": self.buckets[-1],
+                },
+            },
+            "sql_queries_per_request": round(self.sql_count / self.count, 2),
+            "sql_ms_per_request": round(self.sql_ms / self.count, 2),
+            "template_ms_per_request": round(self.template_ms / self.count, 2),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, method: str, route: str, duration_ms: float, status: int, stats: RequestStats) -> None:
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = RouteMetrics()
+            metrics.add(duration_ms, status, stats)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            routes = [
+                {"method": method, "route": route, **metrics.as_dict()}
+                for (method, route), metrics in sorted(self._routes.items(), key=lambda item: (item[0][1], item[0][0]))
+            ]
+        return {"uptime_seconds": round(time.time() - self.started_at), "routes": routes}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+metrics = MetricsRegistry()
+
+
+def _route_label(scope: Scope) -> str:
+    # FastAPI puts the matched route in the scope; a mount (/static) only moves root_path
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    return scope.get("root_path") or "<unmatched>"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, slow_request_ms: float = 500) -> None:
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_timed(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            _current.reset(token)
+            duration_ms = (time.perf_counter() - started) * 1000
+            route = _route_label(scope)
+            metrics.record(scope["method"], route, duration_ms, status, stats)
+            if duration_ms >= self.slow_request_ms:
+                self._log_slow(scope, route, status, duration_ms, stats)
+
+    @staticmethod
+    def _log_slow(scope: Scope, route: str, status: int, duration_ms: float, stats: RequestStats) -> None:
+        queries = "\n".join(f"  {elapsed * 1000:8.2f} ms  {statement}" for statement, elapsed in stats.queries)
+        logger.warning(
+            f"Slow request: {scope['method']} {scope['path']} ({route}) -> {status} in {duration_ms:.1f} ms; "
+            f"{stats.sql_count} SQL statements, {stats.sql_seconds * 1000:.1f} ms SQL, "
+            f"{stats.template_seconds * 1000:.1f} ms templates"
+            + (f"\n{queries}" if queries else "")
+        )
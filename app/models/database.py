@@ -1,8 +1,14 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import create_engine, event, Column, Date, DDL, Integer, String, DateTime, Text, Boolean, Float, Index, UniqueConstraint
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Mapped, mapped_column
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
+import random
+from fastapi import Cookie, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 from config.settings import settings
 
@@ -26,13 +32,71 @@ class Article(Base):
     is_active = Column(Boolean, default=True)
     content_type = Column(String, nullable=True, default='news')
     image_url = Column(String, nullable=True)
+    # content_en / content_te rendered from Markdown when written (app/services/rendering.py)
+    content_html_en = Column(Text, nullable=True)
+    content_html_te = Column(Text, nullable=True)
+    # Any change to the row; the article page's Last-Modified / ETag (app/api/http_cache.py)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Match the public read paths: active articles newest first, optionally per category
+    __table_args__ = (
+        Index("ix_articles_active_scraped", "is_active", "scraped_date"),
+        Index("ix_articles_active_category_scraped", "is_active", "category", "scraped_date"),
+    )
 
     def __repr__(self):
         return f"<Article(title='{self.title_en}', category='{self.category}', image_url='{self.image_url}')>"
 
 
+# Full-text search over the bilingual article text (see app/services/search.py).
+# SQLite: an FTS5 table that reads its text from `articles` (external content), kept in
+# sync by the search service. The unicode61 categories keep Telugu vowel signs (M*)
+# inside words; porter stems the English terms.
+ARTICLE_SEARCH_COLUMNS = ("title_en", "title_te", "summary_en", "summary_te", "content_en", "content_te")
+
+SQLITE_ARTICLE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    + ", ".join(ARTICLE_SEARCH_COLUMNS)
+    + ", content='articles', content_rowid='id', "
+    "tokenize=\"porter unicode61 remove_diacritics 2 categories 'L* N* Co M*'\")"
+)
+
+# Postgres: a generated tsvector column with a GIN index, so it follows every write.
+# English text is stemmed; Telugu has no Postgres dictionary, so it is indexed as-is.
+POSTGRES_ARTICLE_SEARCH_DDL = (
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title_en, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(title_te, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(summary_en, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(summary_te, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content_en, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(content_te, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING gin (search_vector)",
+)
+
+event.listen(Article.__table__, "after_create", DDL(SQLITE_ARTICLE_FTS_DDL).execute_if(dialect="sqlite"))
+event.listen(Article.__table__, "before_drop", DDL("DROP TABLE IF EXISTS articles_fts").execute_if(dialect="sqlite"))
+for statement in POSTGRES_ARTICLE_SEARCH_DDL:
+    event.listen(Article.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
+# Columns needed to render an article card or list entry; the large text bodies are left out
+ARTICLE_CARD_FIELDS = (
+    "id", "title_en", "title_te", "summary_en", "summary_te", "source_url", "source_name",
+    "category", "published_date", "scraped_date", "image_url", "content_type",
+)
+
+
+# Raw article statuses that are still waiting in the curation queue
+RAW_ARTICLE_QUEUE_STATUSES = ("pending", "structured")
+
+
 class RawArticle(Base):
     __tablename__ = "raw_articles"
+    __table_args__ = (
+        Index("ix_raw_articles_status_scraped", "status", "scraped_date"),
+        Index("ix_raw_articles_status_category_scraped", "status", "category", "scraped_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String, index=True)
@@ -42,10 +106,20 @@ class RawArticle(Base):
     source_name: Mapped[str] = mapped_column(String)
     category: Mapped[str] = mapped_column(String, index=True)
     published_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
-    scraped_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    # Set client-side so SQLite stores the same text format as explicit datetimes (keyset cursors compare it)
+    scraped_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     image_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     content_type: Mapped[Optional[str]] = mapped_column(String, nullable=True, default='news')
     status: Mapped[str] = mapped_column(String, default='pending')
+    content_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    triage_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True, index=True)
+
+
+# Curation queue card: everything but the scraped content
+RAW_ARTICLE_CARD_FIELDS = (
+    "id", "title", "summary", "source_url", "source_name", "category",
+    "published_date", "scraped_date", "triage_score",
+)
 
 
 class ArticleSection(Base):
@@ -59,6 +133,37 @@ class ArticleSection(Base):
     section_content_te: Mapped[str] = mapped_column(Text, nullable=True)
 
 
+class TranslationSegment(Base):
+    """English -> Telugu translation memory entry, keyed by the normalized English segment."""
+    __tablename__ = "translation_memory"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    source_text: Mapped[str] = mapped_column(Text)
+    normalized_source: Mapped[str] = mapped_column(String, unique=True, index=True)
+    target_text: Mapped[str] = mapped_column(Text)
+    origin: Mapped[str] = mapped_column(String, default='model')  # model, editor
+    hits: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class LLMCall(Base):
+    """One LLM request made by the curation pipeline, for latency, token and cost accounting."""
+    __tablename__ = "llm_calls"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    raw_article_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    category: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
+    model: Mapped[str] = mapped_column(String)
+    prompt_type: Mapped[str] = mapped_column(String, index=True)  # summary, structure:<type>, translate
+    input_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    latency_ms: Mapped[float] = mapped_column(Float, default=0.0)
+    retries: Mapped[int] = mapped_column(Integer, default=0)
+    outcome: Mapped[str] = mapped_column(String)  # success, error
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
 
 class ScrapingLog(Base):
     __tablename__ = "scraping_logs"
@@ -74,10 +179,158 @@ class ScrapingLog(Base):
     completed_at = Column(DateTime)
 
 
+class ArchivedRawArticle(Base):
+    """A published raw article moved out of raw_articles by retention, with its sections as JSON."""
+    __tablename__ = "raw_articles_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # The original raw_articles.id; not unique, since SQLite reuses ids once raw_articles empties
+    raw_article_id: Mapped[int] = mapped_column(Integer, index=True)
+    title: Mapped[str] = mapped_column(String)
+    content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    source_url: Mapped[str] = mapped_column(String, index=True)
+    source_name: Mapped[str] = mapped_column(String)
+    category: Mapped[str] = mapped_column(String)
+    published_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    scraped_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    content_type: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    status: Mapped[str] = mapped_column(String)
+    triage_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    sections: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ScrapingLogDaily(Base):
+    """Per-day rollup of scraping_logs, per source and category."""
+    __tablename__ = "scraping_log_daily"
+    __table_args__ = (UniqueConstraint("day", "source_name", "category", name="uq_scraping_log_daily"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, index=True)
+    source_name: Mapped[str] = mapped_column(String)
+    category: Mapped[str] = mapped_column(String)
+    runs: Mapped[int] = mapped_column(Integer, default=0)
+    success_runs: Mapped[int] = mapped_column(Integer, default=0)
+    error_runs: Mapped[int] = mapped_column(Integer, default=0)
+    articles_found: Mapped[int] = mapped_column(Integer, default=0)
+    articles_new: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class FeedSnapshot(Base):
+    """
+    Precomputed article cards for one page section ("latest", "top_stories", "ai",
+    "category:<name>"), newest first, kept up to date by app/services/feeds.py.
+    """
+    __tablename__ = "feed_snapshots"
+
+    section: Mapped[str] = mapped_column(String, primary_key=True)
+    cards: Mapped[str] = mapped_column(Text)  # JSON list of ARTICLE_CARD_FIELDS dicts
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 # Database setup
-engine = create_engine(settings.DATABASE_URL)
+def _set_sqlite_pragmas(dbapi_connection, in_memory: bool):
+    cursor = dbapi_connection.cursor()
+    # WAL is persistent in the file and unsupported for in-memory databases
+    if not in_memory:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def build_engine(database_url: Optional[str] = None, tuned: bool = True):
+    """
+    Create the engine for database_url (default settings.DATABASE_URL) with the
+    backend tuning from settings: connection pragmas on SQLite, pool sizing on
+    server databases. tuned=False gives SQLAlchemy's defaults (for comparisons).
+    """
+    url = make_url(database_url or settings.DATABASE_URL)
+    if not tuned:
+        return create_engine(url)
+
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url, **_pool_options())
+
+    in_memory = url.database in (None, "", ":memory:")
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000.0},
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        _set_sqlite_pragmas(dbapi_connection, in_memory)
+
+    return engine
+
+
+def async_database_url(database_url: Optional[str] = None):
+    """The async-driver form of a sync URL: aiosqlite for SQLite, asyncpg for Postgres."""
+    url = make_url(database_url or settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if backend == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    return url
+
+
+def build_async_engine(database_url: Optional[str] = None):
+    """Async counterpart of build_engine(), with the same tuning, for async route handlers."""
+    url = async_database_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(url, **_pool_options())
+
+    in_memory = url.database in (None, "", ":memory:")
+    # aiosqlite would otherwise open (and re-run the pragmas on) a connection per session
+    options = {} if in_memory else {"poolclass": AsyncAdaptedQueuePool}
+    engine = create_async_engine(url, connect_args={"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000.0}, **options)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        _set_sqlite_pragmas(dbapi_connection, in_memory)
+
+    return engine
+
+
+# Sync engine: the scheduler, scrapers, migrations and handlers that call sync services
+engine = build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: read paths and simple curation writes in async route handlers
+async_engine = build_async_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+# Read replicas: async sessions for the public read paths only. Sessions on a replica
+# carry info["read_only"], so services skip their opportunistic writes there.
+read_async_engines = [build_async_engine(url) for url in settings.READ_DATABASE_URLS]
+ReadAsyncSessionLocals = [
+    async_sessionmaker(read_engine, expire_on_commit=False, autoflush=False, info={"read_only": True})
+    for read_engine in read_async_engines
+]
+
+# Set on responses to writes; while present the browser's reads go to the primary
+READ_YOUR_WRITES_COOKIE = "db_primary"
+
+def replicas_configured() -> bool:
+    return bool(ReadAsyncSessionLocals)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -85,5 +338,21 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db(db: AsyncSession = Depends(get_async_db), db_primary: Optional[str] = Cookie(None)):
+    """
+    Session for read-only handlers: a random replica when any are configured, else
+    (or right after this browser wrote something) the primary. The primary session
+    is only connected if it is used.
+    """
+    if not ReadAsyncSessionLocals or db_primary:
+        yield db
+        return
+    async with random.choice(ReadAsyncSessionLocals)() as replica:
+        yield replica
+
 def create_tables():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
@@ -0,0 +1,205 @@
+"""
+On-demand profiling: arm a target from the admin panel, and its next N runs are
+profiled with cProfile and stored under PROFILES_DIR.
+
+A target is a route ("GET /article/{article_id}", the same labels as /api/metrics) or a
+background job ("scrape_job"). Each profile is kept as three files:
+
+- <id>.prof: pstats data (python -m pstats, snakeviz, or gprof2dot for a call graph);
+- <id>.txt: the top functions by cumulative time;
+- <id>.json: metadata (target, when, duration, status, SQL count for requests).
+
+Nothing is profiled while nothing is armed: ProfilingMiddleware then only checks an
+empty dict, and profile() returns straight away. One profile runs at a time per
+process; a matching run that starts while another is being profiled is not profiled
+and does not use up the count. Armed targets are per worker process.
+
+cProfile follows the thread it was enabled on. For requests that is the event loop,
+so async routes (all public pages and read APIs) are profiled completely, together
+with anything else the loop runs meanwhile; the work of a sync (def) route happens in
+the threadpool and shows only as the wait for it.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.instrumentation import current_stats
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Background jobs that can be armed, besides routes
+PROFILE_JOBS = ("scrape_job",)
+PROFILE_FORMATS = {"prof": "application/octet-stream", "txt": "text/plain; charset=utf-8"}
+SUMMARY_LINES = 40
+
+_PROFILE_ID = re.compile(r"^[A-Za-z0-9-]+$")
+
+
+class Profiler:
+    def __init__(self, directory: str, keep: int):
+        self.directory = directory
+        self.keep = keep
+        self._armed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def armed(self) -> Dict[str, int]:
+        """Armed targets and how many runs each still has to profile."""
+        return dict(self._armed)
+
+    @property
+    def active(self) -> bool:
+        return bool(self._armed)
+
+    def arm(self, target: str, count: int = 1) -> None:
+        with self._lock:
+            self._armed[target] = count
+
+    def disarm(self, target: Optional[str] = None) -> None:
+        with self._lock:
+            if target is None:
+                self._armed.clear()
+            else:
+                self._armed.pop(target, None)
+
+    def _claim(self, target: str) -> bool:
+        with self._lock:
+            remaining = self._armed.get(target)
+            if not remaining or self._running:
+                return False
+            if remaining == 1:
+                del self._armed[target]
+            else:
+                self._armed[target] = remaining - 1
+            self._running = True
+            return True
+
+    @contextmanager
+    def profile(self, target: str, **metadata) -> Iterator[Optional[Dict]]:
+        """
+        Profile the block if target is armed. Yields the metadata dict to add to (None
+        when not profiling); the profile is saved when the block exits.
+        """
+        if not self._armed or not self._claim(target):
+            yield None
+            return
+        profile = cProfile.Profile()
+        created_at = datetime.utcnow()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield metadata
+        finally:
+            profile.disable()
+            duration_ms = (time.perf_counter() - started) * 1000
+            self._running = False
+            try:
+                self._save(profile, target, created_at, duration_ms, metadata)
+            except OSError as e:
+                logger.error(f"Could not save the profile of {target}: {e}")
+
+    def _save(self, profile: cProfile.Profile, target: str, created_at: datetime, duration_ms: float, metadata: Dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", target).strip("-")[:60]
+        profile_id = f"{created_at:%Y%m%dT%H%M%S%f}-{slug}"
+        base = os.path.join(self.directory, profile_id)
+
+        profile.dump_stats(f"{base}.prof")
+        summary = io.StringIO()
+        pstats.Stats(profile, stream=summary).sort_stats("cumulative").print_stats(SUMMARY_LINES)
+        with open(f"{base}.txt", "w", encoding="utf-8") as f:
+            f.write(f"{target}  {created_at.isoformat()}  {duration_ms:.1f} ms\n{summary.getvalue()}")
+        with open(f"{base}.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "id": profile_id,
+                "target": target,
+                "created_at": created_at.isoformat(),
+                "duration_ms": round(duration_ms, 2),
+                **metadata,
+            }, f)
+        logger.info(f"Saved profile {profile_id} ({duration_ms:.1f} ms)")
+        self._prune()
+
+    def _prune(self) -> None:
+        for profile_id in [entry["id"] for entry in self.list()][self.keep:]:
+            for extension in ("json", *PROFILE_FORMATS):
+                try:
+                    os.remove(os.path.join(self.directory, f"{profile_id}.{extension}"))
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> List[Dict]:
+        """Metadata of the stored profiles, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda entry: entry["id"], reverse=True)
+
+    def path(self, profile_id: str, profile_format: str) -> Optional[str]:
+        """The file of a stored profile in profile_format ("prof" or "txt"), or None."""
+        if profile_format not in PROFILE_FORMATS or not _PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.{profile_format}")
+        return path if os.path.isfile(path) else None
+
+
+profiler = Profiler(settings.PROFILES_DIR, settings.PROFILES_KEEP)
+
+
+def _match_route(scope: Scope) -> Optional[str]:
+    # The router has not run yet, so find the route it will pick
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", None)
+    return None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not profiler.active:
+            await self.app(scope, receive, send)
+            return
+
+        route = _match_route(scope)
+        with profiler.profile(f"{scope['method']} {route}", path=scope["path"]) as metadata:
+            if metadata is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    metadata["status"] = message["status"]
+                await send(message)
+
+            await self.app(scope, receive, send_status)
+            stats = current_stats()
+            if stats is not None:
+                metadata["sql_queries"] = stats.sql_count
+                metadata["sql_ms"] = round(stats.sql_seconds * 1000, 2)
@@ -4,6 +4,8 @@ from app.scraping.scraper_manager import ScraperManager
 from config.settings import settings
 import logging
 from app.models.database import get_db # Add this line
+from app.services.retention import RetentionService
+from app.profiling import profiler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,20 +19,36 @@ class ArticleScheduler:
         """Scheduled job to scrape articles"""
         try:
             logger.info(f"Starting scheduled article scraping for category: {category if category else 'All'}...")
-            if category:
-                db = next(get_db())
-                results = [self.scraper_manager.scrape_category(category, db)]
-                db.close()
-            else:
-                results = self.scraper_manager.scrape_all_categories()
-            
-            total_new = sum(result['total_new'] for result in results)
+            # Profiled only when armed from the admin panel
+            with profiler.profile("scrape_job", category=category or "All") as profile:
+                if category:
+                    db = next(get_db())
+                    results = [self.scraper_manager.scrape_category(category, db)]
+                    db.close()
+                else:
+                    results = self.scraper_manager.scrape_all_categories()
+
+                total_new = sum(result['total_new'] for result in results)
+                if profile is not None:
+                    profile["total_new"] = total_new
             logger.info(f"Scheduled scraping completed. {total_new} new articles found.")
             
             return results
         except Exception as e:
             logger.error(f"Error in scheduled scraping: {e}")
             return None
+
+    def retention_job(self):
+        """Scheduled job to purge, archive and roll up old rows"""
+        db = next(get_db())
+        try:
+            return RetentionService(db).run()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error in scheduled retention: {e}")
+            return None
+        finally:
+            db.close()
     
     def start(self):
         """Start the scheduler"""
@@ -41,6 +59,13 @@ class ArticleScheduler:
             name='Scrape tech articles',
             replace_existing=True
         )
+        self.scheduler.add_job(
+            func=self.retention_job,
+            trigger=IntervalTrigger(hours=settings.RETENTION_INTERVAL_HOURS),
+            id='retention',
+            name='Retention for raw articles and scraping logs',
+            replace_existing=True
+        )
         
         self.scheduler.start()
         logger.info(f"Scheduler started. Articles will be scraped every {settings.SCRAPING_INTERVAL_HOURS} hours.")
@@ -1,11 +1,25 @@
 from typing import List, Dict, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
-from app.models.database import Article, RawArticle, ScrapingLog, get_db
+from app.models.database import Article, ArchivedRawArticle, RawArticle, ScrapingLog, get_db
 from .arxiv_scraper import ArxivScraper
 from .rss_connector import RSSConnector
+from app.services.triage import TriageScorer
 from config.settings import settings
 
+
+def known_source_urls(db: Session, urls: List[str]) -> set:
+    """The subset of urls already seen: queued raw articles, the retention archive or published articles."""
+    known = set()
+    urls = list(set(urls))
+    for column in (RawArticle.source_url, ArchivedRawArticle.source_url, Article.source_url):
+        # Chunked to stay under the database's bound-parameter limit
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            known.update(url for (url,) in db.query(column).filter(column.in_(chunk)))
+    return known
+
+
 class ScraperManager:
     def __init__(self):
         self.connectors = {
@@ -65,14 +79,15 @@ class ScraperManager:
                     db.add(log_entry)
                     continue # Skip to next connector if unknown
 
-                new_articles = 0
+                new_raw_articles = []
+                # URLs already ingested: still queued, archived by retention, or published
+                batch_urls = known_source_urls(db, [article_data.source_url for article_data in articles])
                 for article_data in articles:
-                    # Check if raw article already exists
-                    existing_raw_article = db.query(RawArticle).filter(
-                        RawArticle.source_url == article_data.source_url
-                    ).first()
+                    # Check if raw article already exists (in the database or earlier in this batch)
+                    existing_raw_article = article_data.source_url in batch_urls
                     
                     if not existing_raw_article:
+                        batch_urls.add(article_data.source_url)
                         raw_article = RawArticle(
                             title=article_data.title,
                             content=article_data.content,
@@ -83,8 +98,12 @@ class ScraperManager:
                             published_date=article_data.published_date,
                             image_url=settings.CATEGORY_IMAGES.get(article_data.category, settings.CATEGORY_IMAGES["DEFAULT"])
                         )
-                        db.add(raw_article)
-                        new_articles += 1
+                        new_raw_articles.append(raw_article)
+
+                # Score the whole batch at once so keyword IDF reflects the batch
+                TriageScorer().score_raw_articles(new_raw_articles)
+                db.add_all(new_raw_articles)
+                new_articles = len(new_raw_articles)
                 
                 log_entry.articles_found = len(articles)
                 log_entry.articles_new = new_articles
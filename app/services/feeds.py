@@ -0,0 +1,161 @@
+"""
+Feed snapshots: the article cards behind the home and category pages, precomputed.
+
+Each page section ("latest", "top_stories", "ai" and one "category:<name>" per
+category) keeps its newest cards as JSON in feed_snapshots, so a page view is one
+primary-key lookup instead of a sorted query per section. The snapshots change only
+when articles do: publish_final_article() adds the new card to every section it
+belongs in, and deactivate_article() rebuilds the sections that showed the article
+(a shorter list has to be refilled from articles). A missing snapshot is built on
+first read, so a new database or a new category needs no backfill step.
+"""
+
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.database import Article, ARTICLE_CARD_FIELDS, FeedSnapshot
+from config.settings import settings
+
+TOP_STORIES_CATEGORIES = (
+    "AI", "Quantum Computing", "Defence Tech", "Space Tech",
+    "Renewable Energy", "Cloud Computing", "Cybersecurity",
+)
+
+DATE_FIELDS = ("published_date", "scraped_date")
+
+# section -> (categories it shows, or None for all; number of cards kept)
+HOME_SECTIONS = {
+    "latest": (None, 9),
+    "top_stories": (TOP_STORIES_CATEGORIES, 4),
+    "ai": (("AI",), 4),
+}
+CATEGORY_PAGE_SIZE = 50
+
+
+def category_section(category: str) -> str:
+    return f"category:{category}"
+
+
+def section_spec(section: str):
+    """(categories, limit) for a section name, or KeyError for an unknown one."""
+    if section in HOME_SECTIONS:
+        return HOME_SECTIONS[section]
+    prefix, _, category = section.partition(":")
+    if prefix == "category" and category in settings.TECH_CATEGORIES:
+        return (category,), CATEGORY_PAGE_SIZE
+    raise KeyError(section)
+
+
+def sections_for(category: str) -> List[str]:
+    """Every section an article in category appears in."""
+    sections = [name for name, (categories, _) in HOME_SECTIONS.items() if categories is None or category in categories]
+    if category in settings.TECH_CATEGORIES:
+        sections.append(category_section(category))
+    return sections
+
+
+def _card(article) -> Dict:
+    card = {name: getattr(article, name) for name in ARTICLE_CARD_FIELDS}
+    for name in DATE_FIELDS:
+        if card[name] is not None:
+            card[name] = card[name].isoformat()
+    return card
+
+
+def _render(card: Dict) -> SimpleNamespace:
+    """A stored card as the attribute-style object the templates expect."""
+    card = dict(card)
+    for name in DATE_FIELDS:
+        if card[name] is not None:
+            card[name] = datetime.fromisoformat(card[name])
+    return SimpleNamespace(**card)
+
+
+def _sort_key(card: Dict):
+    return card["scraped_date"] or "", card["id"]
+
+
+class FeedSnapshots:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, sections: Sequence[str]) -> Dict[str, List[SimpleNamespace]]:
+        """Cards per section, in one lookup; missing snapshots are built and stored."""
+        stored = {
+            snapshot.section: json.loads(snapshot.cards)
+            for snapshot in self.db.scalars(select(FeedSnapshot).where(FeedSnapshot.section.in_(sections)))
+        }
+        missing = [section for section in sections if section not in stored]
+        if missing:
+            built = {section: self._query_cards(section) for section in missing}
+            stored.update(built)
+            # On a read replica just render from the query; the primary builds the snapshot
+            if not self.db.info.get("read_only"):
+                for section, cards in built.items():
+                    self.db.add(FeedSnapshot(section=section, cards=json.dumps(cards)))
+                try:
+                    self.db.commit()
+                except IntegrityError:
+                    # Another request built the same snapshot first; ours is just as good to render
+                    self.db.rollback()
+        return {section: [_render(card) for card in stored[section]] for section in sections}
+
+    def add_article(self, article: Article) -> None:
+        """Put a (flushed) active article into its sections. Call inside the publishing transaction."""
+        self.add_articles([article])
+
+    def add_articles(self, articles: Sequence) -> None:
+        """
+        add_article() for a batch of articles (or rows with the card fields), touching
+        each affected section once.
+        """
+        by_section: Dict[str, List] = {}
+        for article in articles:
+            for section in sections_for(article.category):
+                by_section.setdefault(section, []).append(article)
+        for section, section_articles in by_section.items():
+            _, limit = section_spec(section)
+            snapshot = self._locked(section)
+            if snapshot is None:
+                # Not built yet: the first read builds it from articles, new ones included
+                continue
+            new_ids = {article.id for article in section_articles}
+            cards = [card for card in json.loads(snapshot.cards) if card["id"] not in new_ids]
+            cards.extend(_card(article) for article in section_articles)
+            cards.sort(key=_sort_key, reverse=True)
+            snapshot.cards = json.dumps(cards[:limit])
+
+    def remove_article(self, article: Article) -> None:
+        """Refill the sections that showed an article which is no longer active. Call before committing."""
+        self.db.flush()
+        for section in sections_for(article.category):
+            snapshot = self._locked(section)
+            if snapshot is not None and any(card["id"] == article.id for card in json.loads(snapshot.cards)):
+                snapshot.cards = json.dumps(self._query_cards(section))
+
+    def rebuild(self, sections: Optional[Iterable[str]] = None) -> None:
+        """Recompute snapshots from articles (e.g. after editing articles outside the curation service)."""
+        if sections is None:
+            sections = list(HOME_SECTIONS) + [category_section(category) for category in settings.TECH_CATEGORIES]
+        for section in sections:
+            self.db.merge(FeedSnapshot(section=section, cards=json.dumps(self._query_cards(section))))
+        self.db.commit()
+
+    def _locked(self, section: str) -> Optional[FeedSnapshot]:
+        # Row lock on Postgres so concurrent publishes do not overwrite each other's card;
+        # SQLite already serializes writers.
+        return self.db.scalar(select(FeedSnapshot).where(FeedSnapshot.section == section).with_for_update())
+
+    def _query_cards(self, section: str) -> List[Dict]:
+        categories, limit = section_spec(section)
+        query = select(*(getattr(Article, name) for name in ARTICLE_CARD_FIELDS)).where(Article.is_active == True)
+        if categories is not None:
+            query = query.where(Article.category.in_(categories) if len(categories) > 1 else Article.category == categories[0])
+        query = query.order_by(Article.scraped_date.desc(), Article.id.desc()).limit(limit)
+        return [_card(row) for row in self.db.execute(query)]
@@ -0,0 +1,220 @@
+"""
+Pluggable LLM backends used by the summarizer.
+
+The Gemini backend talks to the real API. The fake backend is a deterministic
+local stand-in that returns schema-valid output for the curation prompts (structuring
+and segment translation), so the pipeline can be tested and benchmarked without a
+GEMINI_API_KEY.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+from config.settings import settings
+
+
+@dataclass
+class LLMResult:
+    text: str
+    model: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class LLMBackendError(Exception):
+    """Raised by a backend when a generation request fails; transient failures are worth retrying."""
+
+    def __init__(self, message: str, transient: bool = False):
+        super().__init__(message)
+        self.transient = transient
+
+
+# HTTP statuses of failures that may succeed on retry: timeout, rate limit, server errors
+TRANSIENT_HTTP_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) for backends without usage data."""
+    if not text:
+        return 0
+    return max(1, len(text) // 4)
+
+
+class LLMBackend(ABC):
+    name: str = "base"
+
+    @abstractmethod
+    def generate(self, prompt: str) -> LLMResult:
+        pass
+
+    def is_transient(self, error: Exception) -> bool:
+        """
+        Whether a failed generate() may succeed if retried. Everything else (bad
+        requests, auth, safety blocks, bugs) fails at once instead of being paid for again.
+        """
+        if isinstance(error, LLMBackendError):
+            return error.transient
+        return isinstance(error, (TimeoutError, ConnectionError))
+
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str] = None, model_name: str = None, temperature: float = 0.5):
+        self.api_key = api_key or settings.GEMINI_API_KEY
+        self.model_name = model_name or settings.GEMINI_MODEL
+        self.temperature = temperature
+
+    def generate(self, prompt: str) -> LLMResult:
+        if not self.api_key:
+            raise LLMBackendError("API key not configured")
+
+        import google.generativeai as genai
+
+        genai.configure(api_key=self.api_key)
+        model = genai.GenerativeModel(self.model_name)
+        response = model.generate_content(
+            prompt, generation_config=genai.types.GenerationConfig(temperature=self.temperature)
+        )
+        text = response.text
+
+        usage = getattr(response, "usage_metadata", None)
+        input_tokens = getattr(usage, "prompt_token_count", 0) or estimate_tokens(prompt)
+        output_tokens = getattr(usage, "candidates_token_count", 0) or estimate_tokens(text)
+        return LLMResult(text=text, model=self.model_name, input_tokens=input_tokens, output_tokens=output_tokens)
+
+    def is_transient(self, error: Exception) -> bool:
+        # google.api_core errors carry the HTTP status as .code
+        return super().is_transient(error) or getattr(error, "code", None) in TRANSIENT_HTTP_STATUSES
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Deterministic offline backend.
+
+    The text depends only on the prompt, so repeated runs produce the same output.
+    Latency and failures are simulated from settings or constructor arguments, drawn
+    from the seed, the prompt and the call's position in this backend's call order: a
+    run with the same sequence of calls is reproducible, and a retried prompt does not
+    fail the same way every time.
+    """
+    name = "fake"
+
+    FIELDS_START = "REQUIRED FIELDS AND INSTRUCTIONS:"
+    FIELDS_END = "OUTPUT FORMAT:"
+    ARTICLE_MARKER = "ARTICLE CONTENT:"
+    SEGMENTS_MARKER = "SEGMENTS TO TRANSLATE:"
+
+    def __init__(self, latency_ms: float = None, jitter_ms: float = None, failure_rate: float = None, seed: int = None):
+        self.latency_ms = settings.FAKE_LLM_LATENCY_MS if latency_ms is None else latency_ms
+        self.jitter_ms = settings.FAKE_LLM_JITTER_MS if jitter_ms is None else jitter_ms
+        self.failure_rate = settings.FAKE_LLM_FAILURE_RATE if failure_rate is None else failure_rate
+        self.seed = settings.FAKE_LLM_SEED if seed is None else seed
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def _rng(self, prompt: str, call_index: int) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}:{call_index}:{prompt}".encode("utf-8")).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def generate(self, prompt: str) -> LLMResult:
+        with self._lock:
+            call_index = self._calls
+            self._calls += 1
+
+        rng = self._rng(prompt, call_index)
+        delay_ms = self.latency_ms + (rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+        if self.failure_rate and rng.random() < self.failure_rate:
+            raise LLMBackendError("Simulated backend failure", transient=True)
+
+        if self.SEGMENTS_MARKER in prompt:
+            text = self._translation_response(prompt)
+        elif self.FIELDS_START in prompt:
+            text = self._structured_response(prompt)
+        else:
+            text = self._summary_response(prompt)
+
+        return LLMResult(
+            text=text,
+            model=f"fake-{settings.GEMINI_MODEL}",
+            input_tokens=estimate_tokens(prompt),
+            output_tokens=estimate_tokens(text),
+        )
+
+    def _article_text(self, prompt: str) -> str:
+        body = prompt.split(self.ARTICLE_MARKER, 1)[-1] if self.ARTICLE_MARKER in prompt else prompt
+        parts = body.split("---")
+        text = parts[1] if len(parts) >= 3 else body
+        return " ".join(text.split())
+
+    def _sentences(self, prompt: str, count: int) -> list:
+        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", self._article_text(prompt)) if s.strip()]
+        if not sentences:
+            sentences = ["No article content was provided."]
+        return [sentences[i % len(sentences)] for i in range(count)]
+
+    def _summary_response(self, prompt: str) -> str:
+        return " ".join(self._sentences(prompt, 3))
+
+    def _structured_response(self, prompt: str) -> str:
+        fields_block = prompt.split(self.FIELDS_START, 1)[1].split(self.FIELDS_END, 1)[0]
+        try:
+            fields = json.loads(fields_block)
+        except json.JSONDecodeError:
+            fields = {"Detailed Summary": "Summary"}
+
+        sentences = self._sentences(prompt, len(fields))
+        result = {}
+        for index, (field, instruction) in enumerate(fields.items()):
+            if isinstance(instruction, dict):
+                result[field] = {name: str((index + len(name)) % 10 + 1) for name in instruction}
+                continue
+            result[field] = sentences[index]
+        return json.dumps(result, ensure_ascii=False)
+
+    def _translation_response(self, prompt: str) -> str:
+        try:
+            segments = json.loads(prompt.split(self.SEGMENTS_MARKER, 1)[1])
+        except json.JSONDecodeError:
+            segments = []
+        return json.dumps([f"[te] {segment}" for segment in segments], ensure_ascii=False)
+
+
+_backend: Optional[LLMBackend] = None
+_backend_lock = threading.Lock()
+
+
+def create_llm_backend(name: str = None) -> LLMBackend:
+    name = (name or settings.LLM_BACKEND).lower()
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "fake":
+        return FakeLLMBackend()
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+def get_llm_backend() -> LLMBackend:
+    """Return the process-wide backend, creating it from settings on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_llm_backend()
+    return _backend
+
+
+def set_llm_backend(backend: Optional[LLMBackend]) -> None:
+    """Install a backend explicitly (tests, benchmarks). Pass None to reset to settings."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
@@ -0,0 +1,112 @@
+"""
+Aggregate reports over recorded LLM calls (see LLMCall): spend and volume per day and
+per category, and latency percentiles per prompt type.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.database import LLMCall
+from config.settings import settings
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost from LLM_PRICING (per million tokens). Unknown models cost 0."""
+    pricing = settings.LLM_PRICING.get(model)
+    if not pricing:
+        return 0.0
+    return (input_tokens * pricing.get("input", 0.0) + output_tokens * pricing.get("output", 0.0)) / 1_000_000
+
+
+class LLMUsageReport:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _since(self, days: int) -> datetime:
+        return datetime.utcnow() - timedelta(days=days)
+
+    def _grouped(self, group_column, days: int) -> List[Dict]:
+        rows = self.db.execute(
+            select(
+                group_column.label("group_key"),
+                LLMCall.model,
+                func.count(LLMCall.id).label("calls"),
+                func.sum(case((LLMCall.outcome != "success", 1), else_=0)).label("errors"),
+                func.sum(LLMCall.retries).label("retries"),
+                func.sum(LLMCall.input_tokens).label("input_tokens"),
+                func.sum(LLMCall.output_tokens).label("output_tokens"),
+                func.avg(LLMCall.latency_ms).label("avg_latency_ms"),
+            )
+            .where(LLMCall.created_at >= self._since(days))
+            .group_by(group_column, LLMCall.model)
+        ).all()
+
+        totals = defaultdict(lambda: {
+            "calls": 0, "errors": 0, "retries": 0, "input_tokens": 0, "output_tokens": 0,
+            "cost_usd": 0.0, "_latency_sum": 0.0,
+        })
+        for row in rows:
+            entry = totals[row.group_key]
+            entry["calls"] += row.calls
+            entry["errors"] += row.errors or 0
+            entry["retries"] += row.retries or 0
+            entry["input_tokens"] += row.input_tokens or 0
+            entry["output_tokens"] += row.output_tokens or 0
+            entry["cost_usd"] += estimate_cost(row.model, row.input_tokens or 0, row.output_tokens or 0)
+            entry["_latency_sum"] += (row.avg_latency_ms or 0.0) * row.calls
+
+        results = []
+        for key, entry in totals.items():
+            latency_sum = entry.pop("_latency_sum")
+            entry["avg_latency_ms"] = round(latency_sum / entry["calls"], 1) if entry["calls"] else 0.0
+            entry["cost_usd"] = round(entry["cost_usd"], 6)
+            results.append({"key": key, **entry})
+        return results
+
+    def daily(self, days: int = 30) -> List[Dict]:
+        day = func.date(LLMCall.created_at)
+        results = self._grouped(day, days)
+        for entry in results:
+            entry["day"] = str(entry.pop("key"))
+        return sorted(results, key=lambda entry: entry["day"])
+
+    def by_category(self, days: int = 30) -> List[Dict]:
+        results = self._grouped(LLMCall.category, days)
+        for entry in results:
+            entry["category"] = entry.pop("key") or "Uncategorized"
+        return sorted(results, key=lambda entry: entry["cost_usd"], reverse=True)
+
+    def latency(self, days: int = 7) -> List[Dict]:
+        """p50/p95 latency per prompt type, computed over the successful calls in the window."""
+        rows = self.db.execute(
+            select(LLMCall.prompt_type, LLMCall.latency_ms)
+            .where(LLMCall.created_at >= self._since(days), LLMCall.outcome == "success")
+        ).all()
+
+        by_type = defaultdict(list)
+        for row in rows:
+            by_type[row.prompt_type].append(row.latency_ms)
+
+        return [
+            {
+                "prompt_type": prompt_type,
+                "calls": len(values),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "max_ms": round(max(values), 1),
+            }
+            for prompt_type, values in sorted(by_type.items())
+        ]
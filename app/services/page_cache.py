@@ -0,0 +1,219 @@
+"""
+Rendered-HTML cache for the public pages (home, category and article).
+
+Entries are keyed by URL and language and tagged with what they show: "home",
+"category:<name>" or "article:<id>". Each tag has a version number; an entry is
+valid only while the versions it was rendered under are current, and curation
+writes (publish, approve, deactivate) invalidate by bumping their tags' versions.
+Handlers read the versions before querying, so a write that lands while a page is
+being rendered leaves that page stale-stamped rather than cached as current.
+
+Each entry can carry a small metadata dict next to the body (the page's HTTP
+validators), so a cache hit can also answer a conditional request.
+
+Two tiers: an in-process LRU, and optionally Redis (PAGE_CACHE_REDIS_URL) shared
+by every worker. With Redis the tag versions live there too, so an invalidation in
+one worker reaches all of them; without it each worker invalidates only its own
+LRU and PAGE_CACHE_TTL_SECONDS bounds how stale another worker's copy can get.
+
+The time of each tag's last invalidation is kept as well (invalidated_within), so a
+page rendered from a read replica right after a write, which may not have reached
+the replica yet, can be left out of the cache.
+
+The methods are synchronous. Async handlers call them through run(), which with the
+Redis tier moves them to the threadpool so a slow or unreachable Redis never blocks
+the event loop; its calls also time out quickly, and a failed call falls back to the
+local tier.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def article_tags(category: str, article_id: Optional[int] = None) -> List[str]:
+    """Tags of the pages that show an article: home and its category page (and its own page)."""
+    tags = ["home", f"category:{category}"]
+    if article_id is not None:
+        tags.append(f"article:{article_id}")
+    return tags
+
+
+class RedisTier:
+    """Shared tier: page bodies under page_cache:page:<key>, tag versions and invalidation times in two hashes."""
+
+    VERSIONS_KEY = "page_cache:tag_versions"
+    INVALIDATED_AT_KEY = "page_cache:tag_invalidated_at"
+
+    def __init__(self, url: str, ttl_seconds: int, timeout_seconds: Optional[float] = None):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=timeout_seconds, socket_connect_timeout=timeout_seconds)
+        self.ttl_seconds = ttl_seconds
+
+    def versions(self, tags: Sequence[str]) -> Tuple[int, ...]:
+        return tuple(int(value or 0) for value in self.client.hmget(self.VERSIONS_KEY, list(tags)))
+
+    def bump(self, tags: Iterable[str]) -> None:
+        now = time.time()
+        pipeline = self.client.pipeline()
+        for tag in tags:
+            pipeline.hincrby(self.VERSIONS_KEY, tag, 1)
+            pipeline.hset(self.INVALIDATED_AT_KEY, tag, now)
+        pipeline.execute()
+
+    def invalidated_at(self, tags: Sequence[str]) -> Tuple[float, ...]:
+        return tuple(float(value or 0) for value in self.client.hmget(self.INVALIDATED_AT_KEY, list(tags)))
+
+    def get(self, key: str) -> Optional[Tuple[Tuple[int, ...], bytes, dict]]:
+        value = self.client.get(f"page_cache:page:{key}")
+        if value is None:
+            return None
+        header, _, body = value.partition(b"\n")
+        versions, meta = json.loads(header)
+        return tuple(versions), body, meta
+
+    def set(self, key: str, versions: Tuple[int, ...], body: bytes, meta: dict) -> None:
+        value = json.dumps([versions, meta]).encode("utf-8") + b"\n" + body
+        self.client.set(f"page_cache:page:{key}", value, ex=self.ttl_seconds)
+
+    def clear(self) -> None:
+        self.client.delete(self.VERSIONS_KEY, self.INVALIDATED_AT_KEY)
+        for key in self.client.scan_iter("page_cache:page:*"):
+            self.client.delete(key)
+
+
+class PageCache:
+    def __init__(self, max_entries: int = 1000, ttl_seconds: int = 300, shared=None, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, ...], float, bytes, dict]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._invalidated_at: Dict[str, float] = {}
+        # Invalidations come from threadpool handlers and the scheduler as well as the event loop
+        self._lock = threading.Lock()
+
+    async def run(self, method: Callable[..., T], *args) -> T:
+        """
+        Call one of this cache's methods from async code. With the shared tier it does
+        network I/O and runs in the threadpool; the local tier alone is answered inline.
+        """
+        if self.shared is None:
+            return method(*args)
+        return await run_in_threadpool(method, *args)
+
+    def versions(self, tags: Sequence[str]) -> Tuple[int, ...]:
+        """Current versions of tags. Take them before reading the data a page is rendered from."""
+        if self.shared is not None:
+            try:
+                return self.shared.versions(tags)
+            except Exception as e:
+                logger.warning(f"Shared page cache unavailable, using the local tier only: {e}")
+        with self._lock:
+            return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    def get(self, key: str, versions: Tuple[int, ...]) -> Optional[Tuple[bytes, dict]]:
+        """(body, meta) cached for key if it was rendered under these tag versions, else None."""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_versions, expires_at, body, meta = entry
+                if entry_versions == versions and expires_at > now:
+                    self._entries.move_to_end(key)
+                    return body, meta
+                del self._entries[key]
+        if self.shared is not None:
+            try:
+                shared_entry = self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"Shared page cache read failed: {e}")
+                shared_entry = None
+            if shared_entry is not None and shared_entry[0] == versions:
+                _, body, meta = shared_entry
+                self._store_local(key, versions, body, meta, now)
+                return body, meta
+        return None
+
+    def set(self, key: str, versions: Tuple[int, ...], body: bytes, meta: Optional[dict] = None) -> None:
+        """Cache a body rendered under versions (as returned by versions() before rendering)."""
+        if not self.enabled:
+            return
+        meta = meta or {}
+        self._store_local(key, versions, body, meta, time.monotonic())
+        if self.shared is not None:
+            try:
+                self.shared.set(key, versions, body, meta)
+            except Exception as e:
+                logger.warning(f"Shared page cache write failed: {e}")
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Make every entry tagged with any of tags stale. Call after the write commits."""
+        tags = list(dict.fromkeys(tags))
+        now = time.time()
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                self._invalidated_at[tag] = now
+        if self.shared is not None:
+            try:
+                self.shared.bump(tags)
+            except Exception as e:
+                logger.warning(f"Shared page cache invalidation failed: {e}")
+
+    def invalidated_within(self, tags: Sequence[str], seconds: float) -> bool:
+        """Whether any of tags was invalidated (by any worker, with Redis) in the last `seconds`."""
+        with self._lock:
+            latest = max((self._invalidated_at.get(tag, 0.0) for tag in tags), default=0.0)
+        if self.shared is not None:
+            try:
+                latest = max((latest, *self.shared.invalidated_at(tags)))
+            except Exception as e:
+                logger.warning(f"Shared page cache unavailable, using the local tier only: {e}")
+        return time.time() - latest < seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._invalidated_at.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def _store_local(self, key: str, versions: Tuple[int, ...], body: bytes, meta: dict, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (versions, now + self.ttl_seconds, body, meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def build_page_cache() -> PageCache:
+    shared = None
+    if settings.PAGE_CACHE_REDIS_URL:
+        shared = RedisTier(settings.PAGE_CACHE_REDIS_URL, settings.PAGE_CACHE_TTL_SECONDS,
+                           settings.PAGE_CACHE_REDIS_TIMEOUT_SECONDS)
+    return PageCache(
+        max_entries=settings.PAGE_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.PAGE_CACHE_TTL_SECONDS,
+        shared=shared,
+        enabled=settings.PAGE_CACHE_ENABLED,
+    )
+
+
+page_cache = build_page_cache()
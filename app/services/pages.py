@@ -0,0 +1,37 @@
+"""
+What each public page shows: its template and the data it is rendered from.
+
+Shared by the live handlers in app/api/main.py (through run_sync) and the static
+export (app/services/static_export.py), so an exported page is the same page.
+"""
+
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.database import Article
+from app.services.feeds import FeedSnapshots, HOME_SECTIONS, category_section
+
+HOME_TEMPLATE = "index.html"
+CATEGORY_TEMPLATE = "category.html"
+ARTICLE_TEMPLATE = "article.html"
+
+
+def home_context(db: Session) -> Dict:
+    # Latest (all categories), top stories and AI cards come from the feed snapshots
+    feeds = FeedSnapshots(db).get(list(HOME_SECTIONS))
+    return {"latest_articles": feeds["latest"], "top_stories": feeds["top_stories"], "ai_articles": feeds["ai"]}
+
+
+def category_context(db: Session, category: str) -> Dict:
+    section = category_section(category)
+    return {"articles": FeedSnapshots(db).get([section])[section], "category": category}
+
+
+def article_context(db: Session, article_id: int) -> Optional[Dict]:
+    """The article page's context, or None if there is no such active article."""
+    article = db.scalar(select(Article).filter(Article.id == article_id, Article.is_active == True))
+    if article is None:
+        return None
+    return {"article": article}
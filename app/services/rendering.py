@@ -0,0 +1,59 @@
+"""
+Article bodies rendered from Markdown to HTML once, when they are written.
+
+Article.content_html_en / content_html_te hold the rendered bodies, so an article
+view is a template render with no Markdown parsing. ORM writes keep them current
+through attribute events (below); the set-based bulk paths in CurationService call
+render_markdown() themselves, and backfill_content_html() covers older rows.
+"""
+
+from typing import Optional
+
+import markdown
+from sqlalchemy import event, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.database import Article
+
+
+def render_markdown(text: Optional[str]) -> Optional[str]:
+    return markdown.markdown(text) if text else None
+
+
+@event.listens_for(Article.content_en, "set")
+def _render_content_en(target, value, oldvalue, initiator):
+    if value != oldvalue:
+        target.content_html_en = render_markdown(value)
+
+
+@event.listens_for(Article.content_te, "set")
+def _render_content_te(target, value, oldvalue, initiator):
+    if value != oldvalue:
+        target.content_html_te = render_markdown(value)
+
+
+def backfill_content_html(db: Session, batch_size: int = 500, rerender: bool = False) -> int:
+    """
+    Render the HTML columns for articles that lack them (every article if rerender),
+    in id-ordered batches committed one at a time. Returns the number of articles.
+    """
+    query = select(Article.id, Article.content_en, Article.content_te)
+    if not rerender:
+        query = query.where(or_(
+            Article.content_html_en.is_(None) & Article.content_en.isnot(None),
+            Article.content_html_te.is_(None) & Article.content_te.isnot(None),
+        ))
+    rendered = 0
+    last_id = 0
+    while True:
+        rows = db.execute(query.where(Article.id > last_id).order_by(Article.id).limit(batch_size)).all()
+        if not rows:
+            return rendered
+        db.execute(update(Article), [
+            {"id": row.id, "content_html_en": render_markdown(row.content_en),
+             "content_html_te": render_markdown(row.content_te)}
+            for row in rows
+        ])
+        db.commit()
+        rendered += len(rows)
+        last_id = rows[-1].id
@@ -0,0 +1,180 @@
+"""
+Retention for the hot curation and logging tables.
+
+- Stale pending raw articles (never picked up within RETENTION_PENDING_DAYS) are deleted.
+- Published raw articles older than RETENTION_PUBLISHED_DAYS move, with their
+  ArticleSections, to raw_articles_archive or to gzipped NDJSON files.
+- scraping_logs rows older than RETENTION_LOG_DAYS are rolled up into
+  scraping_log_daily and deleted.
+
+Every step works through the rows in id order, RETENTION_BATCH_SIZE at a time, and
+commits each batch, so no transaction holds its locks for long. The NDJSON archive
+is written before its batch is deleted; a crash in between can repeat a batch in
+the files, never lose one.
+"""
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.database import (
+    ArchivedRawArticle, ArticleSection, RawArticle, ScrapingLog, ScrapingLogDaily
+)
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLUMNS = (
+    "id", "title", "content", "summary", "source_url", "source_name", "category",
+    "published_date", "scraped_date", "content_type", "status", "triage_score",
+)
+SECTION_COLUMNS = ("section_title_en", "section_content_en", "section_title_te", "section_content_te")
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class RetentionService:
+    def __init__(self, db: Session, now: Optional[datetime] = None, batch_size: Optional[int] = None):
+        self.db = db
+        self.now = now or datetime.utcnow()
+        self.batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+
+    def run(self) -> Dict[str, int]:
+        """Apply every policy. Returns the number of rows each one handled."""
+        results = {
+            "pending_deleted": self.purge_stale_pending(),
+            "published_archived": self.archive_published(),
+            "logs_rolled_up": self.rollup_scraping_logs(),
+        }
+        logger.info(f"Retention run completed: {results}")
+        return results
+
+    def purge_stale_pending(self) -> int:
+        cutoff = self.now - timedelta(days=settings.RETENTION_PENDING_DAYS)
+        deleted = 0
+        while True:
+            ids = self.db.scalars(
+                select(RawArticle.id)
+                .where(RawArticle.status == "pending", RawArticle.scraped_date < cutoff)
+                .order_by(RawArticle.id)
+                .limit(self.batch_size)
+            ).all()
+            if not ids:
+                return deleted
+            self.db.execute(delete(ArticleSection).where(ArticleSection.raw_article_id.in_(ids)))
+            self.db.execute(delete(RawArticle).where(RawArticle.id.in_(ids)))
+            self.db.commit()
+            deleted += len(ids)
+
+    def archive_published(self) -> int:
+        cutoff = self.now - timedelta(days=settings.RETENTION_PUBLISHED_DAYS)
+        archived = 0
+        while True:
+            rows = self.db.execute(
+                select(*(getattr(RawArticle, name) for name in ARCHIVE_COLUMNS))
+                .where(RawArticle.status == "published", RawArticle.scraped_date < cutoff)
+                .order_by(RawArticle.id)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                return archived
+            ids = [row.id for row in rows]
+
+            sections: Dict[int, List[dict]] = {article_id: [] for article_id in ids}
+            for section in self.db.execute(
+                select(ArticleSection.raw_article_id, *(getattr(ArticleSection, name) for name in SECTION_COLUMNS))
+                .where(ArticleSection.raw_article_id.in_(ids))
+                .order_by(ArticleSection.raw_article_id, ArticleSection.id)
+            ):
+                record = section._asdict()
+                sections[record.pop("raw_article_id")].append(record)
+
+            records = [dict(row._asdict(), sections=sections[row.id]) for row in rows]
+            if settings.RETENTION_ARCHIVE_MODE == "ndjson":
+                self._write_ndjson(records)
+            else:
+                self.db.execute(insert(ArchivedRawArticle), [
+                    {
+                        **{name: value for name, value in record.items() if name != "id"},
+                        "raw_article_id": record["id"],
+                        "sections": json.dumps(record["sections"], ensure_ascii=False),
+                        "archived_at": self.now,
+                    }
+                    for record in records
+                ])
+
+            self.db.execute(delete(ArticleSection).where(ArticleSection.raw_article_id.in_(ids)))
+            self.db.execute(delete(RawArticle).where(RawArticle.id.in_(ids)))
+            self.db.commit()
+            archived += len(ids)
+
+    def rollup_scraping_logs(self) -> int:
+        cutoff = self.now - timedelta(days=settings.RETENTION_LOG_DAYS)
+        rolled_up = 0
+        while True:
+            logs = self.db.execute(
+                select(
+                    ScrapingLog.id, ScrapingLog.source_name, ScrapingLog.category, ScrapingLog.status,
+                    ScrapingLog.articles_found, ScrapingLog.articles_new, ScrapingLog.started_at,
+                )
+                .where(ScrapingLog.started_at < cutoff)
+                .order_by(ScrapingLog.id)
+                .limit(self.batch_size)
+            ).all()
+            if not logs:
+                return rolled_up
+
+            totals: Dict[tuple, Dict[str, int]] = {}
+            for log in logs:
+                key = (log.started_at.date(), log.source_name, log.category)
+                total = totals.setdefault(key, {
+                    "runs": 0, "success_runs": 0, "error_runs": 0, "articles_found": 0, "articles_new": 0
+                })
+                total["runs"] += 1
+                total["success_runs"] += log.status == "success"
+                total["error_runs"] += log.status == "error"
+                total["articles_found"] += log.articles_found or 0
+                total["articles_new"] += log.articles_new or 0
+
+            self._merge_daily(totals)
+            self.db.execute(delete(ScrapingLog).where(ScrapingLog.id.in_([log.id for log in logs])))
+            self.db.commit()
+            rolled_up += len(logs)
+
+    def _merge_daily(self, totals: Dict[tuple, Dict[str, int]]) -> None:
+        """Add batch totals to scraping_log_daily, updating days already rolled up."""
+        days = {day for day, _, _ in totals}
+        existing = {
+            (row.day, row.source_name, row.category): row
+            for row in self.db.scalars(select(ScrapingLogDaily).where(ScrapingLogDaily.day.in_(days)))
+        }
+        new_rows, updates = [], []
+        for key, total in totals.items():
+            row = existing.get(key)
+            if row is None:
+                day, source_name, category = key
+                new_rows.append(dict(total, day=day, source_name=source_name, category=category))
+            else:
+                updates.append({"id": row.id, **{name: getattr(row, name) + value for name, value in total.items()}})
+        if new_rows:
+            self.db.execute(insert(ScrapingLogDaily), new_rows)
+        if updates:
+            self.db.execute(update(ScrapingLogDaily), updates)
+
+    def _write_ndjson(self, records: List[dict]) -> None:
+        os.makedirs(settings.RETENTION_ARCHIVE_DIR, exist_ok=True)
+        path = os.path.join(settings.RETENTION_ARCHIVE_DIR, f"raw_articles-{self.now:%Y%m%d}.ndjson.gz")
+        # Appending gzip members keeps the file a valid (multi-member) gzip stream
+        with gzip.open(path, "at", encoding="utf-8") as archive:
+            for record in records:
+                archive.write(json.dumps(record, ensure_ascii=False, default=_json_default) + "\n")
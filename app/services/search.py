@@ -0,0 +1,141 @@
+"""
+Full-text search over published articles, in English and Telugu.
+
+SQLite uses the articles_fts FTS5 table and Postgres the articles.search_vector
+column (both defined in app/models/database.py). On SQLite the index is maintained
+here: publish_final_article() indexes the new article and deactivate_article()
+removes it. On Postgres the generated column follows the row by itself, so those
+calls are no-ops and only the is_active filter applies.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.database import Article, ARTICLE_SEARCH_COLUMNS
+from config.settings import settings
+
+# bm25 column weights, in ARTICLE_SEARCH_COLUMNS order: titles > summaries > bodies
+BM25_WEIGHTS = (10.0, 10.0, 4.0, 4.0, 1.0, 1.0)
+
+RESULT_COLUMNS = (
+    "a.id, a.title_en, a.title_te, a.summary_en, a.summary_te, a.source_name, "
+    "a.category, a.image_url, a.published_date, a.scraped_date"
+)
+
+
+def fts5_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query where every term must match. Terms are quoted
+    so user input cannot inject FTS5 syntax. No prefix matching: without a prefix
+    index it reads the doclist of every term sharing the prefix.
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+class ArticleSearchIndex:
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    def index_article(self, article: Article) -> None:
+        """Add a (flushed) article to the index. Call inside the publishing transaction."""
+        if self.dialect != "sqlite":
+            return
+        self.db.execute(
+            text(
+                f"INSERT INTO articles_fts(rowid, {', '.join(ARTICLE_SEARCH_COLUMNS)}) "
+                f"VALUES (:id, {', '.join(':' + name for name in ARTICLE_SEARCH_COLUMNS)})"
+            ),
+            self._values(article),
+        )
+
+    def index_articles(self, articles: Sequence) -> None:
+        """index_article() for a batch of flushed articles (or rows with the search columns)."""
+        if self.dialect != "sqlite" or not articles:
+            return
+        self.db.execute(
+            text(
+                f"INSERT INTO articles_fts(rowid, {', '.join(ARTICLE_SEARCH_COLUMNS)}) "
+                f"VALUES (:id, {', '.join(':' + name for name in ARTICLE_SEARCH_COLUMNS)})"
+            ),
+            [self._values(article) for article in articles],
+        )
+
+    def remove_article(self, article: Article) -> None:
+        """
+        Drop an article from the index. External-content FTS5 deletes need the indexed
+        text, so call this before the article's text changes.
+        """
+        if self.dialect != "sqlite":
+            return
+        self.db.execute(
+            text(
+                f"INSERT INTO articles_fts(articles_fts, rowid, {', '.join(ARTICLE_SEARCH_COLUMNS)}) "
+                f"VALUES ('delete', :id, {', '.join(':' + name for name in ARTICLE_SEARCH_COLUMNS)})"
+            ),
+            self._values(article),
+        )
+
+    def rebuild(self) -> None:
+        """Rebuild the SQLite index from the articles table (e.g. after a bulk import)."""
+        if self.dialect == "sqlite":
+            self.db.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+            # Rebuild indexes every row; take deactivated ones back out
+            for article in self.db.query(Article).filter(Article.is_active == False).all():
+                self.remove_article(article)
+            self.db.commit()
+
+    def search(self, query: str, category: Optional[str] = None, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """
+        Active articles matching query, best match first; each result carries its rank.
+        Only the newest SEARCH_CANDIDATE_LIMIT matches are ranked: reading matches in id
+        order stops early, whereas ranking every match of a common term does not.
+        """
+        if not query.strip():
+            return []
+        params = {
+            "category": category, "limit": limit, "offset": offset,
+            "candidates": settings.SEARCH_CANDIDATE_LIMIT,
+        }
+        category_filter = "AND a.category = :category" if category else ""
+
+        if self.dialect == "sqlite":
+            params["query"] = fts5_query(query)
+            weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+            # Deactivated articles are removed from the index, so articles only needs
+            # joining for a category filter and for the final page.
+            category_join = (
+                "JOIN articles a ON a.id = articles_fts.rowid AND a.category = :category " if category else ""
+            )
+            # bm25() is lower-is-better; negate it so every backend returns higher-is-better
+            statement = (
+                "WITH candidates AS ("
+                f"SELECT articles_fts.rowid AS id, -bm25(articles_fts, {weights}) AS rank "
+                f"FROM articles_fts {category_join}"
+                "WHERE articles_fts MATCH :query "
+                "ORDER BY articles_fts.rowid DESC LIMIT :candidates), "
+                "page AS (SELECT id, rank FROM candidates ORDER BY rank DESC, id DESC LIMIT :limit OFFSET :offset) "
+                f"SELECT {RESULT_COLUMNS}, page.rank FROM page JOIN articles a ON a.id = page.id AND a.is_active = 1 "
+                "ORDER BY page.rank DESC, a.id DESC"
+            )
+        else:
+            params["query"] = query
+            statement = (
+                "WITH q AS (SELECT websearch_to_tsquery('english', :query) || websearch_to_tsquery('simple', :query) AS q), "
+                "candidates AS ("
+                "SELECT a.id, a.search_vector FROM articles a, q "
+                f"WHERE a.search_vector @@ q.q AND a.is_active {category_filter} "
+                "ORDER BY a.id DESC LIMIT :candidates) "
+                f"SELECT {RESULT_COLUMNS}, ts_rank_cd(c.search_vector, q.q) AS rank "
+                "FROM candidates c JOIN articles a ON a.id = c.id, q "
+                "ORDER BY rank DESC, a.id DESC LIMIT :limit OFFSET :offset"
+            )
+        return [row._asdict() for row in self.db.execute(text(statement), params)]
+
+    @staticmethod
+    def _values(article: Article) -> Dict:
+        values = {name: getattr(article, name) or "" for name in ARTICLE_SEARCH_COLUMNS}
+        values["id"] = article.id
+        return values
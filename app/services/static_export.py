@@ -0,0 +1,204 @@
+"""
+Static export of the public pages, for nginx or a CDN to serve without Python.
+
+Every page is written once per language as <output>/<language><path>/index.html
+(en/index.html, te/category/AI/index.html, en/article/42/index.html, ...); the web
+server picks the language directory from the lang cookie or Accept-Language and falls
+back to the app for anything not exported (see README).
+
+A full export renders everything. Article pages go to a process pool in chunks, each
+worker with its own database engine, since rendering is CPU-bound. After that, exports
+are incremental: only what changed since the previous export (its start time is kept
+in <output>/.export-state.json) is rendered again:
+
+- articles whose updated_at is newer: re-rendered, or their pages removed if the
+  article was deactivated;
+- home and category pages whose feed snapshots changed, which they do exactly when
+  the page content does.
+
+A different APP_VERSION (the templates may have changed) forces a full export. Pages
+are written to a temporary file and renamed, so the server never sees half a page.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.i18n import i18n_manager
+from app.models.database import Article, FeedSnapshot, build_engine
+from app.services.feeds import FeedSnapshots, HOME_SECTIONS, category_section
+from app.services.pages import ARTICLE_TEMPLATE, CATEGORY_TEMPLATE, HOME_TEMPLATE, category_context, home_context
+from app.templating import get_template_context, site_request, templates
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = ".export-state.json"
+ARTICLE_CHUNK_SIZE = 500
+# Pages with no data behind them: exported with every full export
+INFO_PAGES = {"/about": "about.html", "/how-it-works": "how_it_works.html", "/contact": "contact.html"}
+
+
+def page_file(language: str, url_path: str) -> str:
+    """Where the page for url_path is written, relative to the output directory."""
+    return os.path.join(language, url_path.strip("/"), "index.html")
+
+
+def render_page(template: str, url_path: str, language: str, context: Dict) -> str:
+    return templates.get_template(template).render(get_template_context(site_request(url_path), language, **context))
+
+
+def write_page(output_dir: str, language: str, url_path: str, html: str) -> None:
+    target = os.path.join(output_dir, page_file(language, url_path))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temporary = f"{target}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(temporary, target)
+
+
+def export_articles(db: Session, output_dir: str, article_ids: Sequence[int]) -> int:
+    """Write the pages of the active articles among article_ids. Returns the number of pages."""
+    written = 0
+    for start in range(0, len(article_ids), ARTICLE_CHUNK_SIZE):
+        chunk = article_ids[start:start + ARTICLE_CHUNK_SIZE]
+        for article in db.scalars(select(Article).where(Article.id.in_(chunk), Article.is_active == True)):
+            url_path = f"/article/{article.id}"
+            for language in i18n_manager.supported_languages:
+                write_page(output_dir, language, url_path, render_page(ARTICLE_TEMPLATE, url_path, language, {"article": article}))
+                written += 1
+        # Keep the session from holding every article of a large export
+        db.expunge_all()
+    return written
+
+
+_worker_sessions: Optional[sessionmaker] = None
+
+
+def _init_worker(database_url: str) -> None:
+    global _worker_sessions
+    _worker_sessions = sessionmaker(bind=build_engine(database_url))
+
+
+def _export_chunk(output_dir: str, article_ids: List[int]) -> int:
+    with _worker_sessions() as db:
+        return export_articles(db, output_dir, article_ids)
+
+
+class StaticExporter:
+    def __init__(self, db: Session, output_dir: Optional[str] = None, workers: Optional[int] = None):
+        self.db = db
+        self.output_dir = output_dir or settings.STATIC_EXPORT_DIR
+        self.workers = workers or settings.STATIC_EXPORT_WORKERS or os.cpu_count() or 1
+
+    def run(self, full: bool = False) -> Dict:
+        """Export incrementally, or everything if full (or if there is no usable previous export)."""
+        state = self._load_state()
+        if full or state is None or state.get("app_version") != settings.APP_VERSION:
+            return self.export_all()
+        return self.export_changes(datetime.fromisoformat(state["exported_at"]))
+
+    def export_all(self) -> Dict:
+        section_pages = self._all_section_pages()
+        # Build any missing feed snapshot first, so the next export does not see it as a change
+        FeedSnapshots(self.db).get([section for _, sections in section_pages for section in sections])
+        started = datetime.utcnow()
+        pages = self._export_sections(section_pages)
+        for url_path, template in INFO_PAGES.items():
+            for language in i18n_manager.supported_languages:
+                write_page(self.output_dir, language, url_path, render_page(template, url_path, language, {}))
+                pages += 1
+
+        article_ids = list(self.db.scalars(select(Article.id).where(Article.is_active == True).order_by(Article.id)))
+        pages += self._export_articles_parallel(article_ids)
+        removed = self._remove_articles(self._exported_article_ids() - set(article_ids))
+        self._save_state(started)
+        result = {"full": True, "pages": pages, "removed": removed}
+        logger.info(f"Static export to {self.output_dir}: {result}")
+        return result
+
+    def export_changes(self, since: datetime) -> Dict:
+        started = datetime.utcnow()
+        changed = self.db.execute(select(Article.id, Article.is_active).where(Article.updated_at >= since)).all()
+        pages = export_articles(self.db, self.output_dir, [row.id for row in changed if row.is_active])
+        removed = self._remove_articles(row.id for row in changed if not row.is_active)
+
+        changed_sections = set(self.db.scalars(select(FeedSnapshot.section).where(FeedSnapshot.updated_at >= since)))
+        section_pages = [
+            (url_path, section_names) for url_path, section_names in self._all_section_pages()
+            if changed_sections.intersection(section_names)
+        ]
+        pages += self._export_sections(section_pages)
+        self._save_state(started)
+        result = {"full": False, "pages": pages, "removed": removed}
+        logger.info(f"Static export to {self.output_dir}: {result}")
+        return result
+
+    def _all_section_pages(self):
+        """(url path, feed snapshot sections it shows) for home and every category page."""
+        pages = [("/", list(HOME_SECTIONS))]
+        pages.extend((f"/category/{category}", [category_section(category)]) for category in settings.TECH_CATEGORIES)
+        return pages
+
+    def _export_sections(self, section_pages) -> int:
+        written = 0
+        for url_path, _ in section_pages:
+            if url_path == "/":
+                template, context = HOME_TEMPLATE, home_context(self.db)
+            else:
+                category = url_path.removeprefix("/category/")
+                template, context = CATEGORY_TEMPLATE, category_context(self.db, category)
+            for language in i18n_manager.supported_languages:
+                write_page(self.output_dir, language, url_path, render_page(template, url_path, language, context))
+                written += 1
+        return written
+
+    def _export_articles_parallel(self, article_ids: List[int]) -> int:
+        if self.workers <= 1 or len(article_ids) <= ARTICLE_CHUNK_SIZE:
+            return export_articles(self.db, self.output_dir, article_ids)
+        chunks = [article_ids[start:start + ARTICLE_CHUNK_SIZE] for start in range(0, len(article_ids), ARTICLE_CHUNK_SIZE)]
+        database_url = self.db.get_bind().url.render_as_string(hide_password=False)
+        # spawn: workers must not inherit this process's open database connections
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(database_url,)) as pool:
+            return sum(pool.map(_export_chunk, [self.output_dir] * len(chunks), chunks))
+
+    def _exported_article_ids(self) -> set:
+        ids = set()
+        for language in i18n_manager.supported_languages:
+            directory = os.path.join(self.output_dir, language, "article")
+            if os.path.isdir(directory):
+                ids.update(int(name) for name in os.listdir(directory) if name.isdigit())
+        return ids
+
+    def _remove_articles(self, article_ids: Iterable[int]) -> int:
+        removed = 0
+        for article_id in article_ids:
+            for language in i18n_manager.supported_languages:
+                directory = os.path.join(self.output_dir, language, "article", str(article_id))
+                if os.path.isdir(directory):
+                    shutil.rmtree(directory)
+                    removed += 1
+        return removed
+
+    def _load_state(self) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.output_dir, STATE_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self, started: datetime) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, STATE_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"exported_at": started.isoformat(), "app_version": settings.APP_VERSION}, f)
+        os.replace(f"{path}.tmp", path)
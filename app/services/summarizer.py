@@ -1,33 +1,77 @@
-import google.generativeai as genai
 from config.settings import settings
+from app.services.llm_backend import get_llm_backend
+from dataclasses import dataclass
+from typing import Optional
 import logging
+import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def summarize_with_gemini(prompt: str) -> str:
+@dataclass
+class GenerationStats:
+    """Result of one logical LLM call, including retries, for accounting."""
+    text: str
+    model: str
+    outcome: str  # success, error
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms: float = 0.0
+    retries: int = 0
+    error_message: Optional[str] = None
+
+def generate_with_stats(prompt: str) -> GenerationStats:
     """
-    Generates content using the Google Gemini API.
+    Generates content using the configured LLM backend (Google Gemini by default),
+    retrying failures the backend deems transient up to LLM_MAX_RETRIES times with
+    exponential backoff.
     """
-    if not settings.GEMINI_API_KEY:
+    backend = get_llm_backend()
+    model = getattr(backend, "model_name", backend.name)
+
+    if backend.name == "gemini" and not settings.GEMINI_API_KEY:
         logger.error("GEMINI_API_KEY not found in settings. Cannot generate content.")
-        return "[Generation failed: API key not configured]"
+        return GenerationStats(
+            text="[Generation failed: API key not configured]", model=model, outcome="error",
+            error_message="API key not configured"
+        )
 
     if not prompt or prompt.isspace():
         logger.warning("Prompt is empty. Returning empty response.")
-        return ""
-
-    try:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        response = model.generate_content(prompt, generation_config=genai.types.GenerationConfig(temperature=0.5))
-        
-        text_response = response.text
-        logger.info(f"Successfully generated content of length {len(text_response)}.")
-        return text_response
-
-    except Exception as e:
-        logger.error(f"An error occurred while generating content with Gemini: {e}")
-        return f"[Generation failed: {e}]"
+        return GenerationStats(text="", model=model, outcome="success")
+
+    start = time.perf_counter()
+    retries = 0
+    while True:
+        try:
+            result = backend.generate(prompt)
+            text_response = result.text
+            latency_ms = (time.perf_counter() - start) * 1000
+            logger.info(
+                f"Successfully generated content of length {len(text_response)} "
+                f"({result.input_tokens} in / {result.output_tokens} out tokens, {latency_ms:.0f} ms, {retries} retries)."
+            )
+            return GenerationStats(
+                text=text_response, model=result.model, outcome="success",
+                input_tokens=result.input_tokens, output_tokens=result.output_tokens,
+                latency_ms=latency_ms, retries=retries
+            )
+
+        except Exception as e:
+            if retries < settings.LLM_MAX_RETRIES and backend.is_transient(e):
+                retries += 1
+                logger.warning(f"Generation with {backend.name} failed ({e}); retry {retries}/{settings.LLM_MAX_RETRIES}.")
+                time.sleep(settings.LLM_RETRY_BACKOFF_SECONDS * (2 ** (retries - 1)))
+                continue
+
+            logger.error(f"An error occurred while generating content with {backend.name}: {e}")
+            return GenerationStats(
+                text=f"[Generation failed: {e}]", model=model, outcome="error",
+                latency_ms=(time.perf_counter() - start) * 1000, retries=retries, error_message=str(e)
+            )
+
+def summarize_with_gemini(prompt: str) -> str:
+    """
+    Generates content using the configured LLM backend (Google Gemini by default).
+    """
+    return generate_with_stats(prompt).text
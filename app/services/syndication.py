@@ -0,0 +1,141 @@
+"""
+Outbound feeds: RSS 2.0, Atom and JSON Feed 1.1 per category and language.
+
+Items come from the category's feed snapshot (app/services/feeds.py), which publishing
+and deactivating already keep current, so building a feed needs no article query.
+The /feeds endpoints cache the rendered documents in the page cache under the
+category's tag and validate them by the snapshot's updated_at, like the category
+pages, so a publish rebuilds only the feeds of its own category.
+"""
+
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import quote
+
+from app.templating import TRANSLATORS
+from config.settings import settings
+
+FEED_MEDIA_TYPES = {
+    "rss": "application/rss+xml",
+    "atom": "application/atom+xml",
+    "json": "application/feed+json",
+}
+
+
+def _site_url(path: str) -> str:
+    return settings.SITE_URL.rstrip("/") + path
+
+
+def _utc(value: datetime) -> datetime:
+    # Stored datetimes are naive UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _rfc822(value: datetime) -> str:
+    return format_datetime(_utc(value), usegmt=True)
+
+
+def _rfc3339(value: datetime) -> str:
+    return _utc(value).isoformat()
+
+
+class _Feed:
+    """The language-resolved content every format is written from."""
+
+    def __init__(self, category: str, language: str, cards: List[SimpleNamespace], feed_format: str):
+        translate = TRANSLATORS[language]
+        self.language = language
+        self.title = f"{settings.APP_NAME}: {translate(category)}"
+        self.home_url = _site_url(f"/category/{quote(category)}")
+        self.feed_url = _site_url(f"/feeds/{quote(category)}.{feed_format}") + (f"?lang={language}" if language != "en" else "")
+        self.items = [self._item(card, language) for card in cards]
+        dates = [item["date"] for item in self.items if item["date"]]
+        self.updated = max(dates) if dates else datetime.utcnow()
+
+    @staticmethod
+    def _item(card: SimpleNamespace, language: str) -> Dict:
+        title, summary = card.title_en, card.summary_en
+        if language == "te":
+            # Older snapshots may predate summary_te on the cards
+            title = card.title_te or title
+            summary = getattr(card, "summary_te", None) or summary
+        return {
+            "url": _site_url(f"/article/{card.id}"),
+            "title": title,
+            "summary": summary or "",
+            "category": card.category,
+            "date": card.published_date or card.scraped_date,
+            "image_url": card.image_url,
+        }
+
+
+def _rss(feed: _Feed) -> bytes:
+    rss = ET.Element("rss", version="2.0")
+    channel = ET.SubElement(rss, "channel")
+    for tag, text in (("title", feed.title), ("link", feed.home_url), ("description", feed.title),
+                      ("language", feed.language), ("lastBuildDate", _rfc822(feed.updated))):
+        ET.SubElement(channel, tag).text = text
+    for item in feed.items:
+        entry = ET.SubElement(channel, "item")
+        ET.SubElement(entry, "title").text = item["title"]
+        ET.SubElement(entry, "link").text = item["url"]
+        ET.SubElement(entry, "guid", isPermaLink="true").text = item["url"]
+        ET.SubElement(entry, "description").text = item["summary"]
+        ET.SubElement(entry, "category").text = item["category"]
+        if item["date"]:
+            ET.SubElement(entry, "pubDate").text = _rfc822(item["date"])
+    return ET.tostring(rss, encoding="utf-8", xml_declaration=True)
+
+
+def _atom(feed: _Feed) -> bytes:
+    atom = ET.Element("feed", {"xmlns": "http://www.w3.org/2005/Atom", "xml:lang": feed.language})
+    ET.SubElement(atom, "id").text = feed.feed_url
+    ET.SubElement(atom, "title").text = feed.title
+    ET.SubElement(atom, "updated").text = _rfc3339(feed.updated)
+    ET.SubElement(atom, "link", rel="self", href=feed.feed_url)
+    ET.SubElement(atom, "link", rel="alternate", href=feed.home_url)
+    ET.SubElement(ET.SubElement(atom, "author"), "name").text = settings.APP_NAME
+    for item in feed.items:
+        entry = ET.SubElement(atom, "entry")
+        ET.SubElement(entry, "id").text = item["url"]
+        ET.SubElement(entry, "title").text = item["title"]
+        ET.SubElement(entry, "link", rel="alternate", href=item["url"])
+        ET.SubElement(entry, "updated").text = _rfc3339(item["date"] or feed.updated)
+        ET.SubElement(entry, "summary").text = item["summary"]
+        ET.SubElement(entry, "category", term=item["category"])
+    return ET.tostring(atom, encoding="utf-8", xml_declaration=True)
+
+
+def _json_feed(feed: _Feed) -> bytes:
+    document = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": feed.title,
+        "home_page_url": feed.home_url,
+        "feed_url": feed.feed_url,
+        "language": feed.language,
+        "items": [
+            {
+                "id": item["url"],
+                "url": item["url"],
+                "title": item["title"],
+                "summary": item["summary"],
+                "tags": [item["category"]],
+                **({"date_published": _rfc3339(item["date"])} if item["date"] else {}),
+                **({"image": item["image_url"]} if item["image_url"] else {}),
+            }
+            for item in feed.items
+        ],
+    }
+    return json.dumps(document, ensure_ascii=False).encode("utf-8")
+
+
+_WRITERS: Dict[str, Callable[[_Feed], bytes]] = {"rss": _rss, "atom": _atom, "json": _json_feed}
+
+
+def render_feed(feed_format: str, category: str, language: str, cards: List[SimpleNamespace]) -> Tuple[bytes, str]:
+    """(document, media type) for a category's cards in feed_format ("rss", "atom" or "json")."""
+    return _WRITERS[feed_format](_Feed(category, language, cards, feed_format)), FEED_MEDIA_TYPES[feed_format]
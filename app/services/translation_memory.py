@@ -0,0 +1,173 @@
+"""
+Segment-level English -> Telugu translation memory.
+
+Text is split into segments (one per sentence, list markers kept aside) so that
+recurring field names, boilerplate sentences and company or technology names can be
+reused across articles instead of being translated by the model every time.
+"""
+
+import re
+import unicodedata
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import case, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.database import TranslationSegment
+
+LIST_MARKER_RE = re.compile(r"^(\s*(?:[-*•]|\d+[.)])\s+)")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+EDGE_PUNCTUATION = " \t\"'`.,;:!?()[]{}"
+
+# Editor-provided translations win over model output and are never overwritten by it.
+ORIGIN_PRIORITY = {"model": 0, "editor": 1}
+
+# Rows per INSERT ... ON CONFLICT statement (7 bound parameters each)
+UPSERT_BATCH_SIZE = 100
+_DIALECT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _priority(origin_column):
+    return case(ORIGIN_PRIORITY, value=origin_column, else_=0)
+
+
+def normalize_segment(text: str) -> str:
+    """Key used for normalized matching: case, width, whitespace and edge punctuation are ignored."""
+    text = unicodedata.normalize("NFKC", text or "")
+    text = " ".join(text.split()).casefold()
+    return text.strip(EDGE_PUNCTUATION)
+
+
+def split_lines(text: str) -> List[Tuple[str, List[str]]]:
+    """Split text into (list_marker, sentences) per line, preserving enough structure to reassemble it."""
+    lines = []
+    for line in (text or "").split("\n"):
+        match = LIST_MARKER_RE.match(line)
+        marker = match.group(1) if match else ""
+        body = line[len(marker):].strip()
+        sentences = [s for s in SENTENCE_SPLIT_RE.split(body) if s.strip()] if body else []
+        lines.append((marker, sentences))
+    return lines
+
+
+def segment_text(text: str) -> List[str]:
+    return [sentence for _, sentences in split_lines(text) for sentence in sentences]
+
+
+def assemble_translation(text: str, translations: Dict[str, str]) -> str:
+    """Rebuild `text` with every segment replaced by its translation. All segments must be known."""
+    lines = []
+    for marker, sentences in split_lines(text):
+        lines.append(marker + " ".join(translations[sentence] for sentence in sentences))
+    return "\n".join(lines)
+
+
+def align_segments(english: str, telugu: str) -> Dict[str, str]:
+    """
+    Pair up English and Telugu segments of a full text pair.
+
+    Only possible when both sides split into the same number of segments line by line,
+    which is the case for edited sections that keep the English layout. Returns {} otherwise.
+    """
+    en_lines = split_lines(english)
+    te_lines = split_lines(telugu)
+    if len(en_lines) != len(te_lines):
+        return {}
+
+    pairs = {}
+    for (_, en_sentences), (_, te_sentences) in zip(en_lines, te_lines):
+        if len(en_sentences) != len(te_sentences):
+            return {}
+        pairs.update(zip(en_sentences, te_sentences))
+    # Identical text on both sides is an untranslated field, not a translation.
+    return {en: te for en, te in pairs.items() if normalize_segment(en) != normalize_segment(te)}
+
+
+class TranslationMemory:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def lookup(self, segments: Iterable[str]) -> Dict[str, str]:
+        """
+        Return stored translations for the given English segments.
+
+        Matching is on the normalized form, so exact repeats and variants that differ only
+        in case, spacing or edge punctuation both hit. Unknown segments are absent from the result.
+        Read-only: callers record the hits with record_hits() once the model call, if any,
+        is over, so no write transaction stays open while it runs.
+        """
+        by_key = {}
+        for segment in segments:
+            key = normalize_segment(segment)
+            if key:
+                by_key.setdefault(key, []).append(segment)
+        if not by_key:
+            return {}
+
+        rows = self.db.execute(
+            select(TranslationSegment.normalized_source, TranslationSegment.target_text)
+            .where(TranslationSegment.normalized_source.in_(list(by_key)))
+        ).all()
+
+        found = {}
+        for row in rows:
+            for segment in by_key[row.normalized_source]:
+                found[segment] = row.target_text
+        return found
+
+    def record_hits(self, segments: Iterable[str]) -> None:
+        """Count one use of each stored entry matching the given segments (as returned by lookup())."""
+        keys = list({key for key in map(normalize_segment, segments) if key})
+        if not keys:
+            return
+        self.db.execute(
+            update(TranslationSegment)
+            .where(TranslationSegment.normalized_source.in_(keys))
+            .values(hits=TranslationSegment.hits + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    def remember(self, pairs: Dict[str, str], origin: str = "model") -> int:
+        """
+        Store English -> Telugu segment pairs. Returns the number of entries added or changed.
+
+        A single INSERT ... ON CONFLICT per batch, so two curators learning the same new
+        segment at once do not collide on the unique normalized_source; an existing entry
+        is only replaced by a translation of equal or higher origin priority.
+        """
+        entries = {}
+        for source, target in pairs.items():
+            key = normalize_segment(source)
+            if key and target and target.strip():
+                entries[key] = (source, target.strip())
+        if not entries:
+            return 0
+
+        insert = _DIALECT_INSERTS[self.db.get_bind().dialect.name]
+        now = datetime.utcnow()
+        rows = [
+            {
+                "source_text": source, "normalized_source": key, "target_text": target, "origin": origin,
+                "hits": 0, "created_at": now, "updated_at": now,
+            }
+            for key, (source, target) in entries.items()
+        ]
+
+        changed = 0
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            statement = insert(TranslationSegment).values(rows[start:start + UPSERT_BATCH_SIZE])
+            statement = statement.on_conflict_do_update(
+                index_elements=[TranslationSegment.normalized_source],
+                set_={
+                    "source_text": statement.excluded.source_text,
+                    "target_text": statement.excluded.target_text,
+                    "origin": statement.excluded.origin,
+                    "updated_at": statement.excluded.updated_at,
+                },
+                where=(TranslationSegment.target_text != statement.excluded.target_text)
+                & (_priority(statement.excluded.origin) >= _priority(TranslationSegment.origin)),
+            )
+            changed += self.db.execute(statement).rowcount
+        return changed
@@ -0,0 +1,151 @@
+"""
+Cheap local triage scoring for raw articles.
+
+Runs at ingestion time, before any LLM call, so the curation queue can be worked
+top-down. A score in [0, 100] combines:
+
+- keyword relevance: TF-IDF cosine similarity between the title + summary and the
+  category's keyword profile (TRIAGE_KEYWORDS), with IDF taken over the scored batch
+  so words every article in the batch shares count for less;
+- recency: exponential decay of the article's age (TRIAGE_RECENCY_HALF_LIFE_HOURS);
+- source weight: per-domain weight from TRIAGE_SOURCE_WEIGHTS.
+"""
+
+import math
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.database import RawArticle, RAW_ARTICLE_QUEUE_STATUSES
+from config.settings import settings
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+TITLE_WEIGHT = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens plus adjacent-word bigrams (for multi-word keywords)."""
+    words = TOKEN_RE.findall((text or "").lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def source_domain(url: str) -> str:
+    netloc = urlparse(url or "").netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+class TriageScorer:
+    def __init__(self, now: Optional[datetime] = None):
+        self.now = now or datetime.utcnow()
+        self.weights = settings.TRIAGE_WEIGHTS
+        self.half_life_hours = settings.TRIAGE_RECENCY_HALF_LIFE_HOURS
+        self._profiles: Dict[str, Counter] = {}
+
+    def _profile(self, category: str) -> Counter:
+        """Keyword vector for a category: its own keywords plus the global ones (one or two words each)."""
+        if category not in self._profiles:
+            keywords = settings.TRIAGE_KEYWORDS.get(category, []) + settings.TRIAGE_GLOBAL_KEYWORDS
+            self._profiles[category] = Counter(" ".join(TOKEN_RE.findall(keyword.lower())) for keyword in keywords)
+        return self._profiles[category]
+
+    def keyword_scores(self, documents: Sequence[Dict]) -> List[float]:
+        """TF-IDF cosine similarity of each document against its category profile, over the whole batch."""
+        term_counts = []
+        document_frequency = Counter()
+        for document in documents:
+            counts = Counter(tokenize(document.get("title")) * TITLE_WEIGHT + tokenize(document.get("summary")))
+            term_counts.append(counts)
+            document_frequency.update(counts.keys())
+
+        total = len(documents)
+        scores = []
+        for document, counts in zip(documents, term_counts):
+            profile = self._profile(document.get("category"))
+            if not counts or not profile:
+                scores.append(0.0)
+                continue
+
+            def idf(term):
+                return math.log((1 + total) / (1 + document_frequency[term])) + 1.0
+
+            doc_norm = math.sqrt(sum((tf * idf(term)) ** 2 for term, tf in counts.items()))
+            profile_norm = math.sqrt(sum(weight ** 2 for weight in profile.values()))
+            dot = sum(counts[term] * idf(term) * weight for term, weight in profile.items() if term in counts)
+            # Cosine against a short keyword profile is small in absolute terms; scale so a
+            # handful of strong matches saturates towards 1.
+            cosine = dot / (doc_norm * profile_norm) if doc_norm and profile_norm else 0.0
+            scores.append(min(1.0, cosine * settings.TRIAGE_KEYWORD_SCALE))
+        return scores
+
+    def recency_score(self, published_date: Optional[datetime]) -> float:
+        if published_date is None:
+            return 0.5
+        if published_date.tzinfo is not None:
+            published_date = published_date.astimezone(timezone.utc).replace(tzinfo=None)
+        age_hours = max(0.0, (self.now - published_date).total_seconds() / 3600.0)
+        return 0.5 ** (age_hours / self.half_life_hours)
+
+    def source_score(self, source_url: str) -> float:
+        domain = source_domain(source_url)
+        weights = settings.TRIAGE_SOURCE_WEIGHTS
+        return weights.get(domain, weights.get("DEFAULT", 0.5))
+
+    def score(self, documents: Sequence[Dict]) -> List[float]:
+        """
+        Score a batch of documents, each a dict with title, summary, category,
+        published_date and source_url. Returns scores in [0, 100] in input order.
+        """
+        keyword_scores = self.keyword_scores(documents)
+        scores = []
+        for document, keyword_score in zip(documents, keyword_scores):
+            combined = (
+                self.weights["keywords"] * keyword_score
+                + self.weights["recency"] * self.recency_score(document.get("published_date"))
+                + self.weights["source"] * self.source_score(document.get("source_url"))
+            )
+            scores.append(round(100.0 * combined / sum(self.weights.values()), 2))
+        return scores
+
+    def score_raw_articles(self, raw_articles: Sequence[RawArticle]) -> None:
+        """Set triage_score on (unsaved or attached) RawArticle objects in one batch."""
+        documents = [
+            {
+                "title": article.title,
+                "summary": article.summary,
+                "category": article.category,
+                "published_date": article.published_date,
+                "source_url": article.source_url,
+            }
+            for article in raw_articles
+        ]
+        for article, score in zip(raw_articles, self.score(documents)):
+            article.triage_score = score
+
+    def rescore(self, db: Session, statuses: Sequence[str] = RAW_ARTICLE_QUEUE_STATUSES, batch_size: int = 500) -> int:
+        """Recompute scores for queued raw articles (recency decays over time). Returns rows updated."""
+        updated = 0
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(
+                    RawArticle.id, RawArticle.title, RawArticle.summary, RawArticle.category,
+                    RawArticle.published_date, RawArticle.source_url,
+                )
+                .where(RawArticle.status.in_(statuses), RawArticle.id > last_id)
+                .order_by(RawArticle.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            scores = self.score([row._asdict() for row in rows])
+            db.execute(update(RawArticle), [{"id": row.id, "triage_score": score} for row, score in zip(rows, scores)])
+            db.commit()
+            updated += len(rows)
+            last_id = rows[-1].id
+        return updated
@@ -0,0 +1,130 @@
+"""
+The one Jinja environment shared by every HTML route (app/api/main.py and the
+curation router), plus the common template context.
+
+Compiled templates stay in the environment's cache for the life of the process, and
+their bytecode is also written to TEMPLATE_BYTECODE_CACHE_DIR, so a new worker loads
+them without parsing. precompile_templates() runs at startup to warm both, which keeps
+the first request after a deploy from paying for compilation.
+"""
+
+import os
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import markdown
+from fastapi import Request
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache, Template
+from starlette.routing import Mount, Router
+
+from app.i18n import i18n_manager
+from app.instrumentation import record_template
+from config.settings import settings
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache:
+    if settings.TEMPLATE_BYTECODE_CACHE_DIR:
+        os.makedirs(settings.TEMPLATE_BYTECODE_CACHE_DIR, exist_ok=True)
+        return FileSystemBytecodeCache(settings.TEMPLATE_BYTECODE_CACHE_DIR)
+    # Jinja's default: a per-user directory under the system temp dir
+    return FileSystemBytecodeCache()
+
+
+class TimedTemplate(Template):
+    """Adds its render time to the current request's stats (app/instrumentation.py)."""
+
+    def render(self, *args, **kwargs) -> str:
+        started = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            record_template(time.perf_counter() - started)
+
+
+templates = Jinja2Templates(
+    directory=TEMPLATES_DIR,
+    bytecode_cache=_bytecode_cache(),
+    # Checking template mtimes on every render is only worth it while editing them
+    auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+)
+
+
+def markdown_filter(text):
+    if text:
+        return markdown.markdown(text)
+    return ""
+
+
+templates.env.filters['markdown'] = markdown_filter
+# Set before any template is loaded; included and extended templates render inside the outer one
+templates.env.template_class = TimedTemplate
+
+
+def precompile_templates() -> int:
+    """Compile every template into the environment (and bytecode) cache. Returns how many."""
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.env.get_template(name)
+    return len(names)
+
+
+def _translator(language: str) -> Callable[[str], str]:
+    table = i18n_manager.translations.get(language, {})
+
+    def _(key: str) -> str:
+        return table.get(key, key)
+    return _
+
+
+# One translation callable per language, built at import (the translations are loaded then too)
+TRANSLATORS: Dict[str, Callable[[str], str]] = {
+    language: _translator(language) for language in i18n_manager.supported_languages
+}
+
+
+def get_user_language(request: Request, lang_cookie: Optional[str] = None) -> str:
+    """Detect user's preferred language from cookie or headers"""
+    # First check cookie
+    if lang_cookie and i18n_manager.is_supported_language(lang_cookie):
+        return lang_cookie
+
+    # Then check Accept-Language header
+    accept_language = request.headers.get('accept-language', '')
+    return i18n_manager.detect_language_from_request(accept_language)
+
+
+def get_template_context(request: Request, language: Optional[str] = None, **kwargs):
+    """Get common template context with translations"""
+    if not language:
+        language = get_user_language(request, request.cookies.get("lang"))
+    return {
+        "request": request,
+        "categories": settings.TECH_CATEGORIES,
+        "current_language": language,
+        "supported_languages": i18n_manager.supported_languages,
+        "_": TRANSLATORS.get(language, TRANSLATORS[i18n_manager.default_language]),
+        **kwargs
+    }
+
+
+# The routes templates link to with url_for(), for rendering outside the app
+_SITE_ROUTES = Router(routes=[Mount("/static", routes=[], name="static")])
+
+
+def site_request(path: str = "/") -> Request:
+    """
+    A stand-in request for rendering a page outside a live one (the static export):
+    url_for() resolves against SITE_URL.
+    """
+    site = urlsplit(settings.SITE_URL)
+    default_port = 443 if site.scheme == "https" else 80
+    return Request({
+        "type": "http", "method": "GET", "scheme": site.scheme, "path": path, "root_path": site.path.rstrip("/"),
+        "query_string": b"", "headers": [(b"host", site.netloc.encode("ascii"))],
+        "server": (site.hostname, site.port or default_port),
+        "router": _SITE_ROUTES,
+    })
@@ -0,0 +1,96 @@
+"""
+Read-path throughput under concurrency for the async route handlers.
+
+Points the app at a temporary seeded SQLite database (or --database-url), then
+fires requests at /api/articles, /api/search and the home page through an
+in-process ASGI client at increasing concurrency. With the async session the
+event loop keeps serving other requests while a query waits on the database, so
+requests/s should grow with concurrency instead of flattening at the serial rate.
+
+    PYTHONPATH=$(pwd) python benchmarks/bench_async_reads.py --rows 100000 --concurrency 1 4 16 64
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import httpx
+
+# Database-bound read paths: a deep offset page and a full-text search each spend
+# most of their time inside SQLite, which releases the GIL while it works.
+PATHS = ["/api/articles?limit=20&offset=50000", "/api/search?q=word20", "/api/articles?category=AI&limit=20"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+async def run_level(client, concurrency, total_requests):
+    latencies = []
+    counter = iter(range(total_requests))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            response = await client.get(PATHS[i % len(PATHS)])
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    print(
+        f"concurrency={concurrency:>4} requests={total_requests:>6} req/s={total_requests / elapsed:>8.1f} "
+        f"p50_ms={percentile(latencies, 50) * 1000:>7.2f} p95_ms={percentile(latencies, 95) * 1000:>7.2f}"
+    )
+
+
+async def main(levels, total_requests):
+    # Imported here so DATABASE_URL is set before the engines are created
+    from app.api.main import app
+    from app.models.database import async_engine
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for concurrency in levels:
+            await run_level(client, concurrency, total_requests)
+    await async_engine.dispose()
+
+
+def seed(rows):
+    from benchmarks.bench_search import seed as seed_articles
+    from app.models.database import engine
+    seed_articles(engine, rows)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file (seeded)")
+    args = parser.parse_args()
+
+    workdir = None
+    if args.database_url is None:
+        workdir = tempfile.mkdtemp(prefix="bench_async_")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    else:
+        os.environ["DATABASE_URL"] = args.database_url
+    sys.path.insert(0, os.getcwd())
+    try:
+        from app.models.database import create_tables
+        create_tables()
+        if workdir:
+            seed(args.rows)
+        asyncio.run(main(args.concurrency, args.requests))
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,86 @@
+"""
+Bulk curation benchmark: clear a queue of raw articles with the bulk service calls
+(one transaction, set-based statements) and, for comparison, one call per article
+as the single-item endpoints do.
+
+Each run seeds a fresh temporary SQLite database (file-backed, WAL, as in production)
+with some published history, so the search index and feed snapshots have real work.
+
+    PYTHONPATH=$(pwd) python benchmarks/bench_bulk_curation.py --queue 1000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.curation.services import CurationService
+from app.models.database import Article, Base, RawArticle, build_engine
+from app.services.feeds import FeedSnapshots
+
+
+def seed(engine, queue, history):
+    with engine.begin() as connection:
+        connection.execute(insert(Article), [
+            {"title_en": f"History {i}", "content_en": "Body", "source_url": f"https://seed.example.com/a/{i}",
+             "source_name": "Seed", "category": "AI" if i % 3 else "Space Tech", "is_active": True}
+            for i in range(history)
+        ])
+        connection.execute(insert(RawArticle), [
+            {"title": f"Queued {i}", "content": "Scraped body " * 50, "summary": "Summary",
+             "source_url": f"https://seed.example.com/r/{i}", "source_name": "RSS",
+             "category": "AI" if i % 3 else "Space Tech", "status": "pending", "content_version": 0}
+            for i in range(queue)
+        ])
+
+
+def timed(label, queue, history, action):
+    workdir = tempfile.mkdtemp(prefix="bench_bulk_")
+    engine = build_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    try:
+        Base.metadata.create_all(engine)
+        seed(engine, queue, history)
+        session = sessionmaker(bind=engine)()
+        FeedSnapshots(session).rebuild()
+        ids = CurationService(session).queue_ids()
+        start = time.perf_counter()
+        action(session, ids)
+        elapsed = time.perf_counter() - start
+        session.close()
+        print(f"{label:<28} {len(ids):>6} items  {elapsed * 1000:9.1f} ms")
+        return elapsed
+    finally:
+        engine.dispose()
+        shutil.rmtree(workdir)
+
+
+def approve_one_by_one(session, ids):
+    service = CurationService(session)
+    for article_id in ids:
+        service.approve_raw_articles([article_id])
+
+
+def reject_one_by_one(session, ids):
+    service = CurationService(session)
+    for article_id in ids:
+        service.reject_raw_articles([article_id])
+
+
+def run(queue, history):
+    timed("approve, one per request", queue, history, approve_one_by_one)
+    bulk_approve = timed("approve, bulk", queue, history, lambda session, ids: CurationService(session).approve_raw_articles(ids))
+    timed("reject, one per request", queue, history, reject_one_by_one)
+    bulk_reject = timed("reject, bulk", queue, history, lambda session, ids: CurationService(session).reject_raw_articles(ids))
+    assert bulk_approve < 1.0 and bulk_reject < 1.0, "bulk actions should clear the queue in under a second"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queue", type=int, default=1000)
+    parser.add_argument("--history", type=int, default=50_000, help="Published articles already in the database")
+    args = parser.parse_args()
+    run(args.queue, args.history)
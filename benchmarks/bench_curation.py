@@ -0,0 +1,172 @@
+"""
+End-to-end curation throughput benchmark using the fake LLM backend.
+
+Each worker takes raw articles through summarize -> structure -> save -> publish
+with its own session against a temporary SQLite database, and the script reports
+per-stage latency percentiles and overall throughput.
+
+    PYTHONPATH=$(pwd) python benchmarks/bench_curation.py --articles 200 --concurrency 8 --latency-ms 50
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.curation import services as curation_services
+from app.curation.schemas import FinalArticleData
+from app.curation.services import CurationService
+from app.models.database import Base, RawArticle
+from app.services.llm_backend import FakeLLMBackend, set_llm_backend
+from config.settings import settings
+
+STAGES = ("summarize", "structure", "save", "publish")
+
+SAMPLE_PARAGRAPH = (
+    "Researchers announced a new accelerator for transformer inference. "
+    "The chip doubles throughput per watt compared with the previous generation. "
+    "Early customers include two hyperscale cloud providers. "
+    "Volume shipments are expected next year. "
+)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def seed_raw_articles(session_factory, count):
+    db = session_factory()
+    try:
+        for i in range(count):
+            db.add(RawArticle(
+                title=f"Benchmark article {i}",
+                content=SAMPLE_PARAGRAPH * 20,
+                summary="",
+                source_url=f"https://bench.example.com/article/{i}",
+                source_name="Benchmark",
+                category="AI",
+                published_date=datetime.utcnow(),
+                status="pending",
+            ))
+        db.commit()
+        return [row.id for row in db.query(RawArticle.id).all()]
+    finally:
+        db.close()
+
+
+def process_article(session_factory, article_id, timings, failures):
+    db = session_factory()
+    try:
+        service = CurationService(db)
+
+        start = time.perf_counter()
+        summary = service.summarize_article(article_id)
+        timings["summarize"].append(time.perf_counter() - start)
+        if summary is None or summary.startswith(("[Summarization failed", "[Generation failed")):
+            failures["summarize"] += 1
+            return
+
+        start = time.perf_counter()
+        sections = service.structure_content(article_id, "News")
+        timings["structure"].append(time.perf_counter() - start)
+        if not sections or "Content Structuring" in sections:
+            failures["structure"] += 1
+            return
+
+        start = time.perf_counter()
+        raw_article = service.save_structured_content(article_id, f"Structured {article_id}", "News", sections)
+        timings["save"].append(time.perf_counter() - start)
+
+        content_en = "\n\n".join(f"{title}\n{value['en']}" for title, value in sections.items())
+        content_te = "\n\n".join(f"{title}\n{value['te']}" for title, value in sections.items())
+        final_data = FinalArticleData(
+            title_en=raw_article.title,
+            summary_en=summary,
+            content_en=content_en,
+            title_te=raw_article.title,
+            summary_te=summary,
+            content_te=content_te,
+            image_url=None,
+            source_url=raw_article.source_url,
+            source_name=raw_article.source_name,
+            category=raw_article.category,
+            published_date=raw_article.published_date,
+            content_type="News",
+        )
+        start = time.perf_counter()
+        service.publish_final_article(article_id, final_data)
+        timings["publish"].append(time.perf_counter() - start)
+    except Exception:
+        db.rollback()
+        failures["error"] += 1
+    finally:
+        db.close()
+
+
+def run(articles, concurrency, latency_ms, failure_rate, retry_backoff):
+    workdir = tempfile.mkdtemp(prefix="bench_curation_")
+    db_path = os.path.join(workdir, "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    article_ids = seed_raw_articles(session_factory, articles)
+
+    # Keep the run offline: use the stored content instead of fetching the source URL.
+    original_extractor = curation_services.extract_article_content
+    content_by_url = {f"https://bench.example.com/article/{i}": SAMPLE_PARAGRAPH * 20 for i in range(articles)}
+    curation_services.extract_article_content = lambda url: content_by_url.get(url, "")
+    set_llm_backend(FakeLLMBackend(latency_ms=latency_ms, jitter_ms=latency_ms * 0.2, failure_rate=failure_rate, seed=42))
+    original_backoff = settings.LLM_RETRY_BACKOFF_SECONDS
+    settings.LLM_RETRY_BACKOFF_SECONDS = retry_backoff
+
+    timings = defaultdict(list)
+    failures = defaultdict(int)
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for article_id in article_ids:
+                executor.submit(process_article, session_factory, article_id, timings, failures)
+        elapsed = time.perf_counter() - start
+    finally:
+        curation_services.extract_article_content = original_extractor
+        settings.LLM_RETRY_BACKOFF_SECONDS = original_backoff
+        set_llm_backend(None)
+        engine.dispose()
+
+    completed = len(timings["publish"])
+    print(f"articles={articles} concurrency={concurrency} llm_latency_ms={latency_ms} failure_rate={failure_rate}")
+    print(f"completed={completed} elapsed={elapsed:.2f}s throughput={completed / elapsed:.1f} articles/s")
+    print(f"failures={dict(failures)}")
+    print(f"{'stage':<10} {'count':>6} {'mean_ms':>9} {'p50_ms':>9} {'p95_ms':>9} {'max_ms':>9}")
+    for stage in STAGES:
+        values = timings[stage]
+        if not values:
+            continue
+        print(
+            f"{stage:<10} {len(values):>6} {statistics.mean(values) * 1000:>9.1f} "
+            f"{percentile(values, 50) * 1000:>9.1f} {percentile(values, 95) * 1000:>9.1f} "
+            f"{max(values) * 1000:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--retry-backoff", type=float, default=0.0, help="LLM retry backoff in seconds")
+    args = parser.parse_args()
+    run(args.articles, args.concurrency, args.latency_ms, args.failure_rate, args.retry_backoff)
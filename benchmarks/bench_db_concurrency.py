@@ -0,0 +1,142 @@
+"""
+Mixed read/write concurrency benchmark for the database engine setup.
+
+A writer thread imitates the scheduler: it inserts raw articles in large
+transactions and updates their triage scores, while reader threads run the home
+page query in a loop. The same workload runs against SQLAlchemy's default engine
+and against build_engine()'s tuned one (WAL, synchronous=NORMAL, mmap, busy
+timeout on SQLite; pool settings on Postgres), and the script reports reader
+latency percentiles, reader errors and writer throughput for both.
+
+    PYTHONPATH=$(pwd) python benchmarks/bench_db_concurrency.py --seconds 10 --readers 8
+    PYTHONPATH=$(pwd) python benchmarks/bench_db_concurrency.py --database-url postgresql://user:pw@localhost/bench
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Article, Base, RawArticle, build_engine
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def seed_articles(engine, count):
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(insert(Article), [
+            {
+                "title_en": f"Article {i}", "summary_en": "Summary", "content_en": "Content " * 200,
+                "source_url": f"https://seed.example.com/a/{i}", "source_name": "Seed",
+                "category": "AI", "scraped_date": now - timedelta(minutes=i), "is_active": True,
+            }
+            for i in range(count)
+        ])
+
+
+def writer(session_factory, stop, batch_size, stats):
+    batch = 0
+    while not stop.is_set():
+        db = session_factory()
+        try:
+            start = time.perf_counter()
+            rows = [
+                {
+                    "title": f"Raw {batch}-{i}", "content": "Scraped content " * 200, "summary": "",
+                    "source_url": f"https://seed.example.com/r/{batch}/{i}", "source_name": "RSS",
+                    "category": "AI", "scraped_date": datetime.utcnow(), "status": "pending",
+                }
+                for i in range(batch_size)
+            ]
+            db.execute(insert(RawArticle), rows)
+            db.execute(update(RawArticle).where(RawArticle.status == "pending").values(triage_score=50.0))
+            db.commit()
+            stats["write_seconds"].append(time.perf_counter() - start)
+            stats["rows_written"] += batch_size
+        except Exception as e:
+            db.rollback()
+            stats["writer_errors"] += 1
+            stats["last_error"] = str(e)
+        finally:
+            db.close()
+        batch += 1
+
+
+def reader(session_factory, stop, stats):
+    while not stop.is_set():
+        db = session_factory()
+        try:
+            start = time.perf_counter()
+            db.query(Article).filter(Article.is_active == True).order_by(Article.scraped_date.desc()).limit(9).all()
+            stats["read_seconds"].append(time.perf_counter() - start)
+        except Exception as e:
+            stats["reader_errors"] += 1
+            stats["last_error"] = str(e)
+        finally:
+            db.close()
+
+
+def run_workload(label, database_url, tuned, seconds, readers, batch_size, articles):
+    workdir = None
+    if database_url is None:
+        workdir = tempfile.mkdtemp(prefix="bench_db_")
+        url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    else:
+        url = database_url
+    engine = build_engine(url, tuned=tuned)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    seed_articles(engine, articles)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    stats = {"read_seconds": [], "write_seconds": [], "rows_written": 0,
+             "reader_errors": 0, "writer_errors": 0, "last_error": None}
+    stop = threading.Event()
+    threads = [threading.Thread(target=writer, args=(session_factory, stop, batch_size, stats))]
+    threads += [threading.Thread(target=reader, args=(session_factory, stop, stats)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    if workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    reads = stats["read_seconds"]
+    print(
+        f"{label:<8} reads={len(reads):>7} read_p50_ms={percentile(reads, 50) * 1000:>7.2f} "
+        f"read_p95_ms={percentile(reads, 95) * 1000:>8.2f} read_max_ms={max(reads or [0]) * 1000:>8.1f} "
+        f"reader_errors={stats['reader_errors']:>4} rows_written/s={stats['rows_written'] / seconds:>8.0f} "
+        f"writer_errors={stats['writer_errors']}"
+    )
+    if stats["last_error"]:
+        print(f"         last error: {stats['last_error'].splitlines()[0]}")
+    return statistics.median(reads) if reads else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=2000, help="Raw articles per write transaction")
+    parser.add_argument("--articles", type=int, default=20000, help="Published articles to seed")
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+    for label, tuned in (("default", False), ("tuned", True)):
+        run_workload(label, args.database_url, tuned, args.seconds, args.readers, args.batch_size, args.articles)
@@ -0,0 +1,91 @@
+"""
+JSON list-endpoint benchmark: build and serialize a page of raw articles the way
+/api/raw_articles used to (ORM objects, response_model validation, jsonable_encoder,
+json.dumps) and the way it does now (column tuples zipped into dicts, orjson).
+
+Pages of 100 and 1,000 rows are read from a temporary SQLite database. Times are
+per page: the query and object building, then the serialization alone.
+
+    PYTHONPATH=$(pwd) python benchmarks/bench_json.py --repeat 50
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.api.responses import ORJSONResponse, rows_json
+from app.curation.router import RawArticleResponse
+from app.models.database import Base, RawArticle, RAW_ARTICLE_CARD_FIELDS, build_engine
+
+FIELDS = RAW_ARTICLE_CARD_FIELDS + ("content",)
+
+
+def seed(engine, rows):
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(insert(RawArticle), [
+            {"title": f"Queued article {i} about quantum error correction", "summary": "Summary sentence. " * 10,
+             "content": "Scraped body paragraph with some length to it. " * 80,
+             "source_url": f"https://example.com/r/{i}", "source_name": "RSS", "category": "AI", "status": "pending",
+             "published_date": now - timedelta(minutes=i), "scraped_date": now - timedelta(minutes=i),
+             "triage_score": (i % 100) / 100, "content_version": 0}
+            for i in range(rows)
+        ])
+
+
+def old_path(session, limit):
+    start = time.perf_counter()
+    articles = session.scalars(select(RawArticle).order_by(RawArticle.scraped_date.desc()).limit(limit)).all()
+    models: List[RawArticleResponse] = [RawArticleResponse.model_validate(article) for article in articles]
+    built = time.perf_counter()
+    JSONResponse(jsonable_encoder(models))
+    return built - start, time.perf_counter() - built
+
+
+def new_path(session, limit):
+    start = time.perf_counter()
+    query = select(*(getattr(RawArticle, name) for name in FIELDS)).order_by(RawArticle.scraped_date.desc()).limit(limit)
+    rows = session.execute(query).all()
+    built = time.perf_counter()
+    ORJSONResponse(rows_json(rows, FIELDS))
+    return built - start, time.perf_counter() - built
+
+
+def measure(label, path, session, limit, repeat):
+    query_times, serialize_times = zip(*(path(session, limit) for _ in range(repeat)))
+    query_ms, serialize_ms = statistics.median(query_times) * 1000, statistics.median(serialize_times) * 1000
+    print(f"{label:<26} {limit:>5} rows  query+build {query_ms:8.2f} ms  serialize {serialize_ms:8.2f} ms")
+    return query_ms + serialize_ms
+
+
+def run(repeat):
+    workdir = tempfile.mkdtemp(prefix="bench_json_")
+    engine = build_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    try:
+        Base.metadata.create_all(engine)
+        seed(engine, 1000)
+        with Session(engine) as session:
+            for limit in (100, 1000):
+                before = measure("ORM + jsonable_encoder", old_path, session, limit, repeat)
+                after = measure("row tuples + orjson", new_path, session, limit, repeat)
+                assert after < before, "the direct path should be faster"
+    finally:
+        engine.dispose()
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="Pages built per measurement")
+    args = parser.parse_args()
+    run(args.repeat)
@@ -0,0 +1,140 @@
+"""
+Full-text search benchmark.
+
+Seeds a temporary database with synthetic bilingual articles, builds the search
+index, and times ArticleSearchIndex.search() for a mix of rare, common and Telugu
+queries, with and without a category filter. Reports the median and p95 per query
+and fails if any median goes over --budget-ms.
+
+    PYTHONPATH=$(pwd) python benchmarks/bench_search.py --rows 1000000
+    PYTHONPATH=$(pwd) python benchmarks/bench_search.py --database-url postgresql://user:pw@localhost/bench
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy import text as sql_text
+from sqlalchemy.orm import Session
+
+from app.models.database import Article, Base
+from app.services.search import ArticleSearchIndex
+from config.settings import settings
+
+# Synthetic corpus with a Zipf-like word distribution: sentences are drawn from a
+# vocabulary where word k has weight 1/k, each article mixes a few sentences, and
+# its category supplies a topic word, so term frequencies resemble real text.
+VOCABULARY = [f"word{k}" for k in range(20_000)]
+TOPIC_WORDS = [
+    "quantum", "processor", "satellite", "battery", "robotics", "encryption", "semiconductor",
+    "hydrogen", "drone", "genome", "transformer", "lidar", "fusion", "blockchain", "exoplanet",
+]
+TELUGU_WORDS = ["సాంకేతికత", "పరిశోధన", "ఉపగ్రహం", "క్వాంటం", "బ్యాటరీ", "కృత్రిమ", "మేధస్సు", "డ్రోన్"]
+# Telugu body text: pseudo-words built from consonant + vowel-sign syllables
+TELUGU_SYLLABLES = [consonant + sign for consonant in "కగచజటడతదనపబమయరలవసహ" for sign in ["", "ా", "ి", "ు", "ె", "ో"]]
+
+QUERIES = [
+    ("rare", "word15000", None),
+    ("topic", "quantum", None),
+    ("two terms", "quantum word3", None),
+    ("topic+category", "satellite", "Space Tech"),
+    ("common", "word20", None),
+    ("telugu", "ఉపగ్రహం", None),
+]
+
+
+def sentence_pool(rng, vocabulary, size=5000, length=15):
+    weights = [1.0 / (k + 1) for k in range(len(vocabulary))]
+    return [" ".join(rng.choices(vocabulary, weights=weights, k=length)) for _ in range(size)]
+
+
+def seed(engine, rows, chunk_size=20_000):
+    categories = settings.TECH_CATEGORIES
+    rng = random.Random(0)
+    now = datetime.utcnow()
+
+    sentences = sentence_pool(rng, VOCABULARY)
+    telugu_vocabulary = list({"".join(rng.choices(TELUGU_SYLLABLES, k=3)) for _ in range(20_000)})
+    telugu_sentences = sentence_pool(rng, telugu_vocabulary)
+
+    def text(pool, count, topic):
+        return " ".join(rng.choice(pool) for _ in range(count)) + " " + topic
+
+    def article_rows(offset, count):
+        for i in range(offset, offset + count):
+            topic = TOPIC_WORDS[i % len(TOPIC_WORDS)]
+            telugu = TELUGU_WORDS[i % len(TELUGU_WORDS)]
+            yield {
+                "title_en": f"{topic} {rng.choice(sentences)[:60]}",
+                "title_te": f"{telugu} {rng.choice(telugu_sentences)[:40]}",
+                "summary_en": text(sentences, 2, topic),
+                "summary_te": text(telugu_sentences, 2, telugu),
+                "content_en": text(sentences, 8, topic),
+                "content_te": text(telugu_sentences, 8, telugu),
+                "source_url": f"https://seed.example.com/a/{i}",
+                "source_name": "Seed",
+                "category": categories[i % len(categories)],
+                "scraped_date": now - timedelta(minutes=i),
+                "is_active": True,
+            }
+
+    with engine.begin() as connection:
+        for offset in range(0, rows, chunk_size):
+            connection.execute(insert(Article), list(article_rows(offset, min(chunk_size, rows - offset))))
+    with Session(engine) as session:
+        ArticleSearchIndex(session).rebuild()
+        if engine.dialect.name == "postgresql":
+            session.execute(sql_text("ANALYZE articles"))
+            session.commit()
+
+
+def run(rows, database_url, repeats, budget_ms):
+    workdir = None
+    if database_url is None:
+        workdir = tempfile.mkdtemp(prefix="bench_search_")
+        database_url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    start = time.perf_counter()
+    seed(engine, rows)
+    print(f"Seeded and indexed {rows} articles in {time.perf_counter() - start:.1f}s ({engine.dialect.name})")
+
+    over_budget = []
+    print(f"{'query':<16} {'results':>7} {'p50_ms':>8} {'p95_ms':>8}")
+    with Session(engine) as session:
+        index = ArticleSearchIndex(session)
+        for name, query, category in QUERIES:
+            durations = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                results = index.search(query, category=category, limit=20)
+                durations.append(time.perf_counter() - start)
+            durations.sort()
+            p50 = statistics.median(durations) * 1000
+            p95 = durations[min(len(durations) - 1, int(0.95 * len(durations)))] * 1000
+            print(f"{name:<16} {len(results):>7} {p50:>8.2f} {p95:>8.2f}")
+            if p50 > budget_ms:
+                over_budget.append(name)
+
+    engine.dispose()
+    if workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+    assert not over_budget, f"Queries over the {budget_ms} ms budget: {over_budget}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    run(args.rows, args.database_url, args.repeats, args.budget_ms)
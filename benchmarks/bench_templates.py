@@ -0,0 +1,96 @@
+"""
+Template benchmark: startup compilation and per-request rendering of the curation pages.
+
+Startup: compile every template into a fresh environment, cold (parsing everything)
+and again with the bytecode cache written by the first run, as a newly started worker
+would. Per request: render curation.html and process.html the way the curation router
+used to (a new Jinja2Templates per request, so every template is re-read and
+recompiled) and with the shared environment in app/templating.py.
+
+    PYTHONPATH=$(pwd) python benchmarks/bench_templates.py --requests 200
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+from app.templating import TEMPLATES_DIR, get_template_context, markdown_filter, templates
+
+# Only what the templates' url_for('static', ...) calls need
+ROUTES = Starlette(routes=[Mount("/static", app=StaticFiles(directory=".", check_dir=False), name="static")])
+
+PAGES = {
+    "curation.html": {},
+    "process.html": {
+        "article": SimpleNamespace(id=1, title="Queued article", source_url="https://example.com/a", content="Body " * 200),
+        "structured_sections_json": "{}",
+    },
+}
+
+
+def make_request() -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": "/curation", "query_string": b"", "headers": [],
+        "scheme": "http", "server": ("testserver", 80), "app": ROUTES, "router": ROUTES.router,
+    })
+
+
+def compile_all(bytecode_dir) -> float:
+    env = Jinja2Templates(directory=TEMPLATES_DIR, bytecode_cache=FileSystemBytecodeCache(bytecode_dir)).env
+    env.filters["markdown"] = markdown_filter
+    start = time.perf_counter()
+    for name in env.list_templates(extensions=["html"]):
+        env.get_template(name)
+    return time.perf_counter() - start
+
+
+def per_request(label, requests, get_templates):
+    timings = []
+    for _ in range(requests):
+        for name, extra in PAGES.items():
+            start = time.perf_counter()
+            page_templates = get_templates()
+            page_templates.TemplateResponse(name, get_template_context(make_request(), "en", **extra))
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    median = statistics.median(timings)
+    print(f"{label:<36} median {median * 1000:7.3f} ms  p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f} ms")
+    return median
+
+
+def fresh_templates():
+    page_templates = Jinja2Templates(directory=TEMPLATES_DIR)
+    page_templates.env.filters["markdown"] = markdown_filter
+    return page_templates
+
+
+def run(requests):
+    bytecode_dir = tempfile.mkdtemp(prefix="bench_templates_")
+    try:
+        cold = compile_all(bytecode_dir)
+        warm = compile_all(bytecode_dir)
+        print(f"{'startup, parse and compile':<36} {cold * 1000:9.1f} ms")
+        print(f"{'startup, from bytecode cache':<36} {warm * 1000:9.1f} ms")
+    finally:
+        shutil.rmtree(bytecode_dir)
+
+    per_request_env = per_request("render, Jinja2Templates per request", requests, fresh_templates)
+    shared_env = per_request("render, shared environment", requests, lambda: templates)
+    assert shared_env < per_request_env, "the shared environment should render faster than a fresh one"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Renders of each page per variant")
+    args = parser.parse_args()
+    run(args.requests)
@@ -9,13 +9,102 @@ def google_news_url(keyword):
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./nextgen_tech.db"
+    # SQLite connection pragmas (WAL lets web readers run while the scheduler writes)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Connection pool for server databases (Postgres)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Optional read replicas for the public read paths (JSON list in the environment, e.g.
+    # READ_DATABASE_URLS='["postgresql://reader@replica1/nextgen"]'). Empty: everything uses DATABASE_URL.
+    READ_DATABASE_URLS: list = []
+    # After a write, the same browser reads from the primary for this long (replica lag cover)
+    READ_YOUR_WRITES_SECONDS: int = 10
     
     # Application
     APP_NAME: str = "NextGen Technologies Portal"
     APP_VERSION: str = "1.0.0"
+    # Public address of the site, for links in pages rendered outside a request (static export, feeds)
+    SITE_URL: str = "http://localhost:8000"
     DEBUG: bool = True
     GEMINI_API_KEY: Optional[str] = None
-    
+    GEMINI_MODEL: str = "gemini-2.5-flash"
+
+    # LLM backend: "gemini" for the real API, "fake" for the deterministic local stand-in
+    LLM_BACKEND: str = "gemini"
+    FAKE_LLM_LATENCY_MS: float = 0.0
+    FAKE_LLM_JITTER_MS: float = 0.0
+    FAKE_LLM_FAILURE_RATE: float = 0.0
+    FAKE_LLM_SEED: int = 0
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BACKOFF_SECONDS: float = 1.0
+    # USD per million tokens, used for cost estimates in /api/llm_usage
+    LLM_PRICING: dict = {
+        "gemini-2.5-flash": {"input": 0.30, "output": 2.50},
+    }
+
+    # Search: rank only the newest N matches, so very common terms cost the same as rare ones
+    SEARCH_CANDIDATE_LIMIT: int = 1000
+
+    # Rendered-page cache for home, category and article pages (app/services/page_cache.py).
+    # PAGE_CACHE_REDIS_URL adds a tier shared by all workers (needs the redis package); its calls
+    # time out after PAGE_CACHE_REDIS_TIMEOUT_SECONDS, and the page is then served from the local tier.
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_MAX_ENTRIES: int = 2000
+    PAGE_CACHE_TTL_SECONDS: int = 300
+    PAGE_CACHE_REDIS_URL: Optional[str] = None
+    PAGE_CACHE_REDIS_TIMEOUT_SECONDS: float = 0.25
+
+    # Jinja: compiled-template bytecode directory (None: a per-user dir under the system temp dir),
+    # and whether to re-check template files for edits on every render (development only)
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None
+    TEMPLATE_AUTO_RELOAD: bool = False
+
+    # Response compression (app/api/compression.py): Brotli when the brotli package is installed,
+    # gzip otherwise, for compressible responses of at least COMPRESSION_MIN_SIZE bytes
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Static export of the public pages (python manage.py export-static), served by nginx or a CDN
+    STATIC_EXPORT_DIR: str = "data/site"
+    STATIC_EXPORT_WORKERS: Optional[int] = None  # full rebuilds: processes (None: one per CPU)
+
+    # Cache-Control for the public HTML pages, the JSON read APIs and the /feeds documents. Responses carry
+    # ETag / Last-Modified, so caches revalidate with a conditional request (304) after max-age.
+    CACHE_CONTROL_PAGES: str = "public, max-age=60"
+    CACHE_CONTROL_API: str = "public, max-age=30"
+    CACHE_CONTROL_FEEDS: str = "public, max-age=300"
+
+    # Request instrumentation (app/instrumentation.py): per-route latency, SQL and template time
+    # on /api/metrics; requests taking at least SLOW_REQUEST_MS are logged with their SQL statements
+    METRICS_ENABLED: bool = True
+    SLOW_REQUEST_MS: int = 500
+
+    # On-demand profiles (app/profiling.py), armed from the admin panel; the newest PROFILES_KEEP are kept
+    PROFILES_DIR: str = "data/profiles"
+    PROFILES_KEEP: int = 50
+
+    # Most raw articles one bulk approve/reject/publish request may act on (one transaction)
+    CURATION_BULK_MAX_ITEMS: int = 5000
+
+    # Retention: keep the hot tables small. Each step runs in batches of RETENTION_BATCH_SIZE rows,
+    # one short transaction per batch.
+    RETENTION_INTERVAL_HOURS: int = 24
+    RETENTION_BATCH_SIZE: int = 500
+    RETENTION_PENDING_DAYS: int = 14  # delete pending raw articles nobody picked up
+    RETENTION_PUBLISHED_DAYS: int = 7  # archive published raw articles and their sections
+    RETENTION_ARCHIVE_MODE: str = "table"  # "table" (raw_articles_archive) or "ndjson" (gzipped files)
+    RETENTION_ARCHIVE_DIR: str = "data/archive"
+    RETENTION_LOG_DAYS: int = 7  # roll scraping_logs up into scraping_log_daily
+
     # Scraping
     SCRAPING_INTERVAL_HOURS: int = 1 
     MAX_ARTICLES_PER_SOURCE: int = 50
@@ -196,6 +285,41 @@ class Settings(BaseSettings):
         ],
     } 
     
+    # Triage scoring of raw articles at ingestion (see app/services/triage.py).
+    # Keywords are one or two words; source weights are keyed by domain and range 0-1.
+    TRIAGE_WEIGHTS: dict = {"keywords": 0.5, "recency": 0.3, "source": 0.2}
+    TRIAGE_RECENCY_HALF_LIFE_HOURS: float = 24.0
+    TRIAGE_KEYWORD_SCALE: float = 3.0
+    TRIAGE_GLOBAL_KEYWORDS: list = [
+        "breakthrough", "launch", "launches", "announces", "unveils", "release", "funding",
+        "acquisition", "first", "record", "open source", "india", "isro"
+    ]
+    TRIAGE_KEYWORDS: dict = {
+        "AI": ["ai", "llm", "model", "gemini", "gpt", "openai", "anthropic", "agents", "machine learning", "neural"],
+        "Quantum Computing": ["quantum", "qubit", "qubits", "error correction", "entanglement", "superconducting"],
+        "Defence Tech": ["defence", "defense", "missile", "drone", "drones", "drdo", "fighter", "navy", "radar"],
+        "Space Tech": ["space", "satellite", "launch vehicle", "rocket", "orbit", "nasa", "spacex", "moon", "mars"],
+        "Renewable Energy": ["solar", "wind", "battery", "hydrogen", "grid", "storage", "renewable"],
+        "Cloud Computing": ["cloud", "aws", "azure", "kubernetes", "serverless", "gcp", "data center"],
+        "Cybersecurity": ["vulnerability", "ransomware", "breach", "zero day", "exploit", "malware", "cve"],
+        "Start-ups": ["startup", "startups", "seed", "series a", "raises", "valuation", "unicorn"],
+        "Tech News": ["apple", "google", "microsoft", "smartphone", "chip", "ai"],
+        "Semiconductors": ["chip", "chips", "semiconductor", "foundry", "tsmc", "nm", "wafer", "gpu"],
+        "Robotics": ["robot", "robots", "humanoid", "autonomous", "robotics"],
+        "Linux & Open Source": ["linux", "kernel", "open source", "release", "distro", "gnome", "kde"],
+        "virtualization": ["vmware", "kvm", "qemu", "hypervisor", "virtual machine", "proxmox"],
+        "general_tech_aggregators": ["ai", "chip", "cloud", "software"],
+    }
+    TRIAGE_SOURCE_WEIGHTS: dict = {
+        "arxiv.org": 0.8,
+        "nasa.gov": 0.8,
+        "isro.gov.in": 0.9,
+        "technologyreview.com": 0.8,
+        "arstechnica.com": 0.7,
+        "news.google.com": 0.3,
+        "DEFAULT": 0.5,
+    }
+
     CATEGORY_IMAGES: dict = {
         "AI": "/static/img/placeholder_ai.png",
         "Cloud Computing": "/static/img/placeholder_cloud.png",
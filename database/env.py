@@ -19,6 +19,17 @@ if config.config_file_name is not None:
 from app.models.database import Base
 target_metadata = Base.metadata
 
+# Full-text search objects created with raw DDL (see app/models/database.py) rather
+# than declared in the metadata; without this, autogenerate would drop them.
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith("articles_fts"):
+        return False  # the FTS5 table and its shadow tables (_data, _idx, _docsize, _config)
+    if type_ == "column" and name == "search_vector" and object.table.name == "articles":
+        return False
+    if type_ == "index" and name == "ix_articles_search_vector":
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -41,6 +52,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -64,7 +76,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
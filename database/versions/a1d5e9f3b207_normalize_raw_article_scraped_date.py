@@ -0,0 +1,32 @@
+"""Normalize raw_articles.scraped_date text on SQLite
+
+Revision ID: a1d5e9f3b207
+Revises: f6c0d4e8a132
+Create Date: 2026-10-19 17:12:04.581236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d5e9f3b207'
+down_revision: Union[str, None] = 'f6c0d4e8a132'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows defaulted by CURRENT_TIMESTAMP lack the microseconds SQLAlchemy writes, which
+    # breaks (scraped_date, id) keyset comparisons within the same second.
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "UPDATE raw_articles SET scraped_date = scraped_date || '.000000' "
+            "WHERE length(scraped_date) = 19"
+        )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,40 @@
+"""Give raw_articles_archive its own key and keep the raw article id in raw_article_id
+
+Revision ID: a7d3f9b1c462
+Revises: f2c6d0e4b358
+Create Date: 2026-10-20 09:41:52.118370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3f9b1c462'
+down_revision: Union[str, None] = 'f2c6d0e4b358'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('raw_articles_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('raw_article_id', sa.Integer(), nullable=True))
+    # Until now the archive id was the raw article id
+    op.execute("UPDATE raw_articles_archive SET raw_article_id = id")
+    with op.batch_alter_table('raw_articles_archive', schema=None) as batch_op:
+        batch_op.alter_column('raw_article_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_raw_articles_archive_raw_article_id'), ['raw_article_id'], unique=False)
+    if op.get_bind().dialect.name == 'postgresql':
+        # Rows were inserted with explicit ids, so move the serial past them
+        op.execute(
+            "SELECT setval(pg_get_serial_sequence('raw_articles_archive', 'id'), "
+            "COALESCE((SELECT MAX(id) FROM raw_articles_archive), 0) + 1, false)"
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('raw_articles_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_raw_articles_archive_raw_article_id'))
+        batch_op.drop_column('raw_article_id')
@@ -0,0 +1,28 @@
+"""Add content_version to RawArticle
+
+Revision ID: b2f4c8e1a9d3
+Revises: 7138520ab18f
+Create Date: 2026-10-19 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2f4c8e1a9d3'
+down_revision: Union[str, None] = '7138520ab18f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('raw_articles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('raw_articles', schema=None) as batch_op:
+        batch_op.drop_column('content_version')
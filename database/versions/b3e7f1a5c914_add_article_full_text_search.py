@@ -0,0 +1,60 @@
+"""Add full-text search over articles
+
+Revision ID: b3e7f1a5c914
+Revises: a1d5e9f3b207
+Create Date: 2026-10-19 18:55:41.207713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7f1a5c914'
+down_revision: Union[str, None] = 'a1d5e9f3b207'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The schema as of this revision (app/models/database.py builds the same for create_all)
+SQLITE_ARTICLE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title_en, title_te, summary_en, summary_te, content_en, content_te, "
+    "content='articles', content_rowid='id', "
+    "tokenize=\"porter unicode61 remove_diacritics 2 categories 'L* N* Co M*'\")"
+)
+
+POSTGRES_ARTICLE_SEARCH_DDL = (
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title_en, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(title_te, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(summary_en, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(summary_te, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content_en, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(content_te, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING gin (search_vector)",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(SQLITE_ARTICLE_FTS_DDL)
+        # Index the existing active articles
+        op.execute("INSERT INTO articles_fts(rowid, title_en, title_te, summary_en, summary_te, content_en, content_te) "
+                   "SELECT id, coalesce(title_en, ''), coalesce(title_te, ''), coalesce(summary_en, ''), "
+                   "coalesce(summary_te, ''), coalesce(content_en, ''), coalesce(content_te, '') "
+                   "FROM articles WHERE is_active = 1")
+    elif dialect == 'postgresql':
+        for statement in POSTGRES_ARTICLE_SEARCH_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS articles_fts")
+    elif dialect == 'postgresql':
+        op.drop_index('ix_articles_search_vector', table_name='articles')
+        op.drop_column('articles', 'search_vector')
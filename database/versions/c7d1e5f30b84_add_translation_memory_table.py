@@ -0,0 +1,40 @@
+"""Add translation_memory table
+
+Revision ID: c7d1e5f30b84
+Revises: b2f4c8e1a9d3
+Create Date: 2026-10-19 11:02:17.540611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d1e5f30b84'
+down_revision: Union[str, None] = 'b2f4c8e1a9d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('translation_memory',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source_text', sa.Text(), nullable=False),
+    sa.Column('normalized_source', sa.String(), nullable=False),
+    sa.Column('target_text', sa.Text(), nullable=False),
+    sa.Column('origin', sa.String(), nullable=False),
+    sa.Column('hits', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_translation_memory_id'), 'translation_memory', ['id'], unique=False)
+    op.create_index(op.f('ix_translation_memory_normalized_source'), 'translation_memory', ['normalized_source'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_translation_memory_normalized_source'), table_name='translation_memory')
+    op.drop_index(op.f('ix_translation_memory_id'), table_name='translation_memory')
+    op.drop_table('translation_memory')
@@ -0,0 +1,60 @@
+"""Add raw_articles_archive and scraping_log_daily tables
+
+Revision ID: c8f2a6d4e015
+Revises: b3e7f1a5c914
+Create Date: 2026-10-19 21:08:37.214903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2a6d4e015'
+down_revision: Union[str, None] = 'b3e7f1a5c914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('raw_articles_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('source_url', sa.String(), nullable=False),
+    sa.Column('source_name', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('published_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('scraped_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('content_type', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('triage_score', sa.Float(), nullable=True),
+    sa.Column('sections', sa.Text(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_raw_articles_archive_source_url'), 'raw_articles_archive', ['source_url'], unique=False)
+    op.create_table('scraping_log_daily',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('source_name', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('runs', sa.Integer(), nullable=False),
+    sa.Column('success_runs', sa.Integer(), nullable=False),
+    sa.Column('error_runs', sa.Integer(), nullable=False),
+    sa.Column('articles_found', sa.Integer(), nullable=False),
+    sa.Column('articles_new', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'source_name', 'category', name='uq_scraping_log_daily')
+    )
+    op.create_index(op.f('ix_scraping_log_daily_day'), 'scraping_log_daily', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_scraping_log_daily_day'), table_name='scraping_log_daily')
+    op.drop_table('scraping_log_daily')
+    op.drop_index(op.f('ix_raw_articles_archive_source_url'), table_name='raw_articles_archive')
+    op.drop_table('raw_articles_archive')
@@ -0,0 +1,50 @@
+"""Add llm_calls table
+
+Revision ID: d4a8b2c6e913
+Revises: c7d1e5f30b84
+Create Date: 2026-10-19 13:41:05.902377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8b2c6e913'
+down_revision: Union[str, None] = 'c7d1e5f30b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('llm_calls',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('raw_article_id', sa.Integer(), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('prompt_type', sa.String(), nullable=False),
+    sa.Column('input_tokens', sa.Integer(), nullable=False),
+    sa.Column('output_tokens', sa.Integer(), nullable=False),
+    sa.Column('latency_ms', sa.Float(), nullable=False),
+    sa.Column('retries', sa.Integer(), nullable=False),
+    sa.Column('outcome', sa.String(), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_llm_calls_id'), 'llm_calls', ['id'], unique=False)
+    op.create_index(op.f('ix_llm_calls_raw_article_id'), 'llm_calls', ['raw_article_id'], unique=False)
+    op.create_index(op.f('ix_llm_calls_category'), 'llm_calls', ['category'], unique=False)
+    op.create_index(op.f('ix_llm_calls_prompt_type'), 'llm_calls', ['prompt_type'], unique=False)
+    op.create_index(op.f('ix_llm_calls_created_at'), 'llm_calls', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_llm_calls_created_at'), table_name='llm_calls')
+    op.drop_index(op.f('ix_llm_calls_prompt_type'), table_name='llm_calls')
+    op.drop_index(op.f('ix_llm_calls_category'), table_name='llm_calls')
+    op.drop_index(op.f('ix_llm_calls_raw_article_id'), table_name='llm_calls')
+    op.drop_index(op.f('ix_llm_calls_id'), table_name='llm_calls')
+    op.drop_table('llm_calls')
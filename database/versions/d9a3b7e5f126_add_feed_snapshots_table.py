@@ -0,0 +1,32 @@
+"""Add feed_snapshots table
+
+Revision ID: d9a3b7e5f126
+Revises: c8f2a6d4e015
+Create Date: 2026-10-19 21:46:12.530418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3b7e5f126'
+down_revision: Union[str, None] = 'c8f2a6d4e015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left empty: each snapshot is built from articles on its first read
+    op.create_table('feed_snapshots',
+    sa.Column('section', sa.String(), nullable=False),
+    sa.Column('cards', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('section')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('feed_snapshots')
@@ -0,0 +1,31 @@
+"""Add rendered content_html columns to articles
+
+Revision ID: e1b5c9d3a247
+Revises: d9a3b7e5f126
+Create Date: 2026-10-19 22:31:50.118364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b5c9d3a247'
+down_revision: Union[str, None] = 'd9a3b7e5f126'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows are filled by `python manage.py backfill-content-html`
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_html_en', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('content_html_te', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.drop_column('content_html_te')
+        batch_op.drop_column('content_html_en')
@@ -0,0 +1,30 @@
+"""Add triage_score to RawArticle
+
+Revision ID: e5b9c3d7f021
+Revises: d4a8b2c6e913
+Create Date: 2026-10-19 15:20:33.417950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9c3d7f021'
+down_revision: Union[str, None] = 'd4a8b2c6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('raw_articles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('triage_score', sa.Float(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_raw_articles_triage_score'), ['triage_score'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('raw_articles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_raw_articles_triage_score'))
+        batch_op.drop_column('triage_score')
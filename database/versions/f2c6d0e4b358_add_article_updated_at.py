@@ -0,0 +1,30 @@
+"""Add updated_at to articles
+
+Revision ID: f2c6d0e4b358
+Revises: e1b5c9d3a247
+Create Date: 2026-10-19 23:12:07.402518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d0e4b358'
+down_revision: Union[str, None] = 'e1b5c9d3a247'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Existing articles were last changed when they were published, as far as we know
+    op.execute("UPDATE articles SET updated_at = scraped_date WHERE updated_at IS NULL")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,35 @@
+"""Add composite indexes for the public and curation read paths
+
+Revision ID: f6c0d4e8a132
+Revises: e5b9c3d7f021
+Create Date: 2026-10-19 16:05:48.227391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c0d4e8a132'
+down_revision: Union[str, None] = 'e5b9c3d7f021'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # home() latest articles and /api/articles without a category
+    op.create_index('ix_articles_active_scraped', 'articles', ['is_active', 'scraped_date'], unique=False)
+    # home() top stories / AI, category_page and /api/articles?category=
+    op.create_index('ix_articles_active_category_scraped', 'articles', ['is_active', 'category', 'scraped_date'], unique=False)
+    # /api/raw_articles curation queue, all categories and per category
+    op.create_index('ix_raw_articles_status_scraped', 'raw_articles', ['status', 'scraped_date'], unique=False)
+    op.create_index('ix_raw_articles_status_category_scraped', 'raw_articles', ['status', 'category', 'scraped_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_raw_articles_status_category_scraped', table_name='raw_articles')
+    op.drop_index('ix_raw_articles_status_scraped', table_name='raw_articles')
+    op.drop_index('ix_articles_active_category_scraped', table_name='articles')
+    op.drop_index('ix_articles_active_scraped', table_name='articles')
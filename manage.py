@@ -0,0 +1,54 @@
+"""
+Maintenance commands.
+
+    python manage.py backfill-content-html [--rerender]
+    python manage.py precompress-static
+    python manage.py export-static [--full] [--output DIR] [--workers N]
+"""
+
+import argparse
+import os
+
+from app.api.compression import precompress_directory
+from app.models.database import SessionLocal
+from app.services.rendering import backfill_content_html
+from app.services.static_export import StaticExporter
+from config.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("backfill-content-html", help="Render the HTML bodies of articles that lack them")
+    backfill.add_argument("--rerender", action="store_true", help="Re-render every article (e.g. after changing Markdown options)")
+    backfill.add_argument("--batch-size", type=int, default=500)
+
+    precompress = commands.add_parser("precompress-static", help="Write .br/.gz variants of the static files (run at build time)")
+    precompress.add_argument("--dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "static"))
+
+    export = commands.add_parser("export-static", help="Render the public pages to static files (incremental unless --full)")
+    export.add_argument("--output", default=settings.STATIC_EXPORT_DIR)
+    export.add_argument("--full", action="store_true", help="Re-render every page, not only what changed since the last export")
+    export.add_argument("--workers", type=int, default=None, help="Processes for a full export (default: one per CPU)")
+
+    args = parser.parse_args()
+    if args.command == "precompress-static":
+        counts = precompress_directory(args.dir, min_size=settings.COMPRESSION_MIN_SIZE)
+        print(f"Precompressed {counts['compressed']} files ({counts['up_to_date']} up to date, {counts['skipped']} skipped).")
+        return
+    db = SessionLocal()
+    try:
+        if args.command == "backfill-content-html":
+            count = backfill_content_html(db, batch_size=args.batch_size, rerender=args.rerender)
+            print(f"Rendered HTML bodies for {count} articles.")
+        elif args.command == "export-static":
+            result = StaticExporter(db, args.output, workers=args.workers).run(full=args.full)
+            kind = "Full" if result["full"] else "Incremental"
+            print(f"{kind} export to {args.output}: {result['pages']} pages written, {result['removed']} removed.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
+import json
+import pytest
+import xml.etree.ElementTree as ET
+from datetime import datetime
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from app.api.main import app
+from app.services.search import ArticleSearchIndex
+from app.services.page_cache import page_cache
+from app.models import database
+from app.models.database import Base, Article, RawArticle, build_async_engine, get_async_db, get_db
+from config.settings import settings
 
 client = TestClient(app)
 
@@ -17,3 +29,219 @@ def test_static_css_file_is_reachable():
     response = client.get("/static/css/style.css")
     assert response.status_code == 200
     assert "text/css" in response.headers["content-type"]
+
+def test_raw_articles_sort_options():
+    response = client.get("/api/raw_articles?sort=triage&min_score=0")
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
+    assert client.get("/api/raw_articles?sort=bogus").status_code == 400
+
+def test_articles_cursor_pagination():
+    response = client.get("/api/articles?limit=5")
+    assert response.status_code == 200
+    assert "next_cursor" in response.json()
+    assert client.get("/api/articles?cursor=not-a-cursor").status_code == 400
+    assert client.get("/api/raw_articles?sort=triage&cursor=abc").status_code == 400
+
+@pytest.fixture
+def seeded_client(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'api.db'}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.add(RawArticle(title="Raw", content="RAW BODY", source_url="http://example.com/r", source_name="T", category="AI", published_date=datetime.utcnow()))
+    session.add(Article(title_en="Live", content_en="LIVE BODY", source_url="http://example.com/a", source_name="T", category="AI", published_date=datetime.utcnow()))
+    session.commit()
+    ArticleSearchIndex(session).rebuild()
+    session.close()
+
+    async_engine = build_async_engine(database_url)
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = lambda: Session()
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Pages cached by other tests were rendered from a different database
+    page_cache.clear()
+    yield client
+    app.dependency_overrides.clear()
+    page_cache.clear()
+    engine.dispose()
+
+def test_list_views_omit_bodies_by_default(seeded_client):
+    assert seeded_client.get("/api/articles?view=bogus").status_code == 400
+    assert seeded_client.get("/api/raw_articles?view=bogus").status_code == 400
+
+    article = seeded_client.get("/api/articles").json()["articles"][0]
+    assert "content_en" not in article and article["title_en"] == "Live"
+    assert "updated_at" not in article
+    assert datetime.fromisoformat(article["scraped_date"])
+    assert seeded_client.get("/api/articles?view=full").json()["articles"][0]["content_en"] == "LIVE BODY"
+
+    raw_article = seeded_client.get("/api/raw_articles").json()[0]
+    assert "content" not in raw_article and raw_article["title"] == "Raw"
+    assert datetime.fromisoformat(raw_article["published_date"])
+    assert seeded_client.get("/api/raw_articles?view=full").json()[0]["content"] == "RAW BODY"
+
+    assert "Live" in seeded_client.get("/category/AI").text
+
+def test_search_endpoint(seeded_client):
+    assert seeded_client.get("/api/search?q=live&limit=0").status_code == 400
+    # The list endpoints validate limit too, even with rows to page through
+    for url in ("/api/articles", "/api/raw_articles"):
+        assert seeded_client.get(f"{url}?limit=0").status_code == 422
+        assert seeded_client.get(f"{url}?limit=-1").status_code == 422
+        assert seeded_client.get(f"{url}?limit=101").status_code == 422
+        assert seeded_client.get(f"{url}?limit=1").status_code == 200
+    response = seeded_client.get("/api/search?q=quantum")
+    assert response.status_code == 200
+    assert response.json()["results"] == []
+
+def test_async_curation_endpoints(seeded_client):
+    assert seeded_client.get("/api/logs").status_code == 200
+    assert seeded_client.get("/api/llm_usage/daily").status_code == 200
+    assert seeded_client.get("/curation/process/1").status_code == 200
+    assert seeded_client.get("/article/1").status_code == 200
+    assert seeded_client.get("/api/search?q=live").json()["results"][0]["id"] == 1
+    assert "/article/1" in seeded_client.get("/").text
+
+    assert seeded_client.post("/api/articles/1/deactivate").status_code == 200
+    assert seeded_client.get("/article/1").status_code == 404
+    assert "/article/1" not in seeded_client.get("/").text
+    assert seeded_client.get("/api/search?q=live").json()["results"] == []
+
+    assert seeded_client.post("/api/raw_articles/1/reject").status_code == 200
+    assert seeded_client.post("/api/raw_articles/1/reject").status_code == 404
+
+def test_bulk_curation_endpoints(seeded_client):
+    assert seeded_client.post("/api/raw_articles/bulk/reject", json={}).status_code == 400
+    assert seeded_client.post("/api/raw_articles/bulk/reject", json={"ids": [1], "category": "AI"}).status_code == 400
+
+    response = seeded_client.post("/api/raw_articles/bulk/approve", json={"category": "AI"})
+    assert response.status_code == 200
+    assert response.json()["counts"] == {"approved": 1}
+    article_id = response.json()["results"][0]["article_id"]
+    assert seeded_client.get(f"/article/{article_id}").status_code == 200
+    assert seeded_client.post("/api/raw_articles/1/approve").status_code == 400
+    # Published raw articles are out of the queue for single rejects too
+    assert seeded_client.post("/api/raw_articles/1/reject").status_code == 400
+
+    response = seeded_client.post("/api/raw_articles/bulk/reject", json={"ids": [1, 42]})
+    assert response.json()["counts"] == {"not_in_queue": 1, "not_found": 1}
+
+def test_reads_use_replica_until_a_write(seeded_client, tmp_path, monkeypatch):
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_engine = create_engine(replica_url)
+    Base.metadata.create_all(replica_engine)
+    with sessionmaker(bind=replica_engine)() as session:
+        session.add(Article(title_en="Lagging replica", source_url="http://example.com/replica", source_name="T", category="AI"))
+        session.commit()
+    replica_async_engine = build_async_engine(replica_url)
+    monkeypatch.setattr(database, "ReadAsyncSessionLocals", [
+        async_sessionmaker(replica_async_engine, expire_on_commit=False, info={"read_only": True})
+    ])
+    seeded_client.cookies.clear()
+
+    assert [a["title_en"] for a in seeded_client.get("/api/articles").json()["articles"]] == ["Lagging replica"]
+    # Snapshots are not written on the replica
+    assert "Lagging replica" in seeded_client.get("/").text
+
+    response = seeded_client.post("/api/raw_articles/bulk/reject", json={"ids": [1]})
+    assert response.cookies.get(database.READ_YOUR_WRITES_COOKIE) == "1"
+    assert [a["title_en"] for a in seeded_client.get("/api/articles").json()["articles"]] == ["Live"]
+    # Nor kept by the browser while it reads its own writes
+    assert seeded_client.get("/").headers["Cache-Control"] == "no-cache"
+
+    seeded_client.cookies.clear()
+    replica_engine.dispose()
+
+def test_replica_renders_right_after_a_write_are_not_cached(seeded_client, tmp_path, monkeypatch):
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    Base.metadata.create_all(create_engine(replica_url))
+    monkeypatch.setattr(database, "ReadAsyncSessionLocals", [
+        async_sessionmaker(build_async_engine(replica_url), expire_on_commit=False, info={"read_only": True})
+    ])
+    seeded_client.post("/api/articles/1/deactivate")
+    # Another browser, served by a replica that may not have the write yet
+    seeded_client.cookies.clear()
+    assert seeded_client.get("/category/AI").headers["Cache-Control"] == "no-cache"
+
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0)
+    assert seeded_client.get("/category/AI").headers["Cache-Control"] == settings.CACHE_CONTROL_PAGES
+    seeded_client.cookies.clear()
+
+def test_pages_served_from_cache_until_invalidated(seeded_client, tmp_path):
+    seeded_client.cookies.clear()
+    assert "Live" in seeded_client.get("/article/1").text
+    # Change the row behind the cache's back: the cached render is still served
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("UPDATE articles SET title_en = 'Edited' WHERE id = 1")
+    engine.dispose()
+    assert "Live" in seeded_client.get("/article/1").text
+    assert "Edited" in seeded_client.get("/article/1", headers={"Accept-Language": "te"}).text
+
+    seeded_client.post("/api/articles/1/deactivate")
+    seeded_client.cookies.clear()
+    assert seeded_client.get("/article/1").status_code == 404
+
+
+def test_conditional_requests_get_304(seeded_client):
+    seeded_client.cookies.clear()
+    for url in ("/article/1", "/", "/category/AI"):
+        first = seeded_client.get(url)  # builds the feed snapshots on the first visit
+        response = seeded_client.get(url)
+        assert response.headers["Cache-Control"] == settings.CACHE_CONTROL_PAGES
+        assert response.headers["Vary"] == "Cookie, Accept-Language, Accept-Encoding"
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+        assert seeded_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        since = {"If-Modified-Since": response.headers["Last-Modified"]}
+        assert seeded_client.get(url, headers=since).status_code == 304
+        # Another language is another representation
+        assert seeded_client.get(url, headers={"If-None-Match": etag, "Accept-Language": "te"}).status_code == 200
+        assert first.status_code == 200
+
+    response = seeded_client.get("/api/articles")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == settings.CACHE_CONTROL_API
+    assert seeded_client.get("/api/articles", headers={"If-None-Match": etag}).status_code == 304
+    assert seeded_client.get("/api/articles?view=full", headers={"If-None-Match": etag}).status_code == 200
+    search_etag = seeded_client.get("/api/search?q=live").headers["ETag"]
+    assert seeded_client.get("/api/search?q=live", headers={"If-None-Match": search_etag}).status_code == 304
+
+    # Deactivating the article changes every validator that covered it
+    article_etag = seeded_client.get("/article/1").headers["ETag"]
+    home_etag = seeded_client.get("/").headers["ETag"]
+    seeded_client.post("/api/articles/1/deactivate")
+    assert seeded_client.get("/", headers={"If-None-Match": home_etag}).status_code == 200
+    assert seeded_client.get("/article/1", headers={"If-None-Match": article_etag}).status_code == 404
+    assert seeded_client.get("/api/articles", headers={"If-None-Match": etag}).status_code == 200
+
+def test_category_feeds(seeded_client):
+    seeded_client.cookies.clear()
+    assert seeded_client.get("/feeds/AI.xml").status_code == 404
+    assert seeded_client.get("/feeds/Nope.rss").status_code == 404
+    assert seeded_client.get("/feeds/AI.rss?lang=fr").status_code == 400
+
+    rss = seeded_client.get("/feeds/AI.rss")
+    assert rss.headers["Content-Type"].startswith("application/rss+xml")
+    assert rss.headers["Cache-Control"] == settings.CACHE_CONTROL_FEEDS
+    assert [item.findtext("title") for item in ET.fromstring(rss.content).iter("item")] == ["Live"]
+    atom = seeded_client.get("/feeds/AI.atom?lang=te")
+    assert ET.fromstring(atom.content).find("{http://www.w3.org/2005/Atom}entry") is not None
+    feed = json.loads(seeded_client.get("/feeds/AI.json").content)
+    assert feed["items"][0]["url"].endswith("/article/1")
+
+    etag = seeded_client.get("/feeds/AI.rss").headers["ETag"]
+    assert seeded_client.get("/feeds/AI.rss", headers={"If-None-Match": etag}).status_code == 304
+    assert seeded_client.get("/feeds/AI.atom", headers={"If-None-Match": etag}).status_code == 200
+
+    seeded_client.post("/api/articles/1/deactivate")
+    seeded_client.cookies.clear()
+    rss = seeded_client.get("/feeds/AI.rss", headers={"If-None-Match": etag})
+    assert rss.status_code == 200 and list(ET.fromstring(rss.content).iter("item")) == []
@@ -0,0 +1,83 @@
+import gzip
+import os
+
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api.compression import CompressionMiddleware, PrecompressedStaticFiles, precompress_directory
+
+PAGE = "<p>" + "Quantum processors and satellites. " * 200 + "</p>"
+
+def make_client(static_dir):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/page")
+    def page():
+        return HTMLResponse(PAGE, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return HTMLResponse("<p>short</p>")
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((PAGE for _ in range(3)), media_type="text/html")
+
+    @app.get("/range")
+    def byte_range(status: int = 206):
+        body = PAGE[:2000].encode()
+        return Response(body, status_code=status, media_type="text/html",
+                        headers={"Content-Range": f"bytes 0-1999/{len(PAGE)}"})
+
+    app.mount("/static", PrecompressedStaticFiles(directory=static_dir), name="static")
+    return TestClient(app)
+
+def test_compresses_large_text_responses_only(tmp_path):
+    client = make_client(tmp_path)
+    response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert int(response.headers["Content-Length"]) < len(PAGE) / 10
+    assert response.text == PAGE
+
+    assert client.get("/stream", headers={"Accept-Encoding": "gzip"}).text == PAGE * 3
+    assert "Content-Encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/page", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+def test_range_responses_pass_through(tmp_path):
+    client = make_client(tmp_path)
+    for status in (206, 200):
+        response = client.get(f"/range?status={status}", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == status
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Content-Range"] == f"bytes 0-1999/{len(PAGE)}"
+        assert response.text == PAGE[:2000]
+
+def test_serves_precompressed_static_variants(tmp_path):
+    (tmp_path / "style.css").write_text("body { color: #333; }\n" * 200)
+    (tmp_path / "tiny.css").write_text("a{}")
+    assert precompress_directory(str(tmp_path)) == {"compressed": 1, "skipped": 1, "up_to_date": 0}
+    assert precompress_directory(str(tmp_path))["up_to_date"] == 1
+    assert gzip.decompress((tmp_path / "style.css.gz").read_bytes()) == (tmp_path / "style.css").read_bytes()
+
+    client = make_client(tmp_path)
+    response = client.get("/static/style.css", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Type"].startswith("text/css")
+    assert int(response.headers["Content-Length"]) == os.path.getsize(tmp_path / "style.css.gz")
+    assert response.text.startswith("body")
+    revalidated = client.get("/static/style.css", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+    # Clients that do not accept gzip get the original file
+    plain = client.get("/static/style.css", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert int(plain.headers["Content-Length"]) == os.path.getsize(tmp_path / "style.css")
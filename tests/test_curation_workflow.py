@@ -1,22 +1,9 @@
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.models.database import Base, RawArticle, Article, ArticleSection
+from app.models.database import RawArticle, Article, ArticleSection
 from datetime import datetime
-from app.curation.services import CurationService
+from app.curation.services import CurationService, StaleContentError
 from app.curation.schemas import FinalArticleData # Import FinalArticleData
 
-# Setup for an in-memory SQLite database for testing
-@pytest.fixture(scope="function")
-def db_session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine) # Create tables
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-    Base.metadata.drop_all(engine) # Drop tables after test
-
 def test_publish_final_article(db_session):
     """
     Tests the publishing of a RawArticle into a final curated Article.
@@ -76,3 +63,130 @@ def test_publish_final_article(db_session):
     # The CurationService.publish_final_article method explicitly creates a single Article
     # and sets its content_en/content_te fields, it does not manage ArticleSection directly.
     # Therefore, no assertions for ArticleSection here.
+
+
+def _create_raw_article(db_session, url="http://testraw.com/sections"):
+    raw_article = RawArticle(
+        title="Sections Article",
+        content="Body.",
+        summary="Summary.",
+        source_url=url,
+        source_name="Test Raw Source",
+        category="AI",
+        status="pending",
+    )
+    db_session.add(raw_article)
+    db_session.commit()
+    db_session.refresh(raw_article)
+    return raw_article
+
+
+def test_save_structured_content_writes_only_changed_sections(db_session):
+    raw_article = _create_raw_article(db_session)
+    service = CurationService(db_session)
+
+    sections = {
+        "Topic Overview": {"en": "Overview", "te": "Overview te"},
+        "Key Findings": {"en": "Findings", "te": "Findings te"},
+        "Limitations": {"en": "Limits", "te": "Limits te"},
+    }
+    saved = service.save_structured_content(raw_article.id, "Title", "News", sections)
+    assert saved.status == "structured"
+    assert saved.content_version == 1
+
+    ids_before = {
+        s.section_title_en: s.id
+        for s in db_session.query(ArticleSection).filter_by(raw_article_id=raw_article.id)
+    }
+
+    edited = {
+        "Topic Overview": {"en": "Overview", "te": "Overview te"},
+        "Key Findings": {"en": "Findings, revised", "te": "Findings te"},
+        "Detailed Summary": {"en": "Summary", "te": "Summary te"},
+    }
+    saved = service.save_structured_content(raw_article.id, "Title", "News", edited, expected_version=1)
+    assert saved.content_version == 2
+
+    db_session.expire_all()
+    stored = {
+        s.section_title_en: s
+        for s in db_session.query(ArticleSection).filter_by(raw_article_id=raw_article.id)
+    }
+    assert set(stored) == {"Topic Overview", "Key Findings", "Detailed Summary"}
+    # Unchanged and edited sections keep their rows; removed ones are gone.
+    assert stored["Topic Overview"].id == ids_before["Topic Overview"]
+    assert stored["Key Findings"].id == ids_before["Key Findings"]
+    assert stored["Key Findings"].section_content_en == "Findings, revised"
+
+
+def test_save_structured_content_rejects_stale_version(db_session):
+    raw_article = _create_raw_article(db_session, url="http://testraw.com/stale")
+    service = CurationService(db_session)
+    sections = {"Topic Overview": {"en": "Overview", "te": "Overview te"}}
+
+    service.save_structured_content(raw_article.id, "Title", "News", sections, expected_version=0)
+
+    with pytest.raises(StaleContentError):
+        service.save_structured_content(raw_article.id, "Other title", "News", sections, expected_version=0)
+
+    db_session.expire_all()
+    assert db_session.get(RawArticle, raw_article.id).title == "Title"
+    assert service.save_structured_content(999, "Title", "News", sections) is None
+
+def _queue(db_session, count, status="pending", category="AI"):
+    start = db_session.query(RawArticle).count()
+    raw_articles = [
+        RawArticle(title=f"Queued {n}", content=f"Body {n}", summary="Summary", source_url=f"http://testraw.com/q/{n}",
+                   source_name="Test", category=category, status=status)
+        for n in range(start, start + count)
+    ]
+    db_session.add_all(raw_articles)
+    db_session.commit()
+    return [raw_article.id for raw_article in raw_articles]
+
+def test_bulk_approve_reports_per_item_results(db_session):
+    ids = _queue(db_session, 3)
+    published_id = _queue(db_session, 1, status="published")[0]
+    db_session.add(Article(title_en="Existing", source_url="http://testraw.com/q/2", source_name="Test", category="AI"))
+    db_session.commit()
+
+    results = CurationService(db_session).approve_raw_articles(ids + [published_id, 999])
+
+    assert [result["status"] for result in results] == ["approved", "approved", "duplicate", "not_in_queue", "not_found"]
+    article = db_session.get(Article, results[0]["article_id"])
+    assert (article.title_en, article.content_en, article.is_active) == ("Queued 0", "Body 0", True)
+    assert article.content_html_en == "<p>Body 0</p>"
+    assert db_session.get(RawArticle, ids[0]).status == "published"
+    assert db_session.get(RawArticle, ids[2]).status == "pending"
+
+def test_bulk_reject_by_filter(db_session):
+    ai_ids = _queue(db_session, 3)
+    space_ids = _queue(db_session, 2, category="Space Tech")
+    db_session.add(ArticleSection(raw_article_id=ai_ids[0], section_title_en="T", section_content_en="C"))
+    db_session.commit()
+    service = CurationService(db_session)
+
+    results = service.reject_raw_articles(service.queue_ids(category="AI"))
+
+    assert [result["status"] for result in results] == ["rejected"] * 3
+    assert [raw_article.id for raw_article in db_session.query(RawArticle).all()] == space_ids
+    assert db_session.query(ArticleSection).count() == 0
+
+def test_bulk_publish_skips_duplicates(db_session):
+    from app.curation.schemas import BulkPublishItem
+    ids = _queue(db_session, 2)
+
+    def item(raw_article_id, source_url):
+        return BulkPublishItem(
+            raw_article_id=raw_article_id, title_en="Curated", summary_en="S", content_en="C", title_te="T",
+            summary_te=None, content_te=None, image_url=None, source_url=source_url, source_name="Test",
+            category="AI", published_date=None, content_type="News",
+        )
+
+    results = CurationService(db_session).publish_final_articles([
+        item(ids[0], "http://testraw.com/final"), item(ids[1], "http://testraw.com/final"),
+    ])
+
+    assert [result["status"] for result in results] == ["published", "duplicate"]
+    assert db_session.query(Article).one().id == results[0]["article_id"]
+    assert [raw_article.status for raw_article in db_session.query(RawArticle).order_by(RawArticle.id)] == ["published", "pending"]
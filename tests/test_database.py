@@ -0,0 +1,15 @@
+from app.models.database import build_engine
+
+def test_sqlite_engine_pragmas(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+    engine.dispose()
+
+def test_in_memory_engine_skips_wal():
+    engine = build_engine("sqlite:///:memory:")
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "memory"
+    engine.dispose()
@@ -0,0 +1,62 @@
+import json
+from datetime import datetime, timedelta
+from app.models.database import RawArticle, Article, FeedSnapshot
+from app.curation.schemas import FinalArticleData
+from app.curation.services import CurationService
+from app.services.feeds import FeedSnapshots, HOME_SECTIONS, category_section, sections_for
+
+def publish(db_session, n, category="AI"):
+    raw_article = RawArticle(
+        title=f"Raw {n}", content="", summary="", source_url=f"http://example.com/raw/{n}",
+        source_name="Test", category=category, status="structured"
+    )
+    db_session.add(raw_article)
+    db_session.commit()
+    final_data = FinalArticleData(
+        title_en=f"Article {n}", summary_en="", content_en="Body", title_te="", summary_te="", content_te="",
+        image_url=None, source_url=f"http://example.com/{n}", source_name="Test",
+        category=category, published_date=datetime.utcnow(), content_type="News",
+    )
+    return CurationService(db_session).publish_final_article(raw_article.id, final_data)
+
+def card_ids(db_session, section):
+    return [card.id for card in FeedSnapshots(db_session).get([section])[section]]
+
+def test_sections_for_category():
+    assert sections_for("AI") == ["latest", "top_stories", "ai", "category:AI"]
+    assert sections_for("Start-ups") == ["latest", "category:Start-ups"]
+
+def test_snapshots_built_on_first_read(db_session):
+    now = datetime.utcnow()
+    for n in range(12):
+        db_session.add(Article(
+            title_en=f"Seeded {n}", source_url=f"http://example.com/s/{n}", source_name="Test",
+            category="AI" if n % 2 else "Start-ups", scraped_date=now - timedelta(minutes=n),
+        ))
+    db_session.commit()
+
+    feeds = FeedSnapshots(db_session).get(list(HOME_SECTIONS))
+    assert [card.title_en for card in feeds["latest"]] == [f"Seeded {n}" for n in range(9)]
+    assert [card.title_en for card in feeds["ai"]] == ["Seeded 1", "Seeded 3", "Seeded 5", "Seeded 7"]
+    assert isinstance(feeds["latest"][0].scraped_date, datetime)
+    assert db_session.query(FeedSnapshot).count() == len(HOME_SECTIONS)
+
+def test_publish_and_deactivate_update_snapshots(db_session):
+    first = publish(db_session, 1)
+    # Build the snapshots, so the next publish has to update them in place
+    assert card_ids(db_session, "ai") == [first.id]
+    assert card_ids(db_session, category_section("Start-ups")) == []
+
+    startup = publish(db_session, 2, category="Start-ups")
+    later = [publish(db_session, n).id for n in range(3, 7)]
+    assert card_ids(db_session, "ai") == later[::-1]
+    assert card_ids(db_session, "latest")[:5] == later[::-1] + [startup.id]
+    assert card_ids(db_session, category_section("Start-ups")) == [startup.id]
+
+    # A deactivated card is replaced by the next newest article
+    CurationService(db_session).deactivate_article(later[-1])
+    assert card_ids(db_session, "ai") == later[-2::-1] + [first.id]
+    assert later[-1] not in card_ids(db_session, "latest")
+
+    stored = json.loads(db_session.get(FeedSnapshot, "ai").cards)
+    assert [card["id"] for card in stored] == later[-2::-1] + [first.id]
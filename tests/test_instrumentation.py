@@ -0,0 +1,61 @@
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.api.main import app
+from app.instrumentation import MetricsMiddleware, RequestStats, RouteMetrics, metrics
+from app.services.page_cache import page_cache
+from app.templating import templates
+
+client = TestClient(app)
+
+def route_metrics(route, method="GET"):
+    routes = client.get("/api/metrics").json()["routes"]
+    return next(entry for entry in routes if entry["route"] == route and entry["method"] == method)
+
+def test_routes_record_latency_sql_and_template_time():
+    metrics.clear()
+    page_cache.clear()
+    assert client.get("/").status_code == 200
+    assert client.get("/api/articles?limit=5").status_code == 200
+    assert client.get("/article/999999999").status_code == 404
+
+    home = route_metrics("/")
+    assert home["requests"] == 1 and home["errors"] == 0
+    assert home["template_ms_per_request"] > 0
+    assert sum(home["latency_ms"]["buckets"].values()) == 1
+
+    assert route_metrics("/api/articles")["sql_queries_per_request"] >= 1
+    # Keyed by the path template, not the URL
+    assert route_metrics("/article/{article_id}")["requests"] == 1
+
+def test_static_files_are_grouped_under_their_mount():
+    metrics.clear()
+    client.get("/static/css/style.css")
+    client.get("/static/no-such-file.css")
+    assert route_metrics("/static")["requests"] == 2
+
+def test_work_outside_requests_is_not_counted():
+    metrics.clear()
+    templates.env.get_template("about.html")
+    assert client.get("/api/metrics").json()["routes"] == []
+
+def test_slow_requests_are_logged_with_their_queries(caplog, monkeypatch):
+    middleware = app.middleware_stack
+    while not isinstance(middleware, MetricsMiddleware):
+        middleware = middleware.app
+    monkeypatch.setattr(middleware, "slow_request_ms", 0)
+    with caplog.at_level(logging.WARNING, logger="app.instrumentation"):
+        client.get("/api/articles?limit=5")
+    message = next(record.getMessage() for record in caplog.records if "Slow request" in record.getMessage())
+    assert "GET /api/articles (/api/articles) -> 200" in message
+    assert "SELECT" in message
+
+def test_histogram_percentiles():
+    route = RouteMetrics()
+    for duration in (3, 3, 7, 40, 9000):
+        route.add(duration, 200, RequestStats())
+    summary = route.as_dict()
+    assert summary["latency_ms"]["p50_le"] == 10
+    assert summary["latency_ms"]["p95_le"] is None
+    assert summary["latency_ms"]["buckets"]["le_50"] == 1 and summary["latency_ms"]["buckets"]["inf"] == 1
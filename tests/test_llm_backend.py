@@ -0,0 +1,71 @@
+import pytest
+from app.models.database import RawArticle
+from app.curation import services as curation_services
+from app.curation.services import CurationService
+from app.services.llm_backend import FakeLLMBackend, GeminiBackend, LLMBackendError, set_llm_backend
+from app.services.summarizer import summarize_with_gemini
+from config.settings import settings
+
+ARTICLE_TEXT = "Quantum chips got faster. Error rates dropped sharply. Shipping starts in 2026."
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    backend = FakeLLMBackend(latency_ms=0, failure_rate=0, seed=1)
+    set_llm_backend(backend)
+    monkeypatch.setattr(curation_services, "extract_article_content", lambda url: ARTICLE_TEXT)
+    yield backend
+    set_llm_backend(None)
+
+def test_fake_backend_is_deterministic():
+    prompt = f"Summarize.\n---\n{ARTICLE_TEXT}\n---\n"
+    first = FakeLLMBackend(seed=7).generate(prompt)
+    second = FakeLLMBackend(seed=7).generate(prompt)
+    assert first.text == second.text
+    assert first.input_tokens > 0 and first.output_tokens > 0
+
+def test_fake_backend_simulates_failures():
+    backend = FakeLLMBackend(failure_rate=1.0)
+    with pytest.raises(LLMBackendError):
+        backend.generate("anything")
+
+def test_summarizer_reports_backend_failure(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 0)
+    set_llm_backend(FakeLLMBackend(failure_rate=1.0))
+    try:
+        assert summarize_with_gemini("Summarize this").startswith("[Generation failed")
+    finally:
+        set_llm_backend(None)
+
+def test_structure_content_with_fake_backend(db_session, fake_backend):
+    raw_article = RawArticle(
+        title="Quantum update", content=ARTICLE_TEXT, summary="", source_url="http://example.com/q",
+        source_name="Test", category="Quantum Computing", status="pending"
+    )
+    db_session.add(raw_article)
+    db_session.commit()
+
+    service = CurationService(db_session)
+    sections = service.structure_content(raw_article.id, "News")
+
+    assert "Topic Overview" in sections
+    assert "Detailed Summary" in sections
+    for value in sections.values():
+        assert set(value.keys()) == {"en", "te"}
+    assert "Relevance Score" in sections["Scoring & Evaluation"]["en"]
+
+    summary = service.summarize_article(raw_article.id)
+    db_session.refresh(raw_article)
+    assert raw_article.summary == summary
+
+def test_backends_classify_transient_errors():
+    class ApiError(Exception):
+        def __init__(self, code):
+            self.code = code
+
+    gemini, fake = GeminiBackend(api_key="key"), FakeLLMBackend()
+    assert gemini.is_transient(ApiError(429)) and gemini.is_transient(ApiError(503))
+    assert not gemini.is_transient(ApiError(400)) and not gemini.is_transient(ApiError(403))
+    assert gemini.is_transient(TimeoutError()) and not gemini.is_transient(KeyError("bug"))
+    assert not fake.is_transient(ApiError(503))
+    assert fake.is_transient(LLMBackendError("overloaded", transient=True))
+    assert not fake.is_transient(LLMBackendError("API key not configured"))
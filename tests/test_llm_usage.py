@@ -0,0 +1,102 @@
+import pytest
+from datetime import datetime
+from app.models.database import RawArticle, LLMCall
+from app.curation import services as curation_services
+from app.curation.services import CurationService
+from app.services.llm_backend import FakeLLMBackend, LLMBackendError, set_llm_backend
+from app.services.llm_usage import LLMUsageReport, estimate_cost
+from app.services.summarizer import generate_with_stats
+from config.settings import settings
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    monkeypatch.setattr(curation_services, "extract_article_content", lambda url: "Chips got faster. Prices fell.")
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_SECONDS", 0)
+    set_llm_backend(FakeLLMBackend(latency_ms=0, failure_rate=0))
+    yield
+    set_llm_backend(None)
+
+class FlakyBackend(FakeLLMBackend):
+    """Fails the first attempt of every call, then succeeds."""
+    def __init__(self):
+        super().__init__(latency_ms=0, failure_rate=0)
+        self.attempts = 0
+
+    def generate(self, prompt):
+        self.attempts += 1
+        if self.attempts % 2:
+            raise LLMBackendError("overloaded", transient=True)
+        return super().generate(prompt)
+
+def test_generation_retries_are_counted(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_SECONDS", 0)
+    set_llm_backend(FlakyBackend())
+    try:
+        stats = generate_with_stats("Summarize this.")
+    finally:
+        set_llm_backend(None)
+    assert stats.outcome == "success"
+    assert stats.retries == 1
+    assert stats.output_tokens > 0
+
+class RejectingBackend(FakeLLMBackend):
+    """Fails every attempt with a non-transient error (a bad request, say)."""
+    def __init__(self):
+        super().__init__(latency_ms=0, failure_rate=0)
+        self.attempts = 0
+
+    def generate(self, prompt):
+        self.attempts += 1
+        raise LLMBackendError("invalid request")
+
+def test_permanent_failures_are_not_retried(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_SECONDS", 0)
+    backend = RejectingBackend()
+    set_llm_backend(backend)
+    try:
+        stats = generate_with_stats("Summarize this.")
+    finally:
+        set_llm_backend(None)
+    assert stats.outcome == "error" and stats.retries == 0
+    assert backend.attempts == 1
+
+def test_curation_calls_are_recorded(db_session, fake_backend):
+    raw_article = RawArticle(
+        title="Chips", content="Chips got faster.", summary="", source_url="http://example.com/chips",
+        source_name="Test", category="Semiconductors", status="pending"
+    )
+    db_session.add(raw_article)
+    db_session.commit()
+
+    service = CurationService(db_session)
+    service.summarize_article(raw_article.id)
+    service.structure_content(raw_article.id, "Research")
+
+    calls = db_session.query(LLMCall).order_by(LLMCall.id).all()
+    assert [c.prompt_type for c in calls] == ["summary", "structure:Research", "translate"]
+    assert all(c.raw_article_id == raw_article.id and c.category == "Semiconductors" for c in calls)
+    assert all(c.outcome == "success" and c.input_tokens > 0 for c in calls)
+
+def test_usage_aggregates(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_PRICING", {"m": {"input": 1.0, "output": 2.0}})
+    now = datetime.utcnow()
+    for latency in (100.0, 200.0, 300.0):
+        db_session.add(LLMCall(model="m", prompt_type="summary", category="AI", input_tokens=1_000_000,
+                               output_tokens=0, latency_ms=latency, retries=0, outcome="success", created_at=now))
+    db_session.add(LLMCall(model="m", prompt_type="summary", category="Robotics", input_tokens=0,
+                           output_tokens=500_000, latency_ms=50.0, retries=2, outcome="error", created_at=now))
+    db_session.commit()
+
+    report = LLMUsageReport(db_session)
+    daily = report.daily()
+    assert len(daily) == 1
+    assert daily[0]["calls"] == 4 and daily[0]["errors"] == 1 and daily[0]["retries"] == 2
+    assert daily[0]["cost_usd"] == pytest.approx(4.0)
+
+    categories = {entry["category"]: entry for entry in report.by_category()}
+    assert categories["AI"]["cost_usd"] == pytest.approx(3.0)
+    assert categories["Robotics"]["cost_usd"] == pytest.approx(1.0)
+
+    latency = report.latency()
+    assert latency == [{"prompt_type": "summary", "calls": 3, "p50_ms": 200.0, "p95_ms": 300.0, "max_ms": 300.0}]
+    assert estimate_cost("unknown", 10, 10) == 0.0
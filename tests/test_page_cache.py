@@ -0,0 +1,129 @@
+import threading
+import time
+
+import anyio
+from fastapi.testclient import TestClient
+
+from app.api.main import app
+from app.services.page_cache import PageCache, article_tags, page_cache
+
+class DictTier:
+    """Stands in for the Redis tier: the same calls over plain dicts."""
+
+    def __init__(self):
+        self.pages, self.tag_versions, self.tag_invalidated_at = {}, {}, {}
+
+    def versions(self, tags):
+        return tuple(self.tag_versions.get(tag, 0) for tag in tags)
+
+    def bump(self, tags):
+        for tag in tags:
+            self.tag_versions[tag] = self.tag_versions.get(tag, 0) + 1
+            self.tag_invalidated_at[tag] = time.time()
+
+    def invalidated_at(self, tags):
+        return tuple(self.tag_invalidated_at.get(tag, 0.0) for tag in tags)
+
+    def get(self, key):
+        return self.pages.get(key)
+
+    def set(self, key, versions, body, meta):
+        self.pages[key] = (versions, body, meta)
+
+    def clear(self):
+        self.pages.clear()
+        self.tag_versions.clear()
+
+def test_article_tags():
+    assert article_tags("AI") == ["home", "category:AI"]
+    assert article_tags("AI", 7) == ["home", "category:AI", "article:7"]
+
+def test_invalidation_by_tag():
+    cache = PageCache()
+    home, category = cache.versions(["home"]), cache.versions(["category:AI"])
+    cache.set("/", home, b"home page")
+    cache.set("/category/AI", category, b"ai page")
+
+    cache.invalidate(["category:AI"])
+
+    assert cache.get("/", cache.versions(["home"])) == (b"home page", {})
+    assert cache.get("/category/AI", cache.versions(["category:AI"])) is None
+
+def test_render_racing_a_write_is_not_served():
+    cache = PageCache()
+    versions = cache.versions(["home"])  # taken before the handler reads the data
+    cache.invalidate(["home"])           # a publish commits meanwhile
+    cache.set("/", versions, b"stale")
+    assert cache.get("/", cache.versions(["home"])) is None
+
+def test_lru_eviction_and_ttl():
+    cache = PageCache(max_entries=2)
+    versions = cache.versions(["home"])
+    for key in ("a", "b", "c"):
+        cache.set(key, versions, key.encode())
+    assert cache.get("a", versions) is None
+    assert cache.get("c", versions) == (b"c", {})
+
+    expired = PageCache(ttl_seconds=0)
+    expired.set("a", versions, b"a")
+    assert expired.get("a", versions) is None
+
+def test_shared_tier_invalidates_across_workers():
+    shared = DictTier()
+    worker_a, worker_b = PageCache(shared=shared), PageCache(shared=shared)
+    worker_a.set("/", worker_a.versions(["home"]), b"home page", {"etag": 'W/"1"'})
+    # Rendered once, served by every worker
+    assert worker_b.get("/", worker_b.versions(["home"])) == (b"home page", {"etag": 'W/"1"'})
+
+    worker_a.invalidate(["home"])
+    assert worker_b.get("/", worker_b.versions(["home"])) is None
+
+def test_invalidated_within_sees_other_workers():
+    shared = DictTier()
+    writer, reader = PageCache(shared=shared), PageCache(shared=shared)
+    assert not reader.invalidated_within(["home"], 10)
+    writer.invalidate(["home"])
+    assert reader.invalidated_within(["home", "category:AI"], 10)
+    assert not reader.invalidated_within(["category:AI"], 10)
+    assert not reader.invalidated_within(["home"], 0)
+
+class ThreadRecordingTier(DictTier):
+    """A DictTier that notes which thread each call ran on."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def versions(self, tags):
+        self.threads.append(threading.current_thread())
+        return super().versions(tags)
+
+    def get(self, key):
+        self.threads.append(threading.current_thread())
+        return super().get(key)
+
+    def set(self, key, versions, body, meta):
+        self.threads.append(threading.current_thread())
+        super().set(key, versions, body, meta)
+
+def test_run_moves_shared_tier_calls_off_the_event_loop():
+    async def caller_and_callee(cache):
+        return threading.current_thread(), await cache.run(lambda: threading.current_thread())
+
+    loop_thread, called_on = anyio.run(caller_and_callee, PageCache())
+    assert called_on is loop_thread
+    loop_thread, called_on = anyio.run(caller_and_callee, PageCache(shared=DictTier()))
+    assert called_on is not loop_thread
+
+def test_pages_use_the_shared_tier_from_the_threadpool(monkeypatch):
+    shared = ThreadRecordingTier()
+    monkeypatch.setattr(page_cache, "shared", shared)
+    page_cache.clear()
+    client = TestClient(app)
+    client.get("/")
+    client.get("/")  # builds the feed snapshots on the first visit, so the second render is cached
+    assert "http://testserver/|en" in shared.pages
+    page_cache._entries.clear()  # another worker: only Redis has the page
+    assert client.get("/").status_code == 200
+    assert shared.threads and all(thread.name.startswith("AnyIO worker thread") for thread in shared.threads)
+    page_cache.clear()
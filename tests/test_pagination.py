@@ -0,0 +1,42 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from app.models.database import Article, RawArticle
+from app.api.pagination import apply_keyset, decode_cursor, encode_cursor, split_page
+
+def walk(db_session, model, limit):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = split_page(apply_keyset(db_session.query(model), model, cursor, limit).all(), limit)
+        seen.extend(row.id for row in rows)
+        if cursor is None:
+            return seen
+
+def test_cursor_round_trip():
+    scraped_date = datetime(2026, 1, 2, 3, 4, 5, 678)
+    assert decode_cursor(encode_cursor(scraped_date, 42)) == (scraped_date, 42)
+    with pytest.raises(HTTPException):
+        decode_cursor("garbage!")
+
+def test_keyset_walk_handles_ties(db_session):
+    base = datetime(2026, 1, 1)
+    # Three articles share a scraped_date so the id tie-breaker matters
+    dates = [base, base + timedelta(hours=1), base + timedelta(hours=1), base + timedelta(hours=1), base + timedelta(hours=2)]
+    for i, scraped_date in enumerate(dates):
+        db_session.add(Article(title_en=f"A{i}", source_url=f"http://example.com/{i}", source_name="T", category="AI", scraped_date=scraped_date))
+    db_session.commit()
+
+    expected = [row.id for row in db_session.query(Article).order_by(Article.scraped_date.desc(), Article.id.desc())]
+    assert walk(db_session, Article, 2) == expected
+
+def test_keyset_walk_with_default_scraped_date(db_session):
+    for i in range(5):
+        db_session.add(RawArticle(title=f"R{i}", content="", source_url=f"http://example.com/r{i}", source_name="T", category="AI"))
+    db_session.commit()
+
+    assert sorted(walk(db_session, RawArticle, 2)) == [row.id for row in db_session.query(RawArticle).order_by(RawArticle.id)]
+
+def test_split_page_with_no_limit_left():
+    article = Article(id=1, scraped_date=datetime(2026, 1, 1))
+    assert split_page([], 0) == ([], None)
+    assert split_page([article], 0) == ([article], None)
@@ -0,0 +1,62 @@
+import pstats
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.main import app
+from app.profiling import Profiler, profiler
+
+client = TestClient(app)
+
+@pytest.fixture
+def profiles_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiler, "directory", str(tmp_path))
+    yield tmp_path
+    profiler.disarm()
+
+def test_armed_route_profiles_its_next_requests(profiles_dir):
+    response = client.post("/admin/profiles/arm", json={"target": "GET /article/{article_id}", "count": 2})
+    assert response.status_code == 200
+    for _ in range(3):
+        client.get("/article/999999999")
+        client.get("/about")
+
+    listing = client.get("/admin/profiles").json()
+    assert listing["armed"] == {}
+    assert len(listing["profiles"]) == 2
+    profile = listing["profiles"][0]
+    assert profile["target"] == "GET /article/{article_id}"
+    assert profile["path"] == "/article/999999999" and profile["status"] == 404
+    assert profile["sql_queries"] >= 1
+
+    summary = client.get(f"/admin/profiles/{profile['id']}.txt")
+    assert summary.status_code == 200 and "function calls" in summary.text
+    download = client.get(f"/admin/profiles/{profile['id']}.prof")
+    assert download.status_code == 200
+    assert pstats.Stats(str(profiles_dir / f"{profile['id']}.prof")).total_calls > 0
+
+def test_nothing_is_profiled_unless_armed(profiles_dir):
+    client.get("/about")
+    assert list(profiles_dir.iterdir()) == []
+    client.post("/admin/profiles/arm", json={"target": "GET /about", "count": 5})
+    client.post("/admin/profiles/disarm")
+    client.get("/about")
+    assert client.get("/admin/profiles").json() == {"armed": {}, "profiles": []}
+
+def test_arm_and_download_validation(profiles_dir):
+    assert client.post("/admin/profiles/arm", json={"target": "GET /nowhere"}).status_code == 400
+    assert client.post("/admin/profiles/arm", json={"target": "scrape_job", "count": 0}).status_code == 400
+    assert client.get("/admin/profiles/..%2Fsecret.txt").status_code == 404
+    assert client.get("/admin/profiles/20260101T000000000000-x.pdf").status_code == 404
+
+def test_job_profiles_are_kept_up_to_the_limit(tmp_path):
+    jobs = Profiler(str(tmp_path), keep=2)
+    with jobs.profile("scrape_job") as metadata:
+        assert metadata is None
+    jobs.arm("scrape_job", 3)
+    for _ in range(3):
+        with jobs.profile("scrape_job", category="AI") as metadata:
+            metadata["total_new"] = sum(range(1000))
+    profiles = jobs.list()
+    assert len(profiles) == 2 and len(list(tmp_path.iterdir())) == 6
+    assert profiles[0]["category"] == "AI" and profiles[0]["total_new"] == 499500
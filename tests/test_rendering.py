@@ -0,0 +1,30 @@
+from sqlalchemy import insert
+from app.models.database import Article
+from app.services.rendering import backfill_content_html, render_markdown
+
+def test_html_rendered_when_content_is_written(db_session):
+    article = Article(title_en="T", content_en="# Heading\n\nBody", content_te=None,
+                      source_url="http://example.com/1", source_name="Test", category="AI")
+    db_session.add(article)
+    db_session.commit()
+    assert article.content_html_en == "<h1>Heading</h1>\n<p>Body</p>"
+    assert article.content_html_te is None
+
+    article.content_te = "*తెలుగు*"
+    db_session.commit()
+    assert article.content_html_te == "<p><em>తెలుగు</em></p>"
+
+def test_backfill_renders_missing_html(db_session):
+    # Core inserts (and rows from before the column existed) bypass the ORM events
+    db_session.execute(insert(Article), [
+        {"title_en": f"T{n}", "content_en": f"**{n}**", "source_url": f"http://example.com/{n}",
+         "source_name": "Test", "category": "AI"}
+        for n in range(5)
+    ])
+    db_session.commit()
+
+    assert backfill_content_html(db_session, batch_size=2) == 5
+    assert [a.content_html_en for a in db_session.query(Article).order_by(Article.id)] == [
+        render_markdown(f"**{n}**") for n in range(5)
+    ]
+    assert backfill_content_html(db_session) == 0
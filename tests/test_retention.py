@@ -0,0 +1,98 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+from app.models.database import RawArticle, ArticleSection, ArchivedRawArticle, ScrapingLog, ScrapingLogDaily
+from app.scraping.scraper_manager import known_source_urls
+from app.services.retention import RetentionService
+from config.settings import settings
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+def add_raw(db_session, n, status, age_days):
+    raw_article = RawArticle(
+        title=f"Raw {n}", content="Content", summary="Summary", source_url=f"http://example.com/{n}",
+        source_name="Test", category="AI", status=status, scraped_date=NOW - timedelta(days=age_days)
+    )
+    db_session.add(raw_article)
+    db_session.commit()
+    return raw_article
+
+def test_purges_only_stale_pending(db_session):
+    stale_id = add_raw(db_session, 1, "pending", settings.RETENTION_PENDING_DAYS + 1).id
+    recent_id = add_raw(db_session, 2, "pending", 1).id
+    structured_id = add_raw(db_session, 3, "structured", settings.RETENTION_PENDING_DAYS + 1).id
+    db_session.add(ArticleSection(raw_article_id=stale_id, section_title_en="T", section_content_en="C"))
+    db_session.commit()
+
+    assert RetentionService(db_session, now=NOW, batch_size=1).purge_stale_pending() == 1
+
+    remaining = {article.id for article in db_session.query(RawArticle).all()}
+    assert remaining == {recent_id, structured_id}
+    assert db_session.query(ArticleSection).count() == 0
+
+def test_archives_published_to_table(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "RETENTION_ARCHIVE_MODE", "table")
+    old_id = add_raw(db_session, 1, "published", settings.RETENTION_PUBLISHED_DAYS + 1).id
+    fresh_id = add_raw(db_session, 2, "published", 1).id
+    db_session.add_all([
+        ArticleSection(raw_article_id=old_id, section_title_en="First", section_content_en="One"),
+        ArticleSection(raw_article_id=old_id, section_title_en="Second", section_content_en="Two"),
+    ])
+    db_session.commit()
+
+    assert RetentionService(db_session, now=NOW).archive_published() == 1
+
+    assert [article.id for article in db_session.query(RawArticle).all()] == [fresh_id]
+    archived = db_session.query(ArchivedRawArticle).one()
+    assert archived.raw_article_id == old_id and archived.source_url == "http://example.com/1"
+    assert [section["section_title_en"] for section in json.loads(archived.sections)] == ["First", "Second"]
+    assert db_session.query(ArticleSection).count() == 0
+    # Archived URLs still count as seen, so the scraper does not ingest them again
+    assert known_source_urls(db_session, ["http://example.com/1", "http://example.com/3"]) == {"http://example.com/1"}
+
+def test_archive_accepts_reused_raw_article_ids(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "RETENTION_ARCHIVE_MODE", "table")
+    first_id = add_raw(db_session, 1, "published", settings.RETENTION_PUBLISHED_DAYS + 1).id
+    assert RetentionService(db_session, now=NOW).archive_published() == 1
+    # raw_articles is empty again, so SQLite hands out the same id
+    assert add_raw(db_session, 2, "published", settings.RETENTION_PUBLISHED_DAYS + 1).id == first_id
+    assert RetentionService(db_session, now=NOW).archive_published() == 1
+
+    archived = db_session.query(ArchivedRawArticle).order_by(ArchivedRawArticle.id).all()
+    assert [(row.raw_article_id, row.source_url) for row in archived] == [
+        (first_id, "http://example.com/1"), (first_id, "http://example.com/2")
+    ]
+
+def test_archives_published_to_ndjson(db_session, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "RETENTION_ARCHIVE_MODE", "ndjson")
+    monkeypatch.setattr(settings, "RETENTION_ARCHIVE_DIR", str(tmp_path))
+    for n in range(3):
+        add_raw(db_session, n, "published", settings.RETENTION_PUBLISHED_DAYS + 1)
+
+    assert RetentionService(db_session, now=NOW, batch_size=2).archive_published() == 3
+
+    with gzip.open(tmp_path / "raw_articles-20261019.ndjson.gz", "rt", encoding="utf-8") as archive:
+        records = [json.loads(line) for line in archive]
+    assert [record["title"] for record in records] == ["Raw 0", "Raw 1", "Raw 2"]
+    assert db_session.query(RawArticle).count() == 0
+    assert db_session.query(ArchivedRawArticle).count() == 0
+
+def test_rolls_up_scraping_logs_across_batches(db_session):
+    old_day = NOW - timedelta(days=settings.RETENTION_LOG_DAYS + 2)
+    db_session.add_all([
+        ScrapingLog(source_name="RSS", category="AI", status="success", articles_found=5, articles_new=2, started_at=old_day),
+        ScrapingLog(source_name="RSS", category="AI", status="error", articles_found=0, articles_new=0, started_at=old_day + timedelta(hours=1)),
+        ScrapingLog(source_name="RSS", category="AI", status="success", articles_found=3, articles_new=1, started_at=old_day + timedelta(hours=2)),
+        ScrapingLog(source_name="arXiv", category="AI", status="success", articles_found=4, articles_new=4, started_at=old_day),
+        ScrapingLog(source_name="RSS", category="AI", status="success", articles_found=9, articles_new=9, started_at=NOW),
+    ])
+    db_session.commit()
+
+    assert RetentionService(db_session, now=NOW, batch_size=2).rollup_scraping_logs() == 4
+
+    assert db_session.query(ScrapingLog).count() == 1
+    rss = db_session.query(ScrapingLogDaily).filter_by(source_name="RSS").one()
+    assert rss.day == old_day.date()
+    assert (rss.runs, rss.success_runs, rss.error_runs, rss.articles_found, rss.articles_new) == (3, 2, 1, 8, 3)
+    arxiv = db_session.query(ScrapingLogDaily).filter_by(source_name="arXiv").one()
+    assert (arxiv.runs, arxiv.articles_new) == (1, 4)
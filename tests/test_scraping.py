@@ -1,20 +1,7 @@
-import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.models.database import Base, RawArticle
+from app.models.database import RawArticle
 from datetime import datetime
 
 # Setup for an in-memory SQLite database for testing
-@pytest.fixture(scope="function")
-def db_session():
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    yield session
-    session.close()
-    Base.metadata.drop_all(engine)
-
 def test_add_raw_article(db_session):
     """Tests adding a RawArticle to the database and verifying its properties."""
     # 1. Prepare test data
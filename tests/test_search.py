@@ -0,0 +1,44 @@
+from datetime import datetime
+from app.models.database import RawArticle, Article
+from app.curation.schemas import FinalArticleData
+from app.curation.services import CurationService
+from app.services.search import ArticleSearchIndex, fts5_query
+
+def publish(db_session, n, title_en, title_te, content_en, category="AI"):
+    raw_article = RawArticle(
+        title=title_en, content=content_en, summary="", source_url=f"http://example.com/raw/{n}",
+        source_name="Test", category=category, status="structured"
+    )
+    db_session.add(raw_article)
+    db_session.commit()
+    final_data = FinalArticleData(
+        title_en=title_en, summary_en="", content_en=content_en,
+        title_te=title_te, summary_te="", content_te="",
+        image_url=None, source_url=f"http://example.com/{n}", source_name="Test",
+        category=category, published_date=datetime.utcnow(), content_type="News",
+    )
+    return CurationService(db_session).publish_final_article(raw_article.id, final_data)
+
+def test_fts5_query_quotes_terms():
+    assert fts5_query('quantum "chips') == '"quantum" """chips"'
+
+def test_search_ranks_and_filters(db_session):
+    chips = publish(db_session, 1, "Quantum chips ship", "క్వాంటం చిప్స్", "New quantum processors are shipping.")
+    cloud = publish(db_session, 2, "Cloud pricing update", "క్లౌడ్ ధరలు", "A note that mentions quantum once.", category="Cloud Computing")
+
+    index = ArticleSearchIndex(db_session)
+    results = index.search("quantum")
+    assert [result["id"] for result in results][0] == chips.id  # title match outranks body match
+    assert len(results) == 2
+    assert [result["id"] for result in index.search("quantum", category="Cloud Computing")] == [cloud.id]
+    assert [result["id"] for result in index.search("చిప్స్")] == [chips.id]
+    assert [result["id"] for result in index.search("processor")] == [chips.id]  # stemmed
+
+def test_deactivate_removes_from_index(db_session):
+    article = publish(db_session, 1, "Quantum chips ship", "క్వాంటం చిప్స్", "Body")
+    CurationService(db_session).deactivate_article(article.id)
+    assert ArticleSearchIndex(db_session).search("quantum") == []
+
+    ArticleSearchIndex(db_session).rebuild()
+    assert ArticleSearchIndex(db_session).search("quantum") == []
+    assert db_session.get(Article, article.id).is_active is False
@@ -0,0 +1,68 @@
+import os
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.database import Base, RawArticle, Article
+from app.curation.schemas import FinalArticleData
+from app.curation.services import CurationService
+from app.services import static_export
+from app.services.static_export import StaticExporter, page_file
+
+def publish(db_session, n, category="AI"):
+    raw_article = RawArticle(
+        title=f"Raw {n}", content="", summary="", source_url=f"http://example.com/raw/{n}",
+        source_name="Test", category=category, status="structured"
+    )
+    db_session.add(raw_article)
+    db_session.commit()
+    final_data = FinalArticleData(
+        title_en=f"Article {n}", summary_en="", content_en="Body", title_te=f"Vyasam {n}", summary_te="", content_te="",
+        image_url=None, source_url=f"http://example.com/{n}", source_name="Test",
+        published_date=datetime.utcnow(), content_type="news", category=category,
+    )
+    return CurationService(db_session).publish_final_article(raw_article.id, final_data)
+
+def read(output_dir, language, url_path):
+    with open(os.path.join(output_dir, page_file(language, url_path)), encoding="utf-8") as f:
+        return f.read()
+
+def test_full_then_incremental_export(db_session, tmp_path):
+    first = publish(db_session, 1)
+    second = publish(db_session, 2, category="Space Tech")
+
+    result = StaticExporter(db_session, str(tmp_path)).run()
+    assert result["full"] and result["removed"] == 0
+    assert "Article 1" in read(tmp_path, "en", "/") and "Article 2" in read(tmp_path, "en", "/category/Space Tech")
+    assert "Vyasam 1" in read(tmp_path, "te", f"/article/{first.id}")
+    assert "Article 2" in read(tmp_path, "en", f"/article/{second.id}")
+    assert os.path.exists(tmp_path / "en" / "about" / "index.html")
+
+    # Nothing changed: nothing rendered
+    assert StaticExporter(db_session, str(tmp_path)).run() == {"full": False, "pages": 0, "removed": 0}
+
+    third = publish(db_session, 3)
+    CurationService(db_session).deactivate_article(second.id)
+    result = StaticExporter(db_session, str(tmp_path)).run()
+    # The new article, home and the two categories whose snapshots changed, in both languages
+    assert result == {"full": False, "pages": 2 * 4, "removed": 2}
+    assert "Article 3" in read(tmp_path, "en", "/category/AI")
+    assert "Article 2" not in read(tmp_path, "en", "/category/Space Tech")
+    assert not os.path.exists(tmp_path / "en" / "article" / str(second.id))
+    assert "Vyasam 3" in read(tmp_path, "te", f"/article/{third.id}")
+
+def test_full_export_uses_a_process_pool(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all([
+            Article(title_en=f"Pooled {i}", source_url=f"http://example.com/p/{i}", source_name="T", category="AI",
+                    published_date=datetime.utcnow())
+            for i in range(6)
+        ])
+        session.commit()
+        monkeypatch.setattr(static_export, "ARTICLE_CHUNK_SIZE", 2)
+        output_dir = str(tmp_path / "site")
+        result = StaticExporter(session, output_dir, workers=2).run(full=True)
+    engine.dispose()
+    assert len(os.listdir(os.path.join(output_dir, "te", "article"))) == 6
+    assert result["pages"] >= 6 * 2
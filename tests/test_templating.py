@@ -0,0 +1,21 @@
+import os
+
+from starlette.requests import Request
+
+from app.templating import TEMPLATES_DIR, get_template_context, precompile_templates, templates
+
+def make_request(headers=()):
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": list(headers)})
+
+def test_precompile_fills_the_shared_cache():
+    names = [name for name in os.listdir(TEMPLATES_DIR) if name.endswith(".html")]
+    assert precompile_templates() == len(names)
+    # Served from the environment's cache from now on
+    assert templates.env.get_template("curation.html") is templates.env.get_template("curation.html")
+
+def test_translators_are_built_once_per_language():
+    english = get_template_context(make_request(), "en")["_"]
+    assert get_template_context(make_request(), "en")["_"] is english
+    telugu = get_template_context(make_request([(b"accept-language", b"te")]))
+    assert telugu["current_language"] == "te" and telugu["_"] is not english
+    assert english("no such key") == "no such key"
@@ -0,0 +1,149 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.database import Base, RawArticle, ArticleSection, TranslationSegment
+from app.curation import services as curation_services
+from app.curation.services import CurationService
+from app.services.llm_backend import FakeLLMBackend, set_llm_backend
+from app.services.translation_memory import TranslationMemory, normalize_segment, assemble_translation, align_segments
+
+ARTICLE_TEXT = "Acme released a new GPU. It is twice as fast. Shipping starts in March."
+
+class RecordingBackend(FakeLLMBackend):
+    def __init__(self):
+        super().__init__(latency_ms=0, failure_rate=0)
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        return super().generate(prompt)
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = RecordingBackend()
+    set_llm_backend(backend)
+    monkeypatch.setattr(curation_services, "extract_article_content", lambda url: ARTICLE_TEXT)
+    yield backend
+    set_llm_backend(None)
+
+def _raw_article(db_session, url):
+    raw_article = RawArticle(
+        title="GPU launch", content=ARTICLE_TEXT, summary="", source_url=url,
+        source_name="Test", category="AI", status="pending"
+    )
+    db_session.add(raw_article)
+    db_session.commit()
+    return raw_article
+
+def test_normalized_lookup(db_session):
+    memory = TranslationMemory(db_session)
+    memory.remember({"Major Highlights": "ముఖ్యాంశాలు"})
+    found = memory.lookup(["Major Highlights", "  major   highlights: ", "Unknown"])
+    assert found == {"Major Highlights": "ముఖ్యాంశాలు", "  major   highlights: ": "ముఖ్యాంశాలు"}
+    assert normalize_segment("NVIDIA.") == normalize_segment("nvidia")
+
+def test_editor_translations_win_over_model(db_session):
+    memory = TranslationMemory(db_session)
+    memory.remember({"Key Findings": "editor"}, origin="editor")
+    memory.remember({"Key Findings": "model"}, origin="model")
+    assert memory.lookup(["Key Findings"]) == {"Key Findings": "editor"}
+
+def test_assemble_and_align_keep_list_structure():
+    english = "- First point. Second.\n- Third"
+    translations = {"First point.": "A.", "Second.": "B.", "Third": "C"}
+    assert assemble_translation(english, translations) == "- A. B.\n- C"
+    assert align_segments(english, "- A. B.\n- C") == translations
+    assert align_segments(english, "one line only") == {}
+
+def test_structure_content_only_sends_novel_segments(db_session, backend):
+    first = _raw_article(db_session, "http://example.com/1")
+    second = _raw_article(db_session, "http://example.com/2")
+    service = CurationService(db_session)
+
+    sections = service.structure_content(first.id, "News")
+    assert sections["Topic Overview"]["te"].startswith("[te] ")
+    assert sections["Scoring & Evaluation"]["te"] == sections["Scoring & Evaluation"]["en"]
+    assert len(backend.prompts) == 2
+
+    # Same field names and sentences: everything comes from the memory, no translation call.
+    again = service.structure_content(second.id, "News")
+    assert again == sections
+    assert len(backend.prompts) == 3
+    assert "SEGMENTS TO TRANSLATE:" not in backend.prompts[-1]
+
+def test_save_uses_memory_for_section_titles(db_session):
+    raw_article = _raw_article(db_session, "http://example.com/titles")
+    TranslationMemory(db_session).remember({"Topic Overview": "అంశం అవలోకనం"})
+    db_session.commit()
+
+    service = CurationService(db_session)
+    service.save_structured_content(raw_article.id, "Title", "News", {
+        "Topic Overview": {"en": "A GPU launched.", "te": "ఒక GPU విడుదలైంది."},
+        "Custom Section": {"en": "Text.", "te": ""},
+    })
+
+    titles = {
+        s.section_title_en: s.section_title_te
+        for s in db_session.query(ArticleSection).filter_by(raw_article_id=raw_article.id)
+    }
+    assert titles == {"Topic Overview": "అంశం అవలోకనం", "Custom Section": "Custom Section"}
+    # The editor's section translation was learned segment by segment.
+    assert TranslationMemory(db_session).lookup(["A GPU launched."]) == {"A GPU launched.": "ఒక GPU విడుదలైంది."}
+
+def test_saving_unedited_model_translations_keeps_their_origin(db_session, backend, monkeypatch):
+    raw_article = _raw_article(db_session, "http://example.com/unedited")
+    service = CurationService(db_session)
+    sections = service.structure_content(raw_article.id, "News")
+    overview = sections["Topic Overview"]
+    edited = dict(sections, **{"Topic Overview": {"en": overview["en"], "te": "సవరించిన అనువాదం."}})
+
+    learned_as_editor = []
+    remember = TranslationMemory.remember
+    def recording_remember(memory, pairs, origin="model"):
+        if origin == "editor":
+            learned_as_editor.extend(pairs)
+        return remember(memory, pairs, origin)
+    monkeypatch.setattr(TranslationMemory, "remember", recording_remember)
+
+    service.save_structured_content(raw_article.id, "GPU launch", "News", sections)
+    assert learned_as_editor == []
+    origins = {row.source_text: row.origin for row in db_session.query(TranslationSegment)}
+    assert origins[overview["en"]] == "model"
+    assert set(origins.values()) == {"model"}
+
+    service.save_structured_content(raw_article.id, "GPU launch", "News", edited)
+    assert learned_as_editor == [overview["en"]]
+    assert db_session.query(TranslationSegment.origin).filter_by(source_text=overview["en"]).scalar() == "editor"
+
+def test_lookup_is_read_only_and_hits_are_recorded_after_the_model_call(db_session, backend):
+    memory = TranslationMemory(db_session)
+    memory.remember({"Topic Overview": "అంశం అవలోకనం"})
+    db_session.commit()
+    memory.lookup(["Topic Overview"])
+    assert db_session.query(TranslationSegment.hits).scalar() == 0
+
+    hits_during_call = []
+    generate = backend.generate
+    def generate_and_check(prompt):
+        hits_during_call.append(db_session.query(TranslationSegment.hits).filter_by(normalized_source="topic overview").scalar())
+        return generate(prompt)
+    backend.generate = generate_and_check
+
+    CurationService(db_session).structure_content(_raw_article(db_session, "http://example.com/hits").id, "News")
+    assert hits_during_call and set(hits_during_call) == {0}
+    assert db_session.query(TranslationSegment.hits).filter_by(normalized_source="topic overview").scalar() == 1
+
+def test_remember_upserts_an_entry_another_session_added(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tm.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as first, Session() as second:
+        # Both curators see the segment as new; the second insert must not fail
+        assert TranslationMemory(first).lookup(["New segment."]) == {}
+        assert TranslationMemory(second).lookup(["New segment."]) == {}
+        assert TranslationMemory(first).remember({"New segment.": "model one"}) == 1
+        first.commit()
+        assert TranslationMemory(second).remember({"New segment.": "editor"}, origin="editor") == 1
+        assert TranslationMemory(second).remember({"New segment.": "model two"}) == 0
+        second.commit()
+        assert TranslationMemory(first).lookup(["new segment"]) == {"new segment": "editor"}
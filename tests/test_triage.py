@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+from app.models.database import RawArticle
+from app.services.triage import TriageScorer, tokenize, source_domain
+
+NOW = datetime(2026, 1, 10, 12, 0, 0)
+
+def _doc(title, summary="", category="Quantum Computing", hours_old=1, url="https://example.com/a"):
+    return {
+        "title": title,
+        "summary": summary,
+        "category": category,
+        "published_date": NOW - timedelta(hours=hours_old),
+        "source_url": url,
+    }
+
+def test_tokenize_includes_bigrams():
+    assert tokenize("Open Source release") == ["open", "source", "release", "open source", "source release"]
+    assert source_domain("https://www.arxiv.org/abs/1") == "arxiv.org"
+
+def test_relevant_recent_trusted_articles_rank_higher():
+    scorer = TriageScorer(now=NOW)
+    scores = scorer.score([
+        _doc("Qubit error correction breakthrough", "Superconducting qubits hit a record.", url="https://arxiv.org/x"),
+        _doc("Company picnic photos", "The team enjoyed lunch."),
+        _doc("Qubit error correction breakthrough", "Superconducting qubits hit a record.", hours_old=24 * 7),
+    ])
+    assert all(0 <= score <= 100 for score in scores)
+    assert scores[0] > scores[2] > scores[1]
+
+def test_rescore_updates_queued_rows_only(db_session):
+    for i, status in enumerate(["pending", "structured", "published"]):
+        db_session.add(RawArticle(
+            title="Quantum qubit launch", content="", summary="", source_url=f"https://example.com/{i}",
+            source_name="RSS", category="Quantum Computing", status=status, published_date=NOW
+        ))
+    db_session.commit()
+
+    assert TriageScorer(now=NOW).rescore(db_session, batch_size=1) == 2
+    scores = {a.status: a.triage_score for a in db_session.query(RawArticle)}
+    assert scores["pending"] is not None and scores["structured"] is not None
+    assert scores["published"] is None